@@ -12,7 +12,7 @@ backend_path = os.path.join(os.getcwd(), "backend")
 if os.path.exists(backend_path):
     sys.path.append(backend_path)
 
-from app.models import incidents, events, actions
+from app.models import incidents, events, actions, graph
 
 # this is the Alembic Config object
 config = context.config
@@ -0,0 +1,42 @@
+"""Persisted dependency graph elements
+
+Revision ID: 5d1f0a7c2b9e
+Revises: c8b6796e7231
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1f0a7c2b9e'
+down_revision: Union[str, None] = 'c8b6796e7231'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('graph_elements',
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('kind', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('service_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('service_type', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('tier', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('from_service', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('to_service', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('relation', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('version')
+    )
+    op.create_index(op.f('ix_graph_elements_key'), 'graph_elements', ['key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_graph_elements_key'), table_name='graph_elements')
+    op.drop_table('graph_elements')
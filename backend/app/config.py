@@ -10,13 +10,36 @@ class Settings:
     # Groq API
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
     GROQ_MODEL: str = "llama-3.3-70b-specdec"
+    # Graph ranking confidence at or above which the LLM call is skipped
+    RCA_SKIP_LLM_CONFIDENCE: float = float(os.getenv("RCA_SKIP_LLM_CONFIDENCE", "0.9"))
     
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///devsick.db")
     
+    # Dependency graph sync: stored versions re-read behind the last one seen,
+    # so rows that commit out of version order (Postgres) are not skipped
+    GRAPH_SYNC_LOOKBACK_VERSIONS: int = 1000
+
+    # Rough cost of text in tokens; good enough for prompt budgets and chunk sizes
+    CHARS_PER_TOKEN: int = 4
+
     # Correlation engine
     CORRELATION_WINDOW_SECONDS: int = 60
     MIN_EVENTS_FOR_INCIDENT: int = 2
+    # Timeline entries kept per incident; larger windows keep the most telling events
+    TIMELINE_MAX_ENTRIES: int = int(os.getenv("TIMELINE_MAX_ENTRIES", "200"))
+
+    # Dependency edge traffic
+    EDGE_HALF_LIFE_SECONDS: int = int(os.getenv("EDGE_HALF_LIFE_SECONDS", "3600"))
+    EDGE_STALE_WEIGHT: float = 0.05  # decayed calls below which a discovered (not declared) edge is ignored
+
+    # OTLP trace receiver (span-derived dependency edges)
+    OTLP_FLUSH_INTERVAL_SECONDS: float = 5.0
+    OTLP_MAX_PENDING_EDGES: int = 10_000
+    OTLP_SPAN_CACHE_SIZE: int = 100_000  # recent span ids kept to match late children
+    OTLP_MAX_ORPHANS: int = 50_000       # children waiting for a parent span
+    OTLP_MAX_BODY_BYTES: int = 16 * 2 ** 20    # request body limit, compressed and decompressed (413 above)
+    OTLP_INLINE_DECODE_BYTES: int = 64 * 2 ** 10  # larger payloads are decoded off the event loop
     
     # Server
     HOST: str = "0.0.0.0"
@@ -26,6 +49,69 @@ class Settings:
     # Prometheus
     PROMETHEUS_URL: str = os.getenv("PROMETHEUS_URL", "http://prometheus:9090")
     PROMETHEUS_TIMEOUT_SECONDS: int = 10
+    PROMETHEUS_QUERY_TIMEOUT_SECONDS: float = float(os.getenv("PROMETHEUS_QUERY_TIMEOUT_SECONDS", "5"))
+    PROMETHEUS_RANGE_STEP_SECONDS: int = int(os.getenv("PROMETHEUS_RANGE_STEP_SECONDS", "15"))
+    # Shared query result cache; instant queries are evaluated at TTL-aligned times
+    PROMQL_CACHE_TTL_SECONDS: float = float(os.getenv("PROMQL_CACHE_TTL_SECONDS", "5"))
+    PROMQL_CACHE_MAX_ENTRIES: int = 1024
+    # Incident metric summaries for the LLM prompt
+    METRICS_BASELINE_MINUTES: int = 30
+    METRICS_PROMPT_TOKEN_BUDGET: int = int(os.getenv("METRICS_PROMPT_TOKEN_BUDGET", "400"))
+
+    # Loki
+    LOKI_URL: str = os.getenv("LOKI_URL", "http://loki:3100")
+    LOKI_POLL_INTERVAL_SECONDS: float = 5.0
+    LOKI_MAX_BACKOFF_SECONDS: float = 60.0  # poll delay cap while Loki keeps failing
+
+    # Upstream resilience
+    BREAKER_FAILURE_THRESHOLD: int = 5     # consecutive failures that open a circuit
+    BREAKER_RESET_SECONDS: float = 30.0    # open time before a half-open probe
+    PROMETHEUS_HEDGE_DELAY_SECONDS: float = 1.0  # send a second copy of a slow query
+    PROMETHEUS_RETRIES: int = 2            # attempts on connection errors
+    # Per-analysis latency budget; optional steps are skipped rather than waited for
+    ANALYSIS_BUDGET_SECONDS: float = float(os.getenv("ANALYSIS_BUDGET_SECONDS", "20"))
+    ANALYSIS_METRICS_SECONDS: float = 3.0
+    ANALYSIS_RAG_SECONDS: float = 2.0
+
+    # Documentation ingested into incident memory (chunked, content-hashed)
+    DOC_PATHS: list = ["README.md", "PRD.md"]
+    DOC_CHUNK_TOKENS: int = 300
+    DOC_EMBED_BATCH_SIZE: int = 32
+    EMBEDDING_CACHE_SIZE: int = 50_000  # cached vectors (memory-mapped under the vector store directory)
+    EMBEDDING_CACHE_FLUSH_SECONDS: float = 30.0  # newly cached keys are lost on a crash if not yet flushed
+    VECTOR_BACKEND: str = os.getenv("VECTOR_BACKEND", "chroma")  # "chroma" or "numpy" (see vector_backends.py)
+    VECTOR_STORE_WORKERS: int = 4           # threads running blocking vector store calls
+    VECTOR_QUERY_CACHE_TTL_SECONDS: float = 300.0
+    VECTOR_QUERY_CACHE_SIZE: int = 256
+    HYBRID_CANDIDATES: int = 20  # candidates per retriever (vector, BM25) before fusion
+    # chroma backend: HNSW beam widths (Chroma's default search_ef of 10 misses many true neighbours)
+    CHROMA_HNSW_CONSTRUCTION_EF: int = 200
+    CHROMA_HNSW_SEARCH_EF: int = 128
+    # numpy backend: exact search up to this many candidates, IVF-PQ above
+    ANN_EXACT_MAX_VECTORS: int = 50_000
+    ANN_PROBE_LISTS: int = 32           # inverted lists scanned per query
+    ANN_PQ_SUBVECTORS: int = 48         # bytes per compressed vector (largest divisor of the dimension up to this)
+    ANN_RERANK_CANDIDATES: int = 1024   # approximate hits re-scored exactly
+    ANN_REBUILD_FRACTION: float = 0.1   # rebuild once this share of vectors is unindexed
+    HYBRID_VECTOR_WEIGHT: float = 0.5  # share of vector similarity in the fused score; the rest is BM25
+
+    # Span export to the OpenTelemetry collector (attached during warm-up)
+    OTLP_EXPORTER_ENDPOINT: str = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://otel-collector:4317")
+    # Failed warm-up steps are retried in the background with jittered backoff
+    WARMUP_RETRY_BASE_SECONDS: float = 1.0
+    WARMUP_RETRY_MAX_SECONDS: float = 60.0
+
+    # Pooled outbound HTTP clients
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+
+    # Server push (SSE / WebSocket)
+    STREAM_CLIENT_BUFFER: int = 256  # messages buffered per client before it is dropped
+    STREAM_HEARTBEAT_SECONDS: int = 15
+
+    # Observability summary, refreshed in the background and pushed to "metrics" subscribers
+    OBSERVABILITY_REFRESH_SECONDS: float = 5.0
+    OBSERVABILITY_STALE_SECONDS: float = 15.0  # snapshot age after which it is flagged stale
 
 
 settings = Settings()
@@ -6,12 +6,15 @@ Groups related log events into incidents based on:
 - Error pattern matching
 """
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 from ..models.events import LogEvent
 from ..models.incidents import (
     Incident, Severity, IncidentStatus, TimelineEntry
 )
-from ..knowledge.dependency_graph import dependency_graph
+from ..config import settings
+from ..knowledge.dependency_graph import DependencyGraph, dependency_graph
+from ..ingestion.records import EventBuffer
+from .window import EventWindow
 
 
 # Severity mapping from event severity to incident severity
@@ -40,9 +43,16 @@ SCENARIO_PATTERNS = {
 }
 
 
-def detect_scenario(events: List[LogEvent]) -> Dict:
-    """Detect which incident scenario matches the events."""
-    all_messages = " ".join(e.message.lower() for e in events)
+def detect_scenario(events: List[LogEvent], window: Optional[EventWindow] = None) -> Dict:
+    """Detect which incident scenario matches the events.
+
+    With a `window`, each distinct message is searched once.
+    """
+    if window is not None:
+        messages = window.messages
+    else:
+        messages = events.messages if isinstance(events, EventBuffer) else (e.message for e in events)
+    all_messages = " ".join(messages).lower()
 
     for scenario_id, pattern in SCENARIO_PATTERNS.items():
         matches = sum(1 for kw in pattern["keywords"] if kw in all_messages)
@@ -52,59 +62,65 @@ def detect_scenario(events: List[LogEvent]) -> Dict:
     return {"id": "unknown", "title": "Correlated Incident — Multiple Service Failures"}
 
 
-def determine_severity(events: List[LogEvent]) -> Severity:
+def determine_severity(events: List[LogEvent], window: Optional[EventWindow] = None) -> Severity:
     """Determine overall incident severity from constituent events."""
-    severity_order = [Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM, Severity.LOW]
-    for sev in severity_order:
-        if any(SEVERITY_MAP.get(e.severity.value) == sev for e in events):
-            return sev
-    return Severity.LOW
+    if window is None:
+        window = EventWindow.from_events(events)
+    return window.severity_rollup()
 
 
-def build_timeline(events: List[LogEvent]) -> List[TimelineEntry]:
-    """Build a chronological timeline from events."""
-    sorted_events = sorted(events, key=lambda e: e.timestamp)
+def build_timeline(
+    events: List[LogEvent],
+    window: Optional[EventWindow] = None,
+    limit: Optional[int] = None,
+    graph: Optional[DependencyGraph] = None,
+) -> List[TimelineEntry]:
+    """Build a chronological timeline from events, capped at `limit` entries.
+
+    Only the kept events become `TimelineEntry` rows; see
+    `EventWindow.timeline_indices` for which ones a large window keeps.
+    """
+    if window is None:
+        window = EventWindow.from_events(events)
+    limit = limit or settings.TIMELINE_MAX_ENTRIES
+    indices = window.timeline_indices(limit, graph or dependency_graph)
     return [
-        TimelineEntry(
-            timestamp=e.timestamp,
-            source_service=e.source_service,
-            event=e.message,
-            severity=e.severity.value,
-        )
-        for e in sorted_events
+        TimelineEntry(timestamp=timestamp, source_service=service, event=message, severity=severity)
+        for timestamp, service, message, severity in window.timeline_fields(indices)
     ]
 
 
-def extract_affected_services(events: List[LogEvent]) -> List[str]:
+def extract_affected_services(events: List[LogEvent], window: Optional[EventWindow] = None) -> List[str]:
     """Extract unique affected services, ordered by first appearance."""
-    seen = set()
-    services = []
-    for e in sorted(events, key=lambda e: e.timestamp):
-        if e.source_service not in seen:
-            seen.add(e.source_service)
-            services.append(e.source_service)
-    return services
+    if window is None:
+        window = EventWindow.from_events(events)
+    return window.first_appearance()
 
 
-def correlate_events(events: List[LogEvent]) -> Incident:
+def correlate_events(events: List[LogEvent], graph: Optional[DependencyGraph] = None) -> Incident:
     """Correlate a group of related events into a single incident.
     
     Uses service dependency graph to validate that events are part
-    of a cascading failure chain.
+    of a cascading failure chain. Accepts `LogEvent` rows or an
+    `EventBuffer` from the ingestion hot path. Every event ID is kept,
+    but the timeline is capped at `TIMELINE_MAX_ENTRIES`.
     """
-    scenario = detect_scenario(events)
-    severity = determine_severity(events)
-    timeline = build_timeline(events)
-    affected = extract_affected_services(events)
+    # Build the columnar window once and share it across all passes
+    window = EventWindow.from_events(events)
+    scenario = detect_scenario(events, window)
+    severity = determine_severity(events, window)
+    timeline = build_timeline(events, window, graph=graph)
+    affected = extract_affected_services(events, window)
 
     incident = Incident(
         title=scenario["title"],
         severity=severity,
         status=IncidentStatus.DETECTED,
-        event_ids=[e.id for e in events],
         timeline=timeline,
-        affected_services=affected,
         scenario_type=scenario["id"],
     )
+    # Table models skip property setters in __init__, so assign JSON-backed lists explicitly
+    incident.event_ids = list(events.ids) if isinstance(events, EventBuffer) else [e.id for e in events]
+    incident.affected_services = affected
 
     return incident
@@ -0,0 +1,229 @@
+"""Sharded correlation across worker processes.
+
+Events are hash-partitioned by dependency-graph component (or by the
+`namespace` metadata label) to a pool of worker processes. Each worker owns
+a `StreamingCorrelator` and therefore its own window state; incidents are
+sent back and merged centrally. Because a correlation group never spans
+components, partitioning by component yields the same incidents as a single
+`StreamingCorrelator`.
+
+Events cross the process boundary in column batches so the IPC cost is paid
+per batch rather than per event. Workers get the partitioning graph's edges
+at start, and edges added later ahead of the next batch, so their
+components always match the parent's.
+"""
+import json
+import multiprocessing as mp
+import os
+import queue
+import traceback
+import zlib
+from typing import List, Optional
+
+from ..ingestion.records import EventRecord
+from ..knowledge.dependency_graph import DependencyGraph, dependency_graph
+from ..models.incidents import Incident
+from .streaming import ComponentIndex, StreamingCorrelator
+
+
+PARTITION_KEYS = ("component", "namespace")
+
+
+def _worker(shard: int, inbox, outbox, window_seconds: Optional[int], min_events: Optional[int]):
+    """Worker loop: replay event batches into a private correlator.
+
+    Failures are reported through the outbox as ("error", traceback) rather
+    than killing the worker silently.
+    """
+    graph = DependencyGraph()
+    correlator = StreamingCorrelator(window_seconds=window_seconds, min_events=min_events, graph=graph)
+    while True:
+        message = inbox.get()
+        if message is None:
+            break
+        kind, payload = message
+        try:
+            incidents: List[Incident] = []
+            if kind == "graph":
+                for from_service, to_service in payload:
+                    graph.add_edge(from_service, to_service)
+            elif kind == "events":
+                for fields in zip(*payload):
+                    incidents.extend(correlator.push(EventRecord(*fields)))
+            elif kind == "flush":
+                incidents.extend(correlator.flush())
+            if incidents or kind == "flush":
+                outbox.put((kind, incidents))
+        except Exception:
+            outbox.put(("error", f"shard {shard} failed on {kind!r}:\n{traceback.format_exc()}"))
+
+
+class _Batch:
+    """Column-oriented batch of events bound for one worker."""
+
+    __slots__ = ("ids", "services", "severities", "messages", "epochs", "metadata")
+
+    def __init__(self):
+        self.ids, self.services, self.severities = [], [], []
+        self.messages, self.epochs, self.metadata = [], [], []
+
+    def add(self, record: EventRecord):
+        self.ids.append(record.id)
+        self.services.append(record.source_service)
+        self.severities.append(record.severity)
+        self.messages.append(record.message)
+        self.epochs.append(record.epoch)
+        self.metadata.append(record.metadata_json)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def columns(self):
+        # Field order matches EventRecord's constructor
+        return (self.ids, self.services, self.severities, self.messages, self.epochs, self.metadata)
+
+
+class ShardedCorrelator:
+    """Drop-in replacement for `StreamingCorrelator` backed by worker processes."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        window_seconds: Optional[int] = None,
+        min_events: Optional[int] = None,
+        partition_by: str = "component",
+        batch_size: int = 2048,
+        graph=None,
+    ):
+        if partition_by not in PARTITION_KEYS:
+            raise ValueError(f"partition_by must be one of {PARTITION_KEYS}")
+        self.workers = workers or os.cpu_count() or 1
+        self.window_seconds = window_seconds
+        self.min_events = min_events
+        self.partition_by = partition_by
+        self.batch_size = batch_size
+        self.graph = graph or dependency_graph
+        self.components = ComponentIndex(self.graph)
+        self._edges_sent = 0  # graph edges already sent to the workers
+        self._shard_of: dict = {}
+        self._batches = [_Batch() for _ in range(self.workers)]
+        self._inboxes = []
+        self._processes = []
+        self._outbox = None
+
+    def start(self):
+        """Spawn the worker pool."""
+        ctx = mp.get_context()
+        self._outbox = ctx.Queue()
+        for shard in range(self.workers):
+            inbox = ctx.Queue()
+            process = ctx.Process(
+                target=_worker,
+                args=(shard, inbox, self._outbox, self.window_seconds, self.min_events),
+                daemon=True,
+            )
+            process.start()
+            self._inboxes.append(inbox)
+            self._processes.append(process)
+        self._edges_sent = 0
+        self._sync_graph()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def partition_key(self, record: EventRecord) -> str:
+        if self.partition_by == "namespace" and record.metadata_json != "{}":
+            namespace = json.loads(record.metadata_json).get("namespace")
+            if namespace:
+                return namespace
+        return self.components.key(record.source_service)
+
+    def shard_for(self, record: EventRecord) -> int:
+        key = self.partition_key(record)
+        shard = self._shard_of.get(key)
+        if shard is None:
+            # crc32 is stable across processes, unlike the salted built-in hash()
+            shard = self._shard_of[key] = zlib.crc32(key.encode()) % self.workers
+        return shard
+
+    def push(self, record: EventRecord) -> List[Incident]:
+        """Route one event to its shard; returns incidents merged back so far."""
+        shard = self.shard_for(record)
+        batch = self._batches[shard]
+        batch.add(record)
+        if len(batch) < self.batch_size:
+            return []
+        self._send(shard)
+        return self._drain()
+
+    def flush(self, poll_seconds: float = 1.0) -> List[Incident]:
+        """Close all open groups on every worker and wait for their incidents.
+
+        Raises RuntimeError if a worker reports an error or exits.
+        """
+        for shard in range(self.workers):
+            self._send(shard)
+            self._inboxes[shard].put(("flush", None))
+
+        incidents: List[Incident] = []
+        pending = self.workers
+        while pending:
+            try:
+                kind, result = self._outbox.get(timeout=poll_seconds)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            incidents.extend(self._result(kind, result))
+            if kind == "flush":
+                pending -= 1
+        return incidents
+
+    def close(self):
+        """Stop the worker pool."""
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+        self._inboxes, self._processes = [], []
+
+    def _sync_graph(self):
+        """Send edges added to the graph since the last sync to every worker."""
+        graph = self.graph
+        if len(graph.edges) == self._edges_sent:
+            return
+        with graph.lock:
+            edges = [(edge.from_service, edge.to_service) for edge in graph.edges[self._edges_sent:]]
+            self._edges_sent = len(graph.edges)
+        for inbox in self._inboxes:
+            inbox.put(("graph", edges))
+
+    def _send(self, shard: int):
+        batch = self._batches[shard]
+        if len(batch):
+            self._sync_graph()
+            self._inboxes[shard].put(("events", batch.columns()))
+            self._batches[shard] = _Batch()
+
+    def _check_workers(self):
+        dead = [shard for shard, process in enumerate(self._processes) if not process.is_alive()]
+        if dead:
+            raise RuntimeError(f"Correlation worker(s) {dead} exited unexpectedly")
+
+    @staticmethod
+    def _result(kind: str, result) -> List[Incident]:
+        if kind == "error":
+            raise RuntimeError(result)
+        return result
+
+    def _drain(self) -> List[Incident]:
+        incidents: List[Incident] = []
+        while True:
+            try:
+                kind, result = self._outbox.get_nowait()
+            except queue.Empty:
+                return incidents
+            incidents.extend(self._result(kind, result))
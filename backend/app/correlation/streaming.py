@@ -0,0 +1,122 @@
+"""Streaming correlation over a live event feed.
+
+Groups events into incidents as they arrive:
+- Only events at MEDIUM severity or above open or extend a group
+- Events join the open group for their dependency-graph component
+- A group closes once no event has joined it for the correlation window
+- Closed groups with enough events are correlated into an `Incident`
+"""
+from typing import Dict, List, Optional
+
+from ..config import settings
+from ..ingestion.records import EventBuffer, EventRecord
+from ..knowledge.dependency_graph import dependency_graph
+from ..models.incidents import Incident
+from .engine import correlate_events
+from .window import SEVERITY_CODES
+
+
+# Events less severe than this are treated as background noise
+MAX_CORRELATED_SEVERITY = SEVERITY_CODES["medium"]
+
+
+class ComponentIndex:
+    """Maps services to a stable key for their weakly connected component."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._keys: Dict[str, str] = {}
+        self._graph_version = -1
+
+    def key(self, service: str) -> str:
+        graph = self.graph.snapshot()
+        if graph.version != self._graph_version:
+            # The graph changed (e.g. discovered edges); recompute lazily
+            self._keys.clear()
+            self._graph_version = graph.version
+
+        key = self._keys.get(service)
+        if key is not None:
+            return key
+
+        members = [service]
+        seen = {service}
+        for current in members:
+            for neighbour in (*graph.get_upstream(current), *graph.get_downstream(current)):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    members.append(neighbour)
+        key = min(members)
+        for member in members:
+            self._keys[member] = key
+        return key
+
+
+class _OpenGroup:
+    """Events collected for one component while its window is open."""
+
+    __slots__ = ("buffer", "last_epoch")
+
+    def __init__(self):
+        self.buffer = EventBuffer()
+        self.last_epoch = 0.0
+
+
+class StreamingCorrelator:
+    """Incrementally groups events into incidents by component and time window."""
+
+    def __init__(
+        self,
+        window_seconds: Optional[int] = None,
+        min_events: Optional[int] = None,
+        graph=None,
+    ):
+        self.window_seconds = window_seconds if window_seconds is not None else settings.CORRELATION_WINDOW_SECONDS
+        self.min_events = min_events if min_events is not None else settings.MIN_EVENTS_FOR_INCIDENT
+        self.graph = graph or dependency_graph
+        self.components = ComponentIndex(self.graph)
+        self._open: Dict[str, _OpenGroup] = {}
+        # Lower bound on the oldest open group's last event; avoids scanning every push
+        self._oldest_epoch = float("inf")
+
+    def component_of(self, service: str) -> str:
+        """Return a stable key for the weakly connected component of `service`."""
+        return self.components.key(service)
+
+    def push(self, record: EventRecord) -> List[Incident]:
+        """Add one event and return any incidents closed by its arrival."""
+        closed = self.expire(record.epoch)
+        if SEVERITY_CODES[record.severity.value] > MAX_CORRELATED_SEVERITY:
+            return closed
+
+        key = self.component_of(record.source_service)
+        group = self._open.get(key)
+        if group is None:
+            group = self._open[key] = _OpenGroup()
+            self._oldest_epoch = min(self._oldest_epoch, record.epoch)
+        group.buffer.append_record(record)
+        group.last_epoch = max(group.last_epoch, record.epoch)
+        return closed
+
+    def expire(self, now_epoch: float) -> List[Incident]:
+        """Close groups that have been idle for longer than the window."""
+        cutoff = now_epoch - self.window_seconds
+        if cutoff <= self._oldest_epoch:
+            return []
+        stale = [key for key, group in self._open.items() if group.last_epoch < cutoff]
+        closed = self._close(stale)
+        self._oldest_epoch = min((g.last_epoch for g in self._open.values()), default=float("inf"))
+        return closed
+
+    def flush(self) -> List[Incident]:
+        """Close every open group (end of stream)."""
+        self._oldest_epoch = float("inf")
+        return self._close(list(self._open))
+
+    def _close(self, keys: List[str]) -> List[Incident]:
+        incidents = []
+        for key in keys:
+            group = self._open.pop(key)
+            if len(group.buffer) >= self.min_events:
+                incidents.append(correlate_events(group.buffer, self.graph))
+        return incidents
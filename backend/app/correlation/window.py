@@ -0,0 +1,294 @@
+"""Columnar event window for the correlation engine.
+
+Holds a group of events as parallel NumPy arrays (timestamps, interned
+service IDs, severity codes and message template IDs) so that severity
+roll-up, first-appearance ordering, inter-event gaps and service-distance
+scores are computed in vectorized passes instead of repeated Python loops
+and sorts over model objects. Large windows keep a capped timeline chosen
+from those features (see `timeline_indices`).
+"""
+import re
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..ingestion.records import SEVERITY_LEVELS, EventBuffer, from_epoch, to_epoch
+from ..models.incidents import Severity
+
+
+# Severity codes: lower is more severe, so the roll-up is a single min()
+SEVERITY_CODES = {
+    "critical": 0,
+    "high": 1,
+    "medium": 2,
+    "low": 3,
+    "info": 4,
+}
+
+# Incident severity indexed by event severity code ("info" rolls up to LOW)
+CODE_TO_SEVERITY = [
+    Severity.CRITICAL,
+    Severity.HIGH,
+    Severity.MEDIUM,
+    Severity.LOW,
+    Severity.LOW,
+]
+
+# Variable tokens stripped from messages to derive a template
+_TEMPLATE_PATTERN = re.compile(
+    r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"
+    r"|\b0x[0-9a-f]+\b"
+    r"|\d+(?:\.\d+)*",
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=65_536)
+def message_template(message: str) -> str:
+    """Collapse variable tokens (numbers, hex, UUIDs) into a placeholder.
+
+    Cached, since the same messages recur across windows.
+    """
+    return _TEMPLATE_PATTERN.sub("<*>", message)
+
+
+def intern_messages(messages: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    """Map messages to IDs of the distinct messages, in first-appearance order."""
+    index: Dict[str, int] = {}
+    message_ids = [index.setdefault(message, len(index)) for message in messages]
+    return np.array(message_ids, dtype=np.int32), list(index)
+
+
+def intern_templates(message_ids: np.ndarray, distinct: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    """Map interned messages to template IDs, deriving each distinct message's template once."""
+    template_index: Dict[str, int] = {}
+    template_of = np.fromiter(
+        (template_index.setdefault(message_template(message), len(template_index)) for message in distinct),
+        dtype=np.int32, count=len(distinct),
+    )
+    return template_of[message_ids], list(template_index)
+
+
+def _severity_value(severity) -> str:
+    return severity.value if hasattr(severity, "value") else str(severity)
+
+
+def _epoch_seconds(event) -> float:
+    epoch = getattr(event, "epoch", None)
+    if epoch is not None:
+        return epoch
+    return to_epoch(event.timestamp)
+
+
+class EventWindow:
+    """Struct-of-arrays view over a window of events.
+
+    `items` keeps the original event objects (or the `EventBuffer`) so
+    per-event outputs (such as timeline entries) can be emitted in the
+    vectorized order. Messages and their templates are interned on first
+    use, since only scenario detection and capped timelines need them.
+    """
+
+    def __init__(
+        self,
+        items: List,
+        timestamps: np.ndarray,
+        service_ids: np.ndarray,
+        severity_codes: np.ndarray,
+        services: List[str],
+        message_ids: Optional[np.ndarray] = None,
+        messages: Optional[List[str]] = None,
+    ):
+        self.items = items
+        self.timestamps = timestamps
+        self.service_ids = service_ids
+        self.severity_codes = severity_codes
+        self.services = services
+        self._order: Optional[np.ndarray] = None
+        self._message_ids = message_ids
+        self._messages: List[str] = messages or []
+        self._template_ids: Optional[np.ndarray] = None
+        self._templates: List[str] = []
+
+    @classmethod
+    def from_events(cls, events: Iterable) -> "EventWindow":
+        """Build a window from objects exposing the `LogEvent` attributes."""
+        if isinstance(events, EventBuffer):
+            return cls.from_buffer(events)
+
+        items = list(events)
+        n = len(items)
+
+        service_index: Dict[str, int] = {}
+        info = SEVERITY_CODES["info"]
+        timestamps = np.fromiter((_epoch_seconds(e) for e in items), dtype=np.float64, count=n)
+        service_ids = np.fromiter(
+            (service_index.setdefault(e.source_service, len(service_index)) for e in items),
+            dtype=np.int32, count=n,
+        )
+        severity_codes = np.fromiter(
+            (SEVERITY_CODES.get(_severity_value(e.severity), info) for e in items),
+            dtype=np.int8, count=n,
+        )
+
+        return cls(
+            items=items,
+            timestamps=timestamps,
+            service_ids=service_ids,
+            severity_codes=severity_codes,
+            services=list(service_index),
+        )
+
+    @classmethod
+    def from_buffer(cls, buffer: EventBuffer) -> "EventWindow":
+        """Build a window directly from an `EventBuffer` without touching per-event objects.
+
+        The buffer interns messages as they arrive, so the window reuses its IDs.
+        """
+        return cls(
+            items=buffer,
+            timestamps=np.frombuffer(buffer.epochs, dtype=np.float64).copy(),
+            service_ids=np.frombuffer(buffer.service_ids, dtype=np.int32).copy(),
+            severity_codes=np.frombuffer(buffer.severity_codes, dtype=np.int8).copy(),
+            services=list(buffer.services),
+            message_ids=np.frombuffer(buffer.message_ids, dtype=np.int32).copy(),
+            messages=list(buffer.distinct_messages),
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def order(self) -> np.ndarray:
+        """Chronological permutation of the window (stable for equal timestamps)."""
+        if self._order is None:
+            self._order = np.argsort(self.timestamps, kind="stable")
+        return self._order
+
+    @property
+    def messages(self) -> List[str]:
+        """Distinct messages, in first-appearance order."""
+        if self._message_ids is None:
+            self._message_ids, self._messages = intern_messages([e.message for e in self.items])
+        return self._messages
+
+    def _intern_templates(self):
+        messages = self.messages
+        self._template_ids, self._templates = intern_templates(self._message_ids, messages)
+
+    @property
+    def template_ids(self) -> np.ndarray:
+        """Message template ID per event (indexes `templates`)."""
+        if self._template_ids is None:
+            self._intern_templates()
+        return self._template_ids
+
+    @property
+    def templates(self) -> List[str]:
+        """Distinct message templates, indexed by template ID."""
+        if self._template_ids is None:
+            self._intern_templates()
+        return self._templates
+
+    def severity_rollup(self) -> Severity:
+        """Most severe incident severity present in the window."""
+        if len(self) == 0:
+            return Severity.LOW
+        return CODE_TO_SEVERITY[int(self.severity_codes.min())]
+
+    def first_appearance(self) -> List[str]:
+        """Unique services ordered by their earliest event."""
+        if len(self) == 0:
+            return []
+        chronological = self.service_ids[self.order]
+        unique_ids, first_pos = np.unique(chronological, return_index=True)
+        return [self.services[i] for i in unique_ids[np.argsort(first_pos)]]
+
+    def inter_event_gaps(self) -> np.ndarray:
+        """Seconds between consecutive events in chronological order."""
+        return np.diff(self.timestamps[self.order])
+
+    def service_distance_scores(self, graph, root: Optional[str] = None) -> np.ndarray:
+        """Per-event proximity to `root` in the dependency graph.
+
+        Scores are 1 / (1 + hops) over the undirected dependency graph,
+        ignoring stale edges, and 0 for services that are not connected to
+        the root. The root defaults to the first service to appear in the
+        window. The BFS runs once per window over the (small) service set;
+        the per-event scores are a single gather.
+        """
+        if len(self) == 0:
+            return np.empty(0, dtype=np.float64)
+        if root is None:
+            root = self.services[int(self.service_ids[self.order[0]])]
+
+        graph = graph.snapshot()
+        distances: Dict[str, int] = {root: 0}
+        queue = deque([root])
+        while queue:
+            current = queue.popleft()
+            # Stale (aged-out) edges no longer connect services
+            hot = (*graph.get_hot_upstream(current), *graph.get_hot_downstream(current))
+            for neighbour, _ in hot:
+                if neighbour not in distances:
+                    distances[neighbour] = distances[current] + 1
+                    queue.append(neighbour)
+
+        service_scores = np.array(
+            [1.0 / (1 + distances[s]) if s in distances else 0.0 for s in self.services],
+            dtype=np.float64,
+        )
+        return service_scores[self.service_ids]
+
+    def timeline_indices(self, limit: int, graph) -> np.ndarray:
+        """Events kept in a timeline of at most `limit` entries, chronologically.
+
+        Small windows keep every event. Larger ones keep, in priority order,
+        the first event of each (service, message template) pair, then the
+        most severe events, nearest the first failing service first, with
+        events that open a burst (longest preceding gap) breaking ties.
+        """
+        order = self.order
+        if len(self) <= limit:
+            return order
+
+        services = self.service_ids[order].astype(np.int64)
+        pairs = services * len(self.templates) + self.template_ids[order]
+        repeated = np.ones(len(self), dtype=np.int8)
+        repeated[np.unique(pairs, return_index=True)[1]] = 0
+
+        # Tiers (novelty, then severity) are small integers: keep every tier that fits
+        # whole and only sort the tier that straddles the limit
+        tier = repeated * len(SEVERITY_CODES) + self.severity_codes[order]
+        cut = int(np.searchsorted(np.cumsum(np.bincount(tier)), limit))
+        kept = np.flatnonzero(tier < cut)
+        boundary = np.flatnonzero(tier == cut)
+        gaps = np.concatenate(([np.inf], self.inter_event_gaps()))[boundary]
+        distance = self.service_distance_scores(graph)[order][boundary]
+        # lexsort sorts by the last key first and is stable, so earlier events win full ties
+        ranked = boundary[np.lexsort((-gaps, -distance))]
+        kept = np.concatenate((kept, ranked[:limit - len(kept)]))
+        return order[np.sort(kept)]
+
+    def timeline_fields(self, indices: Optional[np.ndarray] = None) -> Iterator[Tuple[datetime, str, str, str]]:
+        """(timestamp, service, message, severity) per event at `indices` (default: all, chronologically).
+
+        For an `EventBuffer` the fields come straight from its columns, so no
+        per-event record objects are built.
+        """
+        items = self.items
+        indices = self.order if indices is None else indices
+        if isinstance(items, EventBuffer):
+            services, messages = self.services, items.messages
+            severities = [level.value for level in SEVERITY_LEVELS]
+            for i, service, code in zip(
+                indices.tolist(), self.service_ids[indices].tolist(), self.severity_codes[indices].tolist(),
+            ):
+                yield from_epoch(items.epochs[i]), services[service], messages[i], severities[code]
+        else:
+            for i in indices.tolist():
+                e = items[i]
+                yield e.timestamp, e.source_service, e.message, _severity_value(e.severity)
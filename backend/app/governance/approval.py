@@ -7,6 +7,12 @@ from datetime import datetime
 from typing import List, Optional
 from sqlmodel import Session, select
 from ..models.actions import RemediationAction, ApprovalStatus, RiskLevel
+from ..realtime.broker import change_broker
+
+
+def _publish_action(action: RemediationAction, change: str):
+    if change_broker.has_subscribers("action"):
+        change_broker.publish("action", {"change": change, "action": action.model_dump(mode="json")})
 
 
 class ApprovalManager:
@@ -26,6 +32,10 @@ class ApprovalManager:
             
             session.add(action)
         session.commit()
+        if change_broker.has_subscribers("action"):
+            for action in actions:
+                session.refresh(action)  # reload expired attributes before serializing
+                _publish_action(action, "created")
         # Refresh to get IDs if needed, but not strictly required for batch insert performance
     
     def get_action(self, session: Session, action_id: str) -> Optional[RemediationAction]:
@@ -52,6 +62,7 @@ class ApprovalManager:
             session.add(action)
             session.commit()
             session.refresh(action)
+            _publish_action(action, "updated")
             return action
         return None
 
@@ -65,6 +76,7 @@ class ApprovalManager:
             session.add(action)
             session.commit()
             session.refresh(action)
+            _publish_action(action, "updated")
             return action
         return None
 
@@ -76,6 +88,7 @@ class ApprovalManager:
             session.add(action)
             session.commit()
             session.refresh(action)
+            _publish_action(action, "updated")
             return action
         return None
 
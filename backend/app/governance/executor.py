@@ -166,9 +166,9 @@ class Executor:
             return ActionResult(success=True, stdout=f"would POST to {url} with payload {json.dumps(payload)}", dry_run=True)
 
         try:
-            import requests
+            from ..http_clients import http_clients
 
-            r = requests.post(url, json=payload, headers=headers or {})
+            r = http_clients.get("webhook").post(url, json=payload, headers=headers or {})
             return ActionResult(success=(r.status_code < 300), stdout=r.text, stderr=str(r.status_code), dry_run=False)
         except Exception as e:
             return ActionResult(success=False, stderr=str(e), dry_run=False)
@@ -0,0 +1,217 @@
+"""Process-wide pooled HTTP clients for outbound calls.
+
+Every upstream (Prometheus, Loki, the LLM provider, action webhooks) gets
+one long-lived client with its own connection limits and timeouts, so
+connections are kept alive and reused instead of being opened per call.
+Clients are created on first use and closed at application shutdown.
+
+HTTP/2 is used when enabled and the optional `h2` package is installed
+(`pip install httpx[http2]`).
+
+Pool usage is measured by a counting transport in front of httpx's own,
+using only public httpx APIs: a request counts as in flight from send
+until its response body is closed.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional, Union
+
+import httpx
+from prometheus_client import Counter, Gauge
+
+from .config import settings
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+POOL_CONNECTIONS = Gauge(
+    "devsick_http_pool_connections", "Outbound requests using (in_use) or waiting for (waiting) a pooled connection", ["upstream", "state"],
+)
+POOL_LIMIT = Gauge("devsick_http_pool_max_connections", "Outbound connection limit", ["upstream"])
+OUTBOUND_REQUESTS = Counter("devsick_http_requests_total", "Outbound HTTP requests", ["upstream"])
+
+
+@dataclass(frozen=True)
+class Upstream:
+    max_connections: int
+    max_keepalive: int
+    connect_timeout: float
+    read_timeout: float
+    http2: bool = False
+    sync: bool = False  # used from blocking code (e.g. the action executor)
+
+
+UPSTREAMS: Dict[str, Upstream] = {
+    "prometheus": Upstream(20, 10, 2.0, settings.PROMETHEUS_TIMEOUT_SECONDS, http2=True),
+    "loki": Upstream(4, 2, 2.0, 10.0, http2=True),
+    "llm": Upstream(10, 5, 5.0, 60.0, http2=True),
+    "webhook": Upstream(10, 5, 3.0, 10.0, sync=True),
+}
+
+Client = Union[httpx.AsyncClient, httpx.Client]
+
+
+class _InFlight:
+    """Requests holding a pooled connection (or a stream, over HTTP/2)."""
+
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+
+class _ReleasingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Response body that releases its in-flight slot once, when closed."""
+
+    def __init__(self, stream, in_flight: _InFlight):
+        self._stream = stream
+        self._in_flight = in_flight
+        self._released = False
+
+    def _release(self):
+        if not self._released:
+            self._released = True
+            self._in_flight.count -= 1
+
+    def __iter__(self):
+        yield from self._stream
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+def _counted(response: httpx.Response, in_flight: _InFlight) -> httpx.Response:
+    return httpx.Response(
+        status_code=response.status_code, headers=response.headers,
+        stream=_ReleasingStream(response.stream, in_flight), extensions=response.extensions,
+    )
+
+
+class _CountingTransport(httpx.BaseTransport):
+    def __init__(self, transport: httpx.BaseTransport, in_flight: _InFlight):
+        self._transport = transport
+        self.in_flight = in_flight
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight.count += 1
+        try:
+            response = self._transport.handle_request(request)
+        except BaseException:
+            self.in_flight.count -= 1
+            raise
+        return _counted(response, self.in_flight)
+
+    def close(self):
+        self._transport.close()
+
+
+class _AsyncCountingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport, in_flight: _InFlight):
+        self._transport = transport
+        self.in_flight = in_flight
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight.count += 1
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self.in_flight.count -= 1
+            raise
+        return _counted(response, self.in_flight)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class HTTPClientRegistry:
+    """Lazily created, shared clients keyed by upstream name."""
+
+    def __init__(self, upstreams: Optional[Dict[str, Upstream]] = None):
+        self.upstreams = upstreams or UPSTREAMS
+        self._clients: Dict[str, Client] = {}
+        self._in_flight: Dict[str, _InFlight] = {}
+
+    def get(self, name: str) -> Client:
+        """Shared client for `name` (an `httpx.Client` for sync upstreams)."""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._clients[name] = self._create(name, self.upstreams[name])
+        return client
+
+    def _create(self, name: str, upstream: Upstream) -> Client:
+        limits = httpx.Limits(
+            max_connections=upstream.max_connections,
+            max_keepalive_connections=upstream.max_keepalive,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        timeout = httpx.Timeout(upstream.read_timeout, connect=upstream.connect_timeout)
+        counter = OUTBOUND_REQUESTS.labels(name)
+        http2 = upstream.http2 and settings.HTTP2_ENABLED and HTTP2_AVAILABLE
+        in_flight = self._in_flight.setdefault(name, _InFlight())
+        POOL_LIMIT.labels(name).set(upstream.max_connections)
+        for state in ("in_use", "waiting"):
+            POOL_CONNECTIONS.labels(name, state).set_function(lambda n=name, s=state: self.pool_stats(n)[s])
+
+        if upstream.sync:
+            transport = httpx.HTTPTransport(limits=limits, http2=http2)
+            return httpx.Client(
+                transport=_CountingTransport(transport, in_flight), timeout=timeout,
+                event_hooks={"request": [lambda request: counter.inc()]},
+            )
+
+        async def count(request):
+            counter.inc()
+
+        transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+        return httpx.AsyncClient(
+            transport=_AsyncCountingTransport(transport, in_flight), timeout=timeout,
+            event_hooks={"request": [count]},
+        )
+
+    def pool_stats(self, name: str) -> Dict:
+        """In-flight requests; beyond `max_connections` they wait for a connection."""
+        max_connections = self.upstreams[name].max_connections
+        in_flight = self._in_flight[name].count if name in self._in_flight else 0
+        return {
+            "max_connections": max_connections,
+            "in_flight": in_flight,
+            "in_use": min(in_flight, max_connections),
+            "waiting": max(in_flight - max_connections, 0),
+        }
+
+    def stats(self) -> Dict:
+        return {name: {**self.pool_stats(name), "open": name in self._clients} for name in self.upstreams}
+
+    async def aclose(self):
+        """Close every client; called at shutdown."""
+        clients, self._clients = self._clients, {}
+        for name, client in clients.items():
+            try:
+                if isinstance(client, httpx.AsyncClient):
+                    await client.aclose()
+                else:
+                    client.close()
+            except Exception as e:
+                logger.warning(f"Error closing {name} HTTP client: {e}")
+
+
+# Global singleton
+http_clients = HTTPClientRegistry()
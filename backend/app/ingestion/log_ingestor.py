@@ -4,8 +4,9 @@ Receives raw log events, validates them, and stores them in the database.
 """
 from datetime import datetime, timedelta
 from typing import List, Optional
-from sqlmodel import Session, select
+from sqlmodel import Session, select, insert
 from ..models.events import LogEvent, LogEventCreate
+from .records import EventBuffer
 
 
 class EventStore:
@@ -30,7 +31,23 @@ class EventStore:
 
     def ingest_batch(self, session: Session, events: List[LogEventCreate]) -> List[LogEvent]:
         """Ingest multiple events at once."""
-        return [self.ingest(session, e) for e in events]
+        buffer = EventBuffer()
+        for e in events:
+            buffer.append_create(e)
+        return self.persist(session, buffer)
+
+    def persist(self, session: Session, buffer: EventBuffer) -> List[LogEvent]:
+        """Persist buffered events in a single commit.
+
+        This is the boundary where compact records become `LogEvent` rows.
+        Rows are written with a single multi-row INSERT rather than through
+        the ORM unit of work, so the returned instances stay populated.
+        """
+        rows = buffer.to_log_events()
+        if rows:
+            session.execute(insert(LogEvent), [row.model_dump() for row in rows])
+            session.commit()
+        return rows
 
     def get_all(self, session: Session) -> List[LogEvent]:
         """Return all stored events."""
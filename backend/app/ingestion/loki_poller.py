@@ -1,6 +1,5 @@
 """Service to poll logs from Loki and ingest them into Devsick."""
 import asyncio
-import httpx
 import logging
 from datetime import datetime, timezone
 from typing import Optional
@@ -8,19 +7,36 @@ from sqlmodel import Session
 
 from ..config import settings
 from .log_ingestor import event_store
-from ..models.events import LogEventCreate, SeverityLevel
+from .records import EventBuffer
+from ..models.events import SeverityLevel
 from ..database import engine
+from ..http_clients import http_clients
+from ..resilience import CircuitOpenError, backoff_delay, breakers
 from ..knowledge.dependency_graph import dependency_graph
+from ..knowledge.graph_store import graph_store
 
 logger = logging.getLogger(__name__)
 
 class LokiPoller:
     """Polls Loki for new log events and pushes them to the event store."""
     
-    def __init__(self, loki_url: str = "http://loki:3100"):
-        self.loki_url = loki_url
+    def __init__(self, loki_url: Optional[str] = None):
+        self.loki_url = loki_url or settings.LOKI_URL
         self.last_sync_time: Optional[int] = None # Nanoseconds since epoch
         self.running = False
+        self.failures = 0  # consecutive failed polls
+
+    async def _query(self, client, params: dict) -> dict:
+        response = await client.get(f"{self.loki_url}/loki/api/v1/query_range", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def _next_delay(self) -> float:
+        """Poll interval, plus a jittered exponential backoff while Loki is failing."""
+        interval = settings.LOKI_POLL_INTERVAL_SECONDS
+        if not self.failures:
+            return interval
+        return interval + backoff_delay(self.failures - 1, interval, settings.LOKI_MAX_BACKOFF_SECONDS)
 
     def _determine_severity(self, message: str) -> SeverityLevel:
         """Simple heuristic to determine log severity."""
@@ -28,9 +44,9 @@ class LokiPoller:
         if any(w in message_low for w in ["fatal", "panic", "emergency"]):
             return SeverityLevel.CRITICAL
         if any(w in message_low for w in ["error", "err"]):
-            return SeverityLevel.ERROR
+            return SeverityLevel.HIGH
         if any(w in message_low for w in ["warn", "warning"]):
-            return SeverityLevel.WARNING
+            return SeverityLevel.MEDIUM
         return SeverityLevel.INFO
 
     async def poll(self):
@@ -38,67 +54,86 @@ class LokiPoller:
         self.running = True
         logger.info(f"Starting Loki poller targeting {self.loki_url}")
         
-        async with httpx.AsyncClient() as client:
-            while self.running:
-                try:
-                    # Query for any container log
-                    query = '{container=~".+"}'
-                    params = {
-                        "query": query,
-                        "limit": 100
-                    }
-                    if self.last_sync_time:
-                        params["start"] = self.last_sync_time + 1
+        client = http_clients.get("loki")
+        while self.running:
+            try:
+                # Query for any container log
+                query = '{container=~".+"}'
+                params = {
+                    "query": query,
+                    "limit": 100
+                }
+                if self.last_sync_time:
+                    params["start"] = self.last_sync_time + 1
+                    
+                data = await breakers["loki"].call(lambda: self._query(client, params))
+                    
+                results = data.get("data", {}).get("result", [])
                     
-                    response = await client.get(f"{self.loki_url}/loki/api/v1/query_range", params=params)
+                max_ts = self.last_sync_time or 0
                     
-                    if response.status_code == 200:
-                        data = response.json()
-                        results = data.get("data", {}).get("result", [])
+                buffer = EventBuffer()
+                callers, callees, failed = [], [], []
+                for res in results:
+                    stream_info = res.get("stream", {})
+                    container = stream_info.get("container", "unknown")
                         
-                        max_ts = self.last_sync_time or 0
+                    # Register service in dependency graph
+                    dependency_graph.add_node(container, container)
                         
-                        with Session(engine) as session:
-                            for res in results:
-                                stream_info = res.get("stream", {})
-                                container = stream_info.get("container", "unknown")
-                                
-                                # Register service in dependency graph
-                                dependency_graph.add_node(container, container)
-                                
-                                for val in res.get("values", []):
-                                    ts_ns = int(val[0])
-                                    message = val[1]
-                                    
-                                    # Simple heuristic for dependency discovery
-                                    # Example: "Calling auth-service..."
-                                    if "calling" in message.lower():
-                                        for node_id in dependency_graph.nodes.keys():
-                                            if node_id in message.lower() and node_id != container:
-                                                dependency_graph.add_edge(container, node_id)
-                                    
-                                    if ts_ns > max_ts:
-                                        max_ts = ts_ns
-                                        
-                                    # Ingest event
-                                    event = LogEventCreate(
-                                        source_service=container,
-                                        severity=self._determine_severity(message),
-                                        message=message,
-                                        timestamp=datetime.fromtimestamp(ts_ns / 1_000_000_000, tz=timezone.utc),
-                                        metadata=stream_info
-                                    )
-                                    event_store.ingest(session, event)
+                    for val in res.get("values", []):
+                        ts_ns = int(val[0])
+                        message = val[1]
                             
-                            session.commit()
-                        
-                        if max_ts > 0:
-                            self.last_sync_time = max_ts
+                        severity = self._determine_severity(message)
+
+                        # Simple heuristic for dependency discovery
+                        # Example: "Calling auth-service..."
+                        if "calling" in message.lower():
+                            for node_id in dependency_graph.nodes.keys():
+                                if node_id in message.lower() and node_id != container:
+                                    callers.append(container)
+                                    callees.append(node_id)
+                                    failed.append(severity in (SeverityLevel.CRITICAL, SeverityLevel.HIGH))
                             
-                except Exception as e:
-                    logger.error(f"Error polling Loki: {e}")
+                        if ts_ns > max_ts:
+                            max_ts = ts_ns
+                                
+                        # Buffer event; rows are written once per poll
+                        buffer.append(
+                            source_service=container,
+                            severity=severity,
+                            message=message,
+                            timestamp=datetime.fromtimestamp(ts_ns / 1_000_000_000, tz=timezone.utc),
+                            metadata=stream_info
+                        )
+                    
+                # Edge traffic is applied once per poll as a single batch
+                dependency_graph.record_traffic(callers, callees, failed)
+
+                if len(buffer):
+                    with Session(engine) as session:
+                        event_store.persist(session, buffer)
+                    
+                if max_ts > 0:
+                    self.last_sync_time = max_ts
+                        
+                self.failures = 0
+            except CircuitOpenError as e:
+                self.failures += 1
+                logger.debug(f"Skipping Loki poll: {e}")
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Error polling Loki: {e}")
+
+            # Share discovered edges and pick up other replicas' discoveries
+            try:
+                with Session(engine) as session:
+                    graph_store.sync(session)
+            except Exception as e:
+                logger.error(f"Error syncing dependency graph: {e}")
                 
-                await asyncio.sleep(5) # Poll every 5 seconds
+            await asyncio.sleep(self._next_delay())
 
     def stop(self):
         self.running = False
@@ -0,0 +1,215 @@
+"""Dependency discovery from OpenTelemetry traces.
+
+Spans received over OTLP/HTTP (protobuf or JSON) are reduced to
+caller -> callee observations: whenever a span's parent belongs to a
+different `service.name`, the parent's service called the child's. Calls,
+errors and the child span's duration are aggregated per edge in memory and
+applied to the `DependencyGraph` in one batched `record_traffic` call per
+flush.
+
+Memory is bounded: recently seen span IDs (to match parents that arrived in
+an earlier request) live in a fixed-size LRU, children whose parent has not
+arrived yet wait in a bounded orphan table, and the pending edge table is
+flushed early once it reaches its size limit.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+
+from ..config import settings
+from ..knowledge.dependency_graph import DependencyGraph, dependency_graph
+
+logger = logging.getLogger(__name__)
+
+STATUS_CODE_ERROR = 2
+SERVICE_NAME_KEY = "service.name"
+UNKNOWN_SERVICE = "unknown_service"
+
+# (span_id, parent_span_id, service, duration_ms, is_error); ids are raw bytes, b"" for none
+SpanTuple = Tuple[bytes, bytes, str, float, bool]
+
+
+def _service_name(attributes) -> str:
+    for attr in attributes:
+        if attr.key == SERVICE_NAME_KEY:
+            return attr.value.string_value or UNKNOWN_SERVICE
+    return UNKNOWN_SERVICE
+
+
+def decode_protobuf(body: bytes) -> List[SpanTuple]:
+    """Flatten an OTLP protobuf ExportTraceServiceRequest into span tuples."""
+    request = ExportTraceServiceRequest.FromString(body)
+    spans: List[SpanTuple] = []
+    append = spans.append
+    for resource_spans in request.resource_spans:
+        service = _service_name(resource_spans.resource.attributes)
+        for scope_spans in resource_spans.scope_spans:
+            for span in scope_spans.spans:
+                append((
+                    span.span_id,
+                    span.parent_span_id,
+                    service,
+                    (span.end_time_unix_nano - span.start_time_unix_nano) / 1e6,
+                    span.status.code == STATUS_CODE_ERROR,
+                ))
+    return spans
+
+
+def _json_service_name(resource: Dict) -> str:
+    for attr in resource.get("attributes", ()):
+        if attr.get("key") == SERVICE_NAME_KEY:
+            return attr.get("value", {}).get("stringValue") or UNKNOWN_SERVICE
+    return UNKNOWN_SERVICE
+
+
+def _json_is_error(status: Optional[Dict]) -> bool:
+    code = (status or {}).get("code", 0)
+    return code == STATUS_CODE_ERROR or code == "STATUS_CODE_ERROR"
+
+
+def decode_json(body: bytes) -> List[SpanTuple]:
+    """Flatten an OTLP/JSON export request (hex span IDs, camelCase fields)."""
+    request = json.loads(body)
+    spans: List[SpanTuple] = []
+    append = spans.append
+    for resource_spans in request.get("resourceSpans", ()):
+        service = _json_service_name(resource_spans.get("resource", {}))
+        # "instrumentationLibrarySpans" is the pre-1.0 name of scopeSpans
+        scopes = resource_spans.get("scopeSpans") or resource_spans.get("instrumentationLibrarySpans", ())
+        for scope_spans in scopes:
+            for span in scope_spans.get("spans", ()):
+                # uint64 nanoseconds may be encoded as strings
+                duration = int(span.get("endTimeUnixNano", 0)) - int(span.get("startTimeUnixNano", 0))
+                append((
+                    bytes.fromhex(span.get("spanId", "")),
+                    bytes.fromhex(span.get("parentSpanId", "")),
+                    service,
+                    duration / 1e6,
+                    _json_is_error(span.get("status")),
+                ))
+    return spans
+
+
+class SpanEdgeAggregator:
+    """Bounded-memory aggregation of span parent/child links into edge traffic."""
+
+    def __init__(
+        self,
+        graph: Optional[DependencyGraph] = None,
+        max_pending_edges: Optional[int] = None,
+        span_cache_size: Optional[int] = None,
+        max_orphans: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        self.graph = graph or dependency_graph
+        self.max_pending_edges = max_pending_edges or settings.OTLP_MAX_PENDING_EDGES
+        self.span_cache_size = span_cache_size or settings.OTLP_SPAN_CACHE_SIZE
+        self.max_orphans = max_orphans or settings.OTLP_MAX_ORPHANS
+        self.flush_interval = flush_interval or settings.OTLP_FLUSH_INTERVAL_SECONDS
+        self._recent: "OrderedDict[bytes, str]" = OrderedDict()  # span id -> service
+        self._orphans: "OrderedDict[bytes, List[Tuple[str, float, bool]]]" = OrderedDict()
+        self._orphan_count = 0
+        # (caller, callee) -> [calls, errors, summed latency ms]
+        self._pending: Dict[Tuple[str, str], List[float]] = {}
+        self._last_flush = time.monotonic()
+        self.stats = {"spans": 0, "edges_observed": 0, "orphans_dropped": 0, "flushes": 0}
+        self.running = False
+
+    def ingest(self, spans: List[SpanTuple]) -> int:
+        """Aggregate a decoded batch; returns the number of cross-service calls seen."""
+        batch = {span_id: service for span_id, _, service, _, _ in spans}
+        recent, orphans = self._recent, self._orphans
+        observed = 0
+
+        for _, parent_id, service, duration, error in spans:
+            if not parent_id:
+                continue
+            parent_service = batch.get(parent_id) or recent.get(parent_id)
+            if parent_service is None:
+                self._add_orphan(parent_id, service, duration, error)
+            elif parent_service != service:
+                self._observe(parent_service, service, duration, error)
+                observed += 1
+
+        if orphans:
+            # Children that arrived before their parent
+            for span_id, service in batch.items():
+                waiting = orphans.pop(span_id, None)
+                if waiting:
+                    self._orphan_count -= len(waiting)
+                    for child_service, duration, error in waiting:
+                        if child_service != service:
+                            self._observe(service, child_service, duration, error)
+                            observed += 1
+
+        recent.update(batch)
+        overflow = len(recent) - self.span_cache_size
+        for _ in range(max(overflow, 0)):
+            recent.popitem(last=False)
+
+        self.stats["spans"] += len(spans)
+        self.stats["edges_observed"] += observed
+        if len(self._pending) >= self.max_pending_edges:
+            self.flush()
+        return observed
+
+    def _observe(self, caller: str, callee: str, duration_ms: float, error: bool):
+        totals = self._pending.get((caller, callee))
+        if totals is None:
+            totals = self._pending[(caller, callee)] = [0.0, 0.0, 0.0]
+        totals[0] += 1
+        totals[1] += error
+        totals[2] += duration_ms
+
+    def _add_orphan(self, parent_id: bytes, service: str, duration: float, error: bool):
+        if self._orphan_count >= self.max_orphans:
+            _, dropped = self._orphans.popitem(last=False)
+            self._orphan_count -= len(dropped)
+            self.stats["orphans_dropped"] += len(dropped)
+        self._orphans.setdefault(parent_id, []).append((service, duration, error))
+        self._orphan_count += 1
+
+    def flush(self, now: Optional[float] = None) -> int:
+        """Apply pending edge traffic to the graph; returns edges updated."""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        callers = [caller for caller, _ in pending]
+        callees = [callee for _, callee in pending]
+        totals = list(pending.values())
+        self.stats["flushes"] += 1
+        return self.graph.record_traffic(
+            callers, callees,
+            errors=[t[1] for t in totals],
+            now=now,
+            counts=[t[0] for t in totals],
+            latency_ms=[t[2] for t in totals],
+        )
+
+    def maybe_flush(self) -> int:
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            return self.flush()
+        return 0
+
+    async def run(self):
+        """Flush periodically so edges land even when no new spans arrive."""
+        self.running = True
+        while self.running:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                self.maybe_flush()
+            except Exception as e:
+                logger.error(f"Error flushing span edges: {e}")
+
+    def stop(self):
+        self.running = False
+
+
+# Global singleton
+span_aggregator = SpanEdgeAggregator()
@@ -0,0 +1,175 @@
+"""Compact in-memory event representation for the ingestion hot path.
+
+`LogEvent` is a full SQLModel/Pydantic instance with a JSON metadata string
+and several datetime objects. Between ingestion and persistence, events are
+kept in an `EventBuffer` instead: a struct-of-arrays with interned service
+IDs and messages, severity codes and epoch-second timestamps. Conversion to `LogEvent`
+happens only at the persistence/API boundary.
+"""
+import json
+import uuid
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+from ..models.events import LogEvent, LogEventCreate, SeverityLevel
+
+
+SEVERITY_LEVELS: List[SeverityLevel] = [
+    SeverityLevel.CRITICAL,
+    SeverityLevel.HIGH,
+    SeverityLevel.MEDIUM,
+    SeverityLevel.LOW,
+    SeverityLevel.INFO,
+]
+_SEVERITY_CODE: Dict[SeverityLevel, int] = {level: i for i, level in enumerate(SEVERITY_LEVELS)}
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch(timestamp: Optional[datetime]) -> float:
+    """Convert a datetime to epoch seconds, treating naive values as UTC."""
+    if timestamp is None:
+        return datetime.now(timezone.utc).timestamp()
+    if timestamp.tzinfo is None:
+        return (timestamp - _EPOCH).total_seconds()
+    return timestamp.timestamp()
+
+
+def from_epoch(epoch: float) -> datetime:
+    """Convert epoch seconds back to the naive UTC datetimes stored in the DB."""
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).replace(tzinfo=None)
+
+
+class EventRecord:
+    """Lightweight view of one buffered event.
+
+    Exposes the `LogEvent` attributes read by correlation and prompt
+    building without carrying a Pydantic model.
+    """
+
+    __slots__ = ("id", "source_service", "severity", "message", "epoch", "metadata_json")
+
+    def __init__(self, id: str, source_service: str, severity: SeverityLevel,
+                 message: str, epoch: float, metadata_json: str = "{}"):
+        self.id = id
+        self.source_service = source_service
+        self.severity = severity
+        self.message = message
+        self.epoch = epoch
+        self.metadata_json = metadata_json
+
+    @property
+    def timestamp(self) -> datetime:
+        return from_epoch(self.epoch)
+
+    @property
+    def event_metadata(self) -> Dict:
+        return json.loads(self.metadata_json)
+
+    def to_log_event(self) -> LogEvent:
+        return LogEvent(
+            id=self.id,
+            source_service=self.source_service,
+            severity=self.severity,
+            message=self.message,
+            metadata_json=self.metadata_json,
+            timestamp=self.timestamp,
+        )
+
+
+class EventBuffer:
+    """Struct-of-arrays buffer of events with interned service and message IDs."""
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.messages: List[str] = []
+        self.metadata_json: List[str] = []
+        self.epochs = array("d")
+        self.service_ids = array("i")
+        self.message_ids = array("i")  # index into distinct_messages
+        self.severity_codes = array("b")
+        self.services: List[str] = []
+        self.distinct_messages: List[str] = []
+        self._service_index: Dict[str, int] = {}
+        self._message_index: Dict[str, int] = {}
+
+    def _intern_service(self, source_service: str) -> int:
+        service_id = self._service_index.get(source_service)
+        if service_id is None:
+            service_id = len(self.services)
+            self._service_index[source_service] = service_id
+            self.services.append(source_service)
+        return service_id
+
+    def _intern_message(self, message: str) -> int:
+        message_id = self._message_index.get(message)
+        if message_id is None:
+            message_id = len(self.distinct_messages)
+            self._message_index[message] = message_id
+            self.distinct_messages.append(message)
+        return message_id
+
+    def append(
+        self,
+        source_service: str,
+        severity: SeverityLevel,
+        message: str,
+        timestamp: Optional[datetime] = None,
+        metadata: Optional[Dict] = None,
+        event_id: Optional[str] = None,
+    ) -> int:
+        """Append an event and return its position in the buffer."""
+        service_id = self._intern_service(source_service)
+
+        self.ids.append(event_id or str(uuid.uuid4()))
+        self.messages.append(message)
+        self.message_ids.append(self._intern_message(message))
+        self.metadata_json.append(json.dumps(metadata) if metadata else "{}")
+        self.epochs.append(to_epoch(timestamp))
+        self.service_ids.append(service_id)
+        self.severity_codes.append(_SEVERITY_CODE[SeverityLevel(severity)])
+        return len(self.ids) - 1
+
+    def append_record(self, record: EventRecord) -> int:
+        """Append an existing record, keeping its ID, time and metadata."""
+        service_id = self._intern_service(record.source_service)
+
+        self.ids.append(record.id)
+        self.messages.append(record.message)
+        self.message_ids.append(self._intern_message(record.message))
+        self.metadata_json.append(record.metadata_json)
+        self.epochs.append(record.epoch)
+        self.service_ids.append(service_id)
+        self.severity_codes.append(_SEVERITY_CODE[record.severity])
+        return len(self.ids) - 1
+
+    def append_create(self, event_data: LogEventCreate) -> int:
+        """Append an API ingestion payload."""
+        return self.append(
+            source_service=event_data.source_service,
+            severity=event_data.severity,
+            message=event_data.message,
+            timestamp=event_data.timestamp,
+            metadata=event_data.metadata,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> EventRecord:
+        return EventRecord(
+            id=self.ids[index],
+            source_service=self.services[self.service_ids[index]],
+            severity=SEVERITY_LEVELS[self.severity_codes[index]],
+            message=self.messages[index],
+            epoch=self.epochs[index],
+            metadata_json=self.metadata_json[index],
+        )
+
+    def __iter__(self) -> Iterator[EventRecord]:
+        for i in range(len(self.ids)):
+            yield self[i]
+
+    def to_log_events(self) -> List[LogEvent]:
+        """Materialize `LogEvent` rows for persistence or API responses."""
+        return [record.to_log_event() for record in self]
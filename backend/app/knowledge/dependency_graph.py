@@ -4,9 +4,21 @@ Represents the directed relationships between infrastructure services.
 Used by the correlation engine and AI reasoning layer to understand
 cascading failure patterns.
 """
+import functools
 import json
+import math
 import os
-from typing import List, Dict, Optional, Set
+import threading
+import time
+from collections import deque
+from typing import List, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import settings
+
+# Upper bound on memoized closures per direction (oldest entries are evicted)
+MAX_CACHED_CLOSURES = 4096
 
 
 class ServiceNode:
@@ -43,36 +55,277 @@ class DependencyEdge:
         }
 
 
+def _writer(method):
+    """Serialize mutations; readers use snapshots and never take this lock."""
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return locked
+
+
 class DependencyGraph:
-    """Directed graph of service dependencies."""
+    """Directed graph of service dependencies.
+
+    Services are interned to dense integer IDs. Adjacency is kept as
+    integer lists in both directions, with an edge hash index keyed by
+    (from_id, to_id) so duplicate checks and edge lookups are O(1).
+
+    Transitive closures are memoized per root. `version` increases on every
+    mutation; adding an edge only invalidates the cached closures that can
+    reach it, so impact queries on an unchanged part of the graph stay
+    lookups.
+
+    Observed traffic is kept per edge position in parallel float64 arrays
+    (calls, errors, latency, last-seen epoch). Counters decay exponentially with
+    `EDGE_HALF_LIFE_SECONDS` and are decayed lazily, only when an edge is
+    updated or read. Edges discovered at runtime whose traffic has decayed
+    below `EDGE_STALE_WEIGHT` are stale: they stay in the topology but are
+    skipped when ranking neighbours and building LLM context. Edges declared
+    in service_graph.json never go stale.
+
+    Mutations are serialized by `lock`. Concurrent readers should call
+    `snapshot()` and work on the returned immutable `GraphSnapshot`.
+    """
 
     def __init__(self):
         self.nodes: Dict[str, ServiceNode] = {}
         self.edges: List[DependencyEdge] = []
-        self._adjacency: Dict[str, List[str]] = {}  # from -> [to]
-        self._reverse: Dict[str, List[str]] = {}     # to -> [from]
+        self._ids: Dict[str, int] = {}                    # service id -> int id
+        self._names: List[str] = []                       # int id -> service id
+        self._out: List[List[int]] = []                   # from -> [to]
+        self._in: List[List[int]] = []                    # to -> [from]
+        self._edge_index: Dict[Tuple[int, int], int] = {}  # (from, to) -> position in edges
+        self._declared: set = set()                       # positions of edges from service_graph.json
+        self.version = 0
+        # root -> (BFS order, visited bitmap); "down" follows dependents, "up" dependencies
+        self._closures: Dict[str, Dict[int, Tuple[List[str], bytearray]]] = {"down": {}, "up": {}}
+        # sid -> (line prefix, upstream and downstream (name, edge position)); structure only
+        self._context_entries: Dict[str, Tuple[str, List[Tuple[str, int]], List[Tuple[str, int]]]] = {}
+        # Per-edge traffic counters, indexed by position in `edges`
+        self._calls = np.zeros(64, dtype=np.float64)
+        self._errors = np.zeros(64, dtype=np.float64)
+        self._last_seen = np.zeros(64, dtype=np.float64)  # 0 = never observed
+        self._latency = np.zeros(64, dtype=np.float64)    # summed latency (ms) of timed calls
+        self._timed = np.zeros(64, dtype=np.float64)      # calls that reported a latency
+        self.half_life = float(settings.EDGE_HALF_LIFE_SECONDS)
+        self.stale_weight = settings.EDGE_STALE_WEIGHT
+        self._edge_arrays: Optional[Tuple[int, np.ndarray, np.ndarray]] = None
+        self.traffic_version = 0
+        self.lock = threading.RLock()
+        self._snapshot: Optional["GraphSnapshot"] = None
+
+    def snapshot(self) -> "GraphSnapshot":
+        """Current immutable snapshot; rebuilt (under the writer lock) only after a change."""
+        snap = self._snapshot
+        if snap is not None and snap.version == self.version and snap.traffic_version == self.traffic_version:
+            return snap
+        with self.lock:
+            snap = self._snapshot
+            if snap is None or snap.version != self.version or snap.traffic_version != self.traffic_version:
+                # A single reference swap publishes the new snapshot atomically
+                snap = self._snapshot = GraphSnapshot(self, snap)
+            return snap
 
+    def _intern(self, service_id: str) -> int:
+        idx = self._ids.get(service_id)
+        if idx is None:
+            idx = len(self._names)
+            self._ids[service_id] = idx
+            self._names.append(service_id)
+            self._out.append([])
+            self._in.append([])
+        return idx
+
+    @_writer
     def add_node(self, id: str, name: str, service_type: str = "service", tier: str = "app"):
         """Add a service node dynamically."""
         if id not in self.nodes:
             self.nodes[id] = ServiceNode(id, name, service_type, tier)
-            self._adjacency.setdefault(id, [])
-            self._reverse.setdefault(id, [])
+            self._intern(id)
+            self.version += 1
 
+    @_writer
     def add_edge(self, from_service: str, to_service: str, relation: str = "calls"):
         """Add a dependency edge dynamically."""
         # Ensure nodes exist
         self.add_node(from_service, from_service)
         self.add_node(to_service, to_service)
-        
-        # Check if edge already exists
-        exists = any(e.from_service == from_service and e.to_service == to_service for e in self.edges)
-        if not exists:
-            edge = DependencyEdge(from_service, to_service, relation)
-            self.edges.append(edge)
-            self._adjacency[from_service].append(to_service)
-            self._reverse[to_service].append(from_service)
 
+        src, dst = self._ids[from_service], self._ids[to_service]
+        if (src, dst) not in self._edge_index:
+            self._edge_index[(src, dst)] = len(self.edges)
+            self.edges.append(DependencyEdge(from_service, to_service, relation))
+            if len(self.edges) > len(self._calls):
+                self._grow_traffic()
+            self._out[src].append(dst)
+            self._in[dst].append(src)
+            self.version += 1
+            self._invalidate_edge(src, dst)
+
+    def _grow_traffic(self):
+        capacity = len(self._calls) * 2
+        for attr in ("_calls", "_errors", "_last_seen", "_latency", "_timed"):
+            old = getattr(self, attr)
+            grown = np.zeros(capacity, dtype=np.float64)
+            grown[:len(old)] = old
+            setattr(self, attr, grown)
+
+    @_writer
+    def record_traffic(
+        self,
+        from_services: Sequence[str],
+        to_services: Sequence[str],
+        errors: Optional[Sequence[float]] = None,
+        now: Optional[float] = None,
+        counts: Optional[Sequence[float]] = None,
+        latency_ms: Optional[Sequence[float]] = None,
+    ) -> int:
+        """Record a batch of observed calls.
+
+        Each entry is one call, or `counts[i]` calls when pre-aggregated;
+        `errors[i]` is the number (or truthiness) of failed calls and
+        `latency_ms[i]` their summed latency. Unknown edges are added.
+        Counters of every touched edge are decayed to `now` and then
+        incremented in one vectorized pass.
+        Returns the number of distinct edges updated.
+        """
+        if not from_services:
+            return 0
+        now = time.time() if now is None else now
+        for src, dst in zip(from_services, to_services):
+            self.add_edge(src, dst)
+
+        ids, index = self._ids, self._edge_index
+        positions = np.fromiter(
+            (index[(ids[src], ids[dst])] for src, dst in zip(from_services, to_services)),
+            dtype=np.int64, count=len(from_services),
+        )
+        touched, inverse = np.unique(positions, return_inverse=True)
+        def total(values) -> np.ndarray:
+            if values is None:
+                return np.zeros(len(touched))
+            return np.bincount(inverse, weights=np.asarray(values, dtype=np.float64), minlength=len(touched))
+
+        calls = total(counts) if counts is not None else np.bincount(inverse, minlength=len(touched)).astype(np.float64)
+
+        decay = self._decay(touched, now)
+        self._calls[touched] = self._calls[touched] * decay + calls
+        self._errors[touched] = self._errors[touched] * decay + total(errors)
+        self._latency[touched] = self._latency[touched] * decay + total(latency_ms)
+        self._timed[touched] = self._timed[touched] * decay + (calls if latency_ms is not None else 0.0)
+        self._last_seen[touched] = np.maximum(self._last_seen[touched], now)
+        self.traffic_version += 1
+        return len(touched)
+
+    def _decay(self, positions, now: float) -> np.ndarray:
+        """Decay factor from each edge's last update to `now`."""
+        elapsed = np.maximum(now - self._last_seen[positions], 0.0)
+        return np.exp2(-elapsed / self.half_life)
+
+    def traffic_weights(self, now: Optional[float] = None) -> np.ndarray:
+        """Decayed call counts for every edge, aligned with `edges` (0 if never observed)."""
+        n = len(self.edges)
+        positions = np.arange(n)
+        now = time.time() if now is None else now
+        return np.where(self._last_seen[:n] > 0, self._calls[:n] * self._decay(positions, now), 0.0)
+
+    def edge_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Interned (from, to) IDs of every edge, aligned with `edges`; cached per version."""
+        cached = self._edge_arrays
+        if cached is None or cached[0] != self.version:
+            pairs = np.array(list(self._edge_index), dtype=np.int64).reshape(-1, 2)
+            cached = self._edge_arrays = (self.version, pairs[:, 0], pairs[:, 1])
+        return cached[1], cached[2]
+
+    def service_ids(self, service_ids: List[str]) -> List[int]:
+        """Interned IDs of known services (unknown ones are skipped)."""
+        ids = self._ids
+        return [ids[s] for s in service_ids if s in ids]
+
+    def service_name(self, idx: int) -> str:
+        return self._names[idx]
+
+    def get_edge_traffic(self, from_service: str, to_service: str, now: Optional[float] = None) -> Optional[Dict]:
+        """Decayed calls/errors and last-seen time for one edge."""
+        src, dst = self._ids.get(from_service), self._ids.get(to_service)
+        position = self._edge_index.get((src, dst)) if src is not None and dst is not None else None
+        if position is None:
+            return None
+        return self._traffic(position, time.time() if now is None else now)
+
+    def _traffic(self, position: int, now: float) -> Dict:
+        last_seen = float(self._last_seen[position])
+        if not last_seen:
+            return {"calls": 0.0, "errors": 0.0, "latency_ms": None, "last_seen": None, "stale": False}
+        decay = math.pow(2.0, -max(now - last_seen, 0.0) / self.half_life)
+        calls = float(self._calls[position]) * decay
+        timed = float(self._timed[position])
+        return {
+            "calls": calls,
+            "errors": float(self._errors[position]) * decay,
+            # Both sums decay alike, so their ratio is a decayed mean
+            "latency_ms": float(self._latency[position]) / timed if timed else None,
+            "last_seen": last_seen,
+            "stale": calls < self.stale_weight and position not in self._declared,
+        }
+
+    def _neighbour_edges(self, idx: int, direction: str) -> List[Tuple[str, int]]:
+        """(neighbour name, edge position) pairs in declared order."""
+        index, names = self._edge_index, self._names
+        if direction == "up":
+            return [(names[n], index[(idx, n)]) for n in self._out[idx]]
+        return [(names[n], index[(n, idx)]) for n in self._in[idx]]
+
+    def _rank(self, pairs: List[Tuple[str, int]], now: float) -> List[Tuple[str, Dict]]:
+        """Neighbours hottest-first, skipping stale (discovered, decayed) edges.
+
+        Edges never observed keep their declared (file) order after observed ones.
+        """
+        ranked = []
+        for name, position in pairs:
+            traffic = self._traffic(position, now)
+            if not traffic["stale"]:
+                ranked.append((name, traffic))
+        ranked.sort(key=lambda item: -item[1]["calls"])
+        return ranked
+
+    def _ranked(self, idx: int, direction: str, now: float) -> List[Tuple[str, Dict]]:
+        return self._rank(self._neighbour_edges(idx, direction), now)
+
+    def get_hot_upstream(self, service_id: str, now: Optional[float] = None) -> List[Tuple[str, Dict]]:
+        """Non-stale dependencies of service_id with traffic, hottest first."""
+        idx = self._ids.get(service_id)
+        return self._ranked(idx, "up", time.time() if now is None else now) if idx is not None else []
+
+    def get_hot_downstream(self, service_id: str, now: Optional[float] = None) -> List[Tuple[str, Dict]]:
+        """Non-stale dependents of service_id with traffic, hottest first."""
+        idx = self._ids.get(service_id)
+        return self._ranked(idx, "down", time.time() if now is None else now) if idx is not None else []
+
+    def traffic_snapshot(self, limit: int = 100, now: Optional[float] = None) -> List[Dict]:
+        """The hottest observed edges with their decayed counters."""
+        now = time.time() if now is None else now
+        weights = self.traffic_weights(now)
+        top = np.argsort(-weights, kind="stable")[:limit]
+        return [
+            {**self.edges[p].to_dict(), **self._traffic(int(p), now)}
+            for p in top.tolist() if weights[p] > 0
+        ]
+
+    def has_edge(self, from_service: str, to_service: str) -> bool:
+        """Check whether a direct dependency exists."""
+        return self.get_edge(from_service, to_service) is not None
+
+    def get_edge(self, from_service: str, to_service: str) -> Optional[DependencyEdge]:
+        """Look up a direct dependency edge."""
+        src, dst = self._ids.get(from_service), self._ids.get(to_service)
+        if src is None or dst is None:
+            return None
+        position = self._edge_index.get((src, dst))
+        return self.edges[position] if position is not None else None
+
+    @_writer
     def load_from_file(self, filepath: Optional[str] = None):
         """Load the graph from the service_graph.json file."""
         if filepath is None:
@@ -84,67 +337,125 @@ class DependencyGraph:
             data = json.load(f)
 
         for svc in data.get("services", []):
-            node = ServiceNode(
+            # File definitions take precedence over dynamically discovered nodes
+            self.nodes[svc["id"]] = ServiceNode(
                 id=svc["id"],
                 name=svc["name"],
                 service_type=svc["type"],
                 tier=svc["tier"],
             )
-            self.nodes[node.id] = node
-            self._adjacency.setdefault(node.id, [])
-            self._reverse.setdefault(node.id, [])
+            self._intern(svc["id"])
 
         for dep in data.get("dependencies", []):
-            edge = DependencyEdge(
-                from_service=dep["from"],
-                to_service=dep["to"],
-                relation=dep["relation"],
-            )
-            self.edges.append(edge)
-            self._adjacency.setdefault(dep["from"], []).append(dep["to"])
-            self._reverse.setdefault(dep["to"], []).append(dep["from"])
+            self.add_edge(dep["from"], dep["to"], dep["relation"])
+            self._declared.add(self._edge_index[(self._ids[dep["from"]], self._ids[dep["to"]])])
+
+        # Node metadata may have been replaced in place
+        self.version += 1
+        self._context_entries.clear()
+
+    def _invalidate_edge(self, src: int, dst: int):
+        """Drop memoized results that a new src -> dst edge can change."""
+        # Dependents of x grow iff dst already depended on x (or is x)
+        down = self._closures["down"]
+        for root in [r for r, (_, seen) in down.items() if dst < len(seen) and seen[dst]]:
+            del down[root]
+        # Dependencies of x grow iff x already depended on src (or is src)
+        up = self._closures["up"]
+        for root in [r for r, (_, seen) in up.items() if src < len(seen) and seen[src]]:
+            del up[root]
+        self._context_entries.pop(self._names[src], None)
+        self._context_entries.pop(self._names[dst], None)
+
+    def _closure(self, root: int, direction: str) -> Tuple[List[str], bytearray]:
+        """Memoized BFS from `root` over dependents ("down") or dependencies ("up")."""
+        cache = self._closures[direction]
+        cached = cache.get(root)
+        if cached is not None:
+            return cached
+
+        adjacency = self._in if direction == "down" else self._out
+        visited = bytearray(len(self._names))
+        visited[root] = 1
+        queue = deque([root])
+        order = []
+
+        while queue:
+            current = queue.popleft()
+            order.append(current)
+            for neighbour in adjacency[current]:
+                if not visited[neighbour]:
+                    visited[neighbour] = 1
+                    queue.append(neighbour)
+
+        if len(cache) >= MAX_CACHED_CLOSURES:
+            try:
+                del cache[next(iter(cache))]
+            except (KeyError, RuntimeError, StopIteration):
+                pass  # another snapshot reader evicted concurrently
+        names = self._names
+        cached = cache[root] = ([names[i] for i in order], visited)
+        return cached
 
     def get_upstream(self, service_id: str) -> List[str]:
         """Get services that this service depends on (upstream)."""
-        return self._adjacency.get(service_id, [])
+        idx = self._ids.get(service_id)
+        if idx is None:
+            return []
+        names = self._names
+        return [names[i] for i in self._out[idx]]
 
     def get_downstream(self, service_id: str) -> List[str]:
         """Get services that depend on this service (downstream)."""
-        return self._reverse.get(service_id, [])
+        idx = self._ids.get(service_id)
+        if idx is None:
+            return []
+        names = self._names
+        return [names[i] for i in self._in[idx]]
 
     def get_impact_path(self, root_service: str) -> List[str]:
         """Get all services impacted by a failure in root_service (BFS downstream)."""
-        visited: Set[str] = set()
-        queue = [root_service]
-        path = []
+        root = self._ids.get(root_service)
+        if root is None:
+            return [root_service]
+        return list(self._closure(root, "down")[0])
 
-        while queue:
-            current = queue.pop(0)
-            if current in visited:
-                continue
-            visited.add(current)
-            path.append(current)
-            for downstream in self.get_downstream(current):
-                if downstream not in visited:
-                    queue.append(downstream)
-
-        return path
+    def get_transitive_upstream(self, service_id: str) -> List[str]:
+        """Get every service that service_id depends on, directly or not (BFS upstream)."""
+        idx = self._ids.get(service_id)
+        if idx is None:
+            return []
+        return self._closure(idx, "up")[0][1:]
 
     def get_dependency_chain(self, from_service: str, to_service: str) -> List[str]:
         """Find the dependency chain between two services (BFS)."""
-        visited: Set[str] = set()
-        queue = [(from_service, [from_service])]
+        if from_service == to_service:
+            return [from_service]
+        src, dst = self._ids.get(from_service), self._ids.get(to_service)
+        if src is None or dst is None:
+            return []
+        reachable = self._closure(src, "up")[1]
+        if dst >= len(reachable) or not reachable[dst]:
+            return []
+
+        # Parent pointers instead of copying the path on every enqueue
+        parent = [-1] * len(self._names)
+        parent[src] = src
+        queue = deque([src])
+        forward = self._out
 
         while queue:
-            current, current_path = queue.pop(0)
-            if current == to_service:
-                return current_path
-            if current in visited:
-                continue
-            visited.add(current)
-            for upstream in self.get_upstream(current):
-                if upstream not in visited:
-                    queue.append((upstream, current_path + [upstream]))
+            current = queue.popleft()
+            for upstream in forward[current]:
+                if parent[upstream] == -1:
+                    parent[upstream] = current
+                    if upstream == dst:
+                        chain = [dst]
+                        while chain[-1] != src:
+                            chain.append(parent[chain[-1]])
+                        names = self._names
+                        return [names[i] for i in reversed(chain)]
+                    queue.append(upstream)
 
         return []
 
@@ -156,21 +467,95 @@ class DependencyGraph:
         }
 
     def get_service_context(self, service_ids: List[str]) -> str:
-        """Generate a human-readable description of services and their relationships."""
+        """Generate a human-readable description of services and their relationships.
+
+        Each service's neighbour edges are memoized until the topology around
+        it changes; traffic ranking and annotations are applied per call.
+        """
         lines = ["Service Dependency Context:"]
+        now = time.time()
         for sid in service_ids:
-            node = self.nodes.get(sid)
-            if node:
-                upstream = self.get_upstream(sid)
-                downstream = self.get_downstream(sid)
-                lines.append(
-                    f"- {node.name} ({node.id}): "
-                    f"depends on [{', '.join(upstream)}], "
-                    f"depended on by [{', '.join(downstream)}]"
+            entry = self._context_entries.get(sid)
+            if entry is None:
+                node = self.nodes.get(sid)
+                if not node:
+                    continue
+                idx = self._ids[sid]
+                entry = self._context_entries[sid] = (
+                    f"- {node.name} ({node.id}): ",
+                    self._neighbour_edges(idx, "up"),
+                    self._neighbour_edges(idx, "down"),
                 )
+            prefix, up, down = entry
+            upstream = [_describe(n, t) for n, t in self._rank(up, now)]
+            downstream = [_describe(n, t) for n, t in self._rank(down, now)]
+            lines.append(f"{prefix}depends on [{', '.join(upstream)}], depended on by [{', '.join(downstream)}]")
         return "\n".join(lines)
 
 
+class GraphSnapshot(DependencyGraph):
+    """Immutable, consistent view of a `DependencyGraph`.
+
+    Built under the writer lock and published with a single reference swap,
+    so readers never lock and never observe a half-applied mutation. Its
+    JSON serialization is computed once when it is built. Snapshots that
+    differ only in traffic share the structure, memoized closures, service
+    context entries and serialized form of their predecessor.
+    """
+
+    def __init__(self, graph: DependencyGraph, previous: Optional["GraphSnapshot"] = None):
+        if previous is not None and previous.version == graph.version:
+            for attr in ("nodes", "edges", "_ids", "_names", "_out", "_in", "_edge_index", "_declared",
+                         "_closures", "_context_entries", "_edge_arrays", "serialized"):
+                setattr(self, attr, getattr(previous, attr))
+        else:
+            self.nodes = dict(graph.nodes)
+            self.edges = tuple(graph.edges)
+            self._ids = dict(graph._ids)
+            self._names = tuple(graph._names)
+            self._out = tuple(tuple(a) for a in graph._out)
+            self._in = tuple(tuple(a) for a in graph._in)
+            self._edge_index = dict(graph._edge_index)
+            self._declared = frozenset(graph._declared)
+            self._closures = {"down": {}, "up": {}}
+            self._context_entries = {}
+            self._edge_arrays = None
+            self.serialized = json.dumps(self.to_dict()).encode()
+
+        n = len(self.edges)
+        self._calls = graph._calls[:n].copy()
+        self._errors = graph._errors[:n].copy()
+        self._last_seen = graph._last_seen[:n].copy()
+        self._latency = graph._latency[:n].copy()
+        self._timed = graph._timed[:n].copy()
+        self.half_life = graph.half_life
+        self.stale_weight = graph.stale_weight
+        self.version = graph.version
+        self.traffic_version = graph.traffic_version
+        self.lock = None
+        self._snapshot = self
+
+    def snapshot(self) -> "GraphSnapshot":
+        return self
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("GraphSnapshot is read-only; mutate the DependencyGraph instead")
+
+    add_node = add_edge = record_traffic = load_from_file = _read_only
+
+
+def _describe(service: str, traffic: Dict) -> str:
+    """Service name annotated with its edge's recent traffic, if any."""
+    if not traffic["last_seen"]:
+        return service
+    text = f"~{traffic['calls']:.0f} calls"
+    if traffic["errors"] >= 1:
+        text += f", {traffic['errors']:.0f} errors"
+    if traffic["latency_ms"] is not None:
+        text += f", {traffic['latency_ms']:.0f}ms avg"
+    return f"{service} ({text})"
+
+
 # Global singleton - loaded on import
 dependency_graph = DependencyGraph()
 dependency_graph.load_from_file()
@@ -0,0 +1,76 @@
+"""Split Markdown documentation into embedding-sized chunks.
+
+Documents are split at headings so each chunk stays on one topic, and
+sections longer than the token limit are packed paragraph by paragraph
+into several chunks. Every chunk carries its heading path (e.g.
+"Architecture > Ingestion") so it still makes sense on its own, and a
+content hash that doubles as its stable ID.
+"""
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import List
+
+from ..config import settings
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*\S)\s*$")
+
+
+@dataclass(frozen=True)
+class DocChunk:
+    index: int
+    heading: str
+    text: str
+
+    @property
+    def content_hash(self) -> str:
+        return hashlib.sha256(f"{self.heading}\n{self.text}".encode()).hexdigest()
+
+    @property
+    def document(self) -> str:
+        """Text to embed: heading path followed by the section body."""
+        return f"{self.heading}\n\n{self.text}" if self.heading else self.text
+
+
+def file_hash(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _sections(content: str):
+    """(heading path, body) per heading, skipping fenced code when matching headings."""
+    path: List[str] = []
+    body: List[str] = []
+    in_fence = False
+    for line in content.splitlines():
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING.match(line)
+        if match:
+            yield " > ".join(path), "\n".join(body).strip()
+            level = len(match.group(1))
+            path = path[:level - 1] + [match.group(2)]
+            body = []
+        else:
+            body.append(line)
+    yield " > ".join(path), "\n".join(body).strip()
+
+
+def chunk_markdown(content: str, max_tokens: int = 300) -> List[DocChunk]:
+    """Chunk a Markdown document by heading, then by paragraphs up to `max_tokens`."""
+    limit = max_tokens * settings.CHARS_PER_TOKEN
+    chunks: List[DocChunk] = []
+    for heading, body in _sections(content):
+        if not body:
+            continue
+        current = ""
+        for paragraph in re.split(r"\n\s*\n", body):
+            # Oversized paragraphs are hard-split at the limit
+            pieces = [paragraph[i:i + limit] for i in range(0, len(paragraph), limit)] or [""]
+            for piece in pieces:
+                if current and len(current) + len(piece) + 2 > limit:
+                    chunks.append(DocChunk(len(chunks), heading, current))
+                    current = ""
+                current = f"{current}\n\n{piece}" if current else piece
+        if current.strip():
+            chunks.append(DocChunk(len(chunks), heading, current))
+    return chunks
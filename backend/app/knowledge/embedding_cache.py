@@ -0,0 +1,187 @@
+"""Persistent cache in front of the embedding model.
+
+Embeddings are keyed by a hash of (model, text) and stored in a
+memory-mapped float32 matrix on disk, with a parallel memory-mapped array
+of keys, so they survive restarts without loading everything into RAM.
+When the matrix is full the least recently used slot is reused.
+
+A slot's vector reaches disk before its key does (and a reused slot's old
+key is cleared first), so after a crash a key never points at another
+text's vector; keys written since the last flush are simply lost. Vectors
+of a different dimension than the cache's are not cached.
+
+`CachedEmbeddingFunction` wraps a Chroma embedding function: cached texts
+are served from the matrix and all misses of a call are embedded together
+in one batch.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+import numpy as np
+from prometheus_client import Counter, Histogram
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_REQUESTS = Counter(
+    "devsick_embedding_cache_requests_total", "Texts looked up in the embedding cache", ["result"],
+)
+EMBEDDING_SECONDS = Histogram(
+    "devsick_embedding_batch_seconds", "Time to embed one batch of cache misses",
+)
+EMBEDDING_BATCH_SIZE = Histogram(
+    "devsick_embedding_batch_size", "Texts per embedding model call", buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+KEY_BYTES = 32  # sha256 digest
+
+
+class EmbeddingCache:
+    """Fixed-capacity, memory-mapped embedding store with LRU reuse of slots."""
+
+    def __init__(self, directory: str, capacity: int, namespace: str, flush_interval: Optional[float] = None):
+        self.directory = directory
+        self.capacity = capacity
+        self.namespace = namespace  # model identity; part of every key
+        self.flush_interval = flush_interval if flush_interval is not None else settings.EMBEDDING_CACHE_FLUSH_SECONDS
+        self.dim: Optional[int] = None
+        self.rejected = 0  # vectors not cached because of a dimension mismatch
+        self._vectors: Optional[np.memmap] = None
+        self._keys: Optional[np.memmap] = None
+        self._slots: "OrderedDict[bytes, int]" = OrderedDict()  # key -> slot, least recent first
+        self._free: List[int] = []  # unused slots, popped from the end
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load(self):
+        try:
+            with open(self._path("meta.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return
+        if meta.get("namespace") != self.namespace or meta.get("capacity") != self.capacity:
+            logger.info("Embedding cache layout or model changed; starting empty")
+            return
+        self.dim = meta["dim"]
+        self._vectors = np.memmap(self._path("vectors.f32"), dtype=np.float32, mode="r+", shape=(self.capacity, self.dim))
+        self._keys = np.memmap(self._path("keys.bin"), dtype=f"S{KEY_BYTES}", mode="r+", shape=(self.capacity,))
+        for slot, key in enumerate(self._keys):
+            if key:
+                self._slots[bytes(key)] = slot
+            else:
+                self._free.append(slot)
+        self._free.reverse()
+
+    def _create(self, dim: int):
+        os.makedirs(self.directory, exist_ok=True)
+        self.dim = dim
+        self._vectors = np.memmap(self._path("vectors.f32"), dtype=np.float32, mode="w+", shape=(self.capacity, dim))
+        self._keys = np.memmap(self._path("keys.bin"), dtype=f"S{KEY_BYTES}", mode="w+", shape=(self.capacity,))
+        self._slots.clear()
+        self._free = list(range(self.capacity - 1, -1, -1))
+        with open(self._path("meta.json"), "w") as f:
+            json.dump({"namespace": self.namespace, "capacity": self.capacity, "dim": dim}, f)
+
+    def key(self, text: str) -> bytes:
+        return hashlib.sha256(f"{self.namespace}\0{text}".encode()).digest()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def get_many(self, keys: Sequence[bytes]) -> List[Optional[np.ndarray]]:
+        """Cached vectors (copies) for `keys`, None where missing."""
+        found: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for key in keys:
+                slot = self._slots.get(key)
+                if slot is None:
+                    found.append(None)
+                else:
+                    self._slots.move_to_end(key)
+                    found.append(np.array(self._vectors[slot]))
+        return found
+
+    def put_many(self, keys: Sequence[bytes], vectors: np.ndarray):
+        """Cache `vectors` under `keys`; skipped if their dimension differs from the cache's."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            if self._vectors is None:
+                self._create(vectors.shape[1])
+            elif vectors.shape[1] != self.dim:
+                self.rejected += len(vectors)
+                logger.warning(f"Not caching {len(vectors)} embeddings of dimension {vectors.shape[1]} (cache holds {self.dim})")
+                return
+
+            placed = {}  # key -> slot; duplicates in one call keep the last vector
+            for key, vector in list(zip(keys, vectors))[-self.capacity:]:
+                slot = placed.get(key)
+                if slot is None:
+                    slot = self._slots.pop(key, None)
+                if slot is None:
+                    slot = self._free.pop() if self._free else self._slots.popitem(last=False)[1]
+                placed[key] = slot
+                self._keys[slot] = b""  # unpublished until its vector is on disk
+                self._vectors[slot] = vector
+            # Cleared keys must reach disk before the vectors that overwrite their slots
+            self._keys.flush()
+            self._vectors.flush()
+            for key, slot in placed.items():
+                self._keys[slot] = key
+                self._slots[key] = slot
+
+            if time.monotonic() - self._flushed_at >= self.flush_interval:
+                self._flush()
+
+    def _flush(self):
+        self._vectors.flush()
+        self._keys.flush()
+        self._flushed_at = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            if self._vectors is not None:
+                self._flush()
+
+
+class CachedEmbeddingFunction:
+    """Chroma embedding function that consults an `EmbeddingCache` first."""
+
+    def __init__(self, embed, cache: EmbeddingCache):
+        self.embed = embed
+        self.cache = cache
+        self.stats = {"hits": 0, "misses": 0, "batches": 0}
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        keys = [self.cache.key(text) for text in input]
+        found = self.cache.get_many(keys)
+
+        # Each distinct missing text is embedded once, all in one batch
+        missing = OrderedDict((key, text) for key, text, vector in zip(keys, input, found) if vector is None)
+        hits = len(input) - sum(vector is None for vector in found)
+        self.stats["hits"] += hits
+        self.stats["misses"] += len(input) - hits
+        EMBEDDING_CACHE_REQUESTS.labels("hit").inc(hits)
+        EMBEDDING_CACHE_REQUESTS.labels("miss").inc(len(input) - hits)
+
+        if missing:
+            start = time.perf_counter()
+            vectors = np.asarray(self.embed(list(missing.values())), dtype=np.float32)
+            EMBEDDING_SECONDS.observe(time.perf_counter() - start)
+            EMBEDDING_BATCH_SIZE.observe(len(missing))
+            self.stats["batches"] += 1
+            self.cache.put_many(list(missing), vectors)
+            fresh = dict(zip(missing, vectors))
+            found = [fresh[key] if vector is None else vector for key, vector in zip(keys, found)]
+
+        return [vector.tolist() for vector in found]
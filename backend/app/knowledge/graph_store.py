@@ -0,0 +1,171 @@
+"""Database persistence and delta sync for the dependency graph.
+
+Edges discovered at runtime (e.g. by `LokiPoller`) are written to the
+`graph_elements` table, whose autoincrementing `version` column doubles as a
+change sequence. Each replica pushes its local discoveries and pulls rows
+above the last version it applied, on top of `service_graph.json`.
+
+Versions are assigned at insert but become visible at commit, so on
+Postgres a row can appear below a version a replica has already read.
+Reads therefore re-scan `GRAPH_SYNC_LOOKBACK_VERSIONS` behind the last
+version seen; applying an element twice is a no-op.
+"""
+import importlib
+import logging
+from itertools import islice
+from typing import Dict, List, Sequence
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, insert, func
+
+from ..config import settings
+from ..models.graph import GraphElement
+from ..realtime.broker import change_broker
+from .dependency_graph import DependencyGraph, DependencyEdge, ServiceNode, dependency_graph
+
+logger = logging.getLogger(__name__)
+
+
+def _node_key(service_id: str) -> str:
+    return f"node:{service_id}"
+
+
+def _edge_key(from_service: str, to_service: str) -> str:
+    return f"edge:{from_service}->{to_service}"
+
+
+def _insert_missing(session: Session, rows: List[Dict]):
+    """Insert rows, skipping keys another replica stored concurrently."""
+    dialect = session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = importlib.import_module(f"sqlalchemy.dialects.{dialect}").insert
+        session.execute(dialect_insert(GraphElement).on_conflict_do_nothing(index_elements=["key"]), rows)
+    else:
+        for row in rows:
+            try:
+                with session.begin_nested():
+                    session.execute(insert(GraphElement), [row])
+            except IntegrityError:
+                pass
+    session.commit()
+
+
+class GraphStore:
+    """Keeps an in-memory `DependencyGraph` in sync with the database."""
+
+    def __init__(self, graph: DependencyGraph):
+        self.graph = graph
+        self.version = 0  # highest stored version applied to the in-memory graph
+        self._applied: set = set()  # versions applied within the lookback window
+        # Everything already in the graph (the file baseline) is never persisted
+        self._node_cursor = len(graph.nodes)
+        self._edge_cursor = len(graph.edges)
+
+    def sync(self, session: Session) -> int:
+        """Push local discoveries, then pull changes from other replicas."""
+        before = self.version
+        self.push(session)
+        rows = self.pull(session)
+        if rows and change_broker.has_subscribers("graph"):
+            change_broker.publish("graph", self._delta(rows, before))
+        return len(rows)
+
+    def push(self, session: Session) -> int:
+        """Persist nodes and edges added to the graph since the last push."""
+        with self.graph.lock:
+            new_nodes = list(islice(self.graph.nodes.values(), self._node_cursor, None))
+            new_edges = self.graph.edges[self._edge_cursor:]
+        if not new_nodes and not new_edges:
+            return 0
+
+        elements = [
+            GraphElement(
+                key=_node_key(node.id), kind="node", service_id=node.id,
+                name=node.name, service_type=node.service_type, tier=node.tier,
+            )
+            for node in new_nodes
+        ] + [
+            GraphElement(
+                key=_edge_key(edge.from_service, edge.to_service), kind="edge",
+                from_service=edge.from_service, to_service=edge.to_service, relation=edge.relation,
+            )
+            for edge in new_edges
+        ]
+        # Nodes come first so a delta never references an unknown service
+        rows: Dict[str, Dict] = {e.key: e.model_dump(exclude={"version"}) for e in elements}
+
+        # Elements pulled from other replicas are already stored and filtered here
+        existing = set(session.exec(select(GraphElement.key).where(GraphElement.key.in_(list(rows)))).all())
+        pending = [row for key, row in rows.items() if key not in existing]
+        if pending:
+            try:
+                _insert_missing(session, pending)
+            except Exception:
+                # Cursors stay put, so the whole batch is retried next sync
+                session.rollback()
+                raise
+
+        self._node_cursor += len(new_nodes)
+        self._edge_cursor += len(new_edges)
+        return len(pending)
+
+    def _changes(self, session: Session, since: int) -> Sequence[GraphElement]:
+        """Stored rows above `since`, re-reading the lookback window behind it."""
+        floor = max(since - settings.GRAPH_SYNC_LOOKBACK_VERSIONS, 0)
+        return session.exec(
+            select(GraphElement).where(GraphElement.version > floor).order_by(GraphElement.version)
+        ).all()
+
+    def pull(self, session: Session) -> List[GraphElement]:
+        """Apply stored elements not yet applied; returns the newly applied rows.
+
+        Pulled elements are appended to the graph after the push cursors, so
+        the next push offers them again and finds them already stored.
+        """
+        rows = [row for row in self._changes(session, self.version) if row.version not in self._applied]
+        with self.graph.lock:
+            for row in rows:
+                if row.kind == "node":
+                    self.graph.add_node(row.service_id, row.name, row.service_type, row.tier)
+                else:
+                    self.graph.add_edge(row.from_service, row.to_service, row.relation)
+                self._applied.add(row.version)
+                self.version = max(self.version, row.version)
+        floor = self.version - settings.GRAPH_SYNC_LOOKBACK_VERSIONS
+        self._applied = {version for version in self._applied if version > floor}
+        return rows
+
+    def change_tag(self, session: Session, since: int) -> str:
+        """Identifies the rows `delta(since)` returns: highest version and row count."""
+        floor = max(since - settings.GRAPH_SYNC_LOOKBACK_VERSIONS, 0)
+        latest, count = session.exec(
+            select(func.max(GraphElement.version), func.count()).where(GraphElement.version > floor)
+        ).one()
+        return f"{latest or since}.{count}"
+
+    def delta(self, session: Session, since: int) -> Dict:
+        """Nodes and edges stored after `since`, in `to_dict` format.
+
+        Includes the lookback window behind `since`, which clients merge
+        idempotently, so late-committed rows reach them too.
+        """
+        return self._delta(self._changes(session, since), since)
+
+    def _delta(self, rows: Sequence[GraphElement], since: int) -> Dict:
+        services: List[Dict] = []
+        dependencies: List[Dict] = []
+        for row in rows:
+            if row.kind == "node":
+                services.append(ServiceNode(row.service_id, row.name, row.service_type, row.tier).to_dict())
+            else:
+                dependencies.append(DependencyEdge(row.from_service, row.to_service, row.relation).to_dict())
+        return {
+            "version": max([since] + [row.version for row in rows]),
+            "since": since,
+            "services": services,
+            "dependencies": dependencies,
+        }
+
+
+# Global singleton bound to the shared graph
+graph_store = GraphStore(dependency_graph)
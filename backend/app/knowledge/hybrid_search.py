@@ -0,0 +1,211 @@
+"""Keyword (BM25) retrieval, metadata filters and rank fusion for incident memory.
+
+Embeddings match paraphrases well but exact identifiers poorly: a query for
+"SSL_ERROR_EXPIRED_CERT_ALERT" or "vault-backend" should find the record
+that contains exactly that string. `BM25Index` is an in-process inverted
+index over the same documents as the vector store. Identifiers are kept as
+whole tokens (and also split into their parts), so exact matches score
+highest.
+
+`SearchFilter` is applied to both retrievers before ranking: it becomes a
+Chroma `where` clause for the vector query and a metadata predicate for
+BM25. `relative_score_fusion` merges the two signals over one candidate
+pool.
+"""
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+# Words joined by - _ . : / stay one token, e.g. "vault-backend", "ssl_error_expired_cert_alert"
+TOKEN = re.compile(r"[a-z0-9]+(?:[-_.:/][a-z0-9]+)*")
+PART = re.compile(r"[a-z0-9]+")
+
+DOCUMENTATION, INCIDENT = "documentation", "incident"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased tokens; compound identifiers also yield their parts."""
+    tokens = []
+    for token in TOKEN.findall(text.lower()):
+        tokens.append(token)
+        parts = PART.findall(token)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def to_epoch(value: Union[datetime, float, int, None]) -> Optional[float]:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return None if value is None else float(value)
+
+
+@dataclass(frozen=True)
+class SearchFilter:
+    """Metadata pre-filter shared by the vector and keyword retrievers.
+
+    `kind` is "incident" or "documentation". `since`/`until` bound an
+    incident's `created_at`, so a time range excludes documentation.
+    `source` selects the chunks of one ingested document.
+    """
+
+    scenario_type: Optional[str] = None
+    kind: Optional[str] = None
+    since: Optional[float] = None
+    until: Optional[float] = None
+    source: Optional[str] = None
+
+    @classmethod
+    def build(cls, scenario_type=None, kind=None, since=None, until=None, source=None) -> "SearchFilter":
+        if kind not in (None, INCIDENT, DOCUMENTATION):
+            raise ValueError(f"kind must be {INCIDENT!r} or {DOCUMENTATION!r}, got {kind!r}")
+        return cls(scenario_type, kind, to_epoch(since), to_epoch(until), source)
+
+    def __bool__(self) -> bool:
+        return any(v is not None for v in (self.scenario_type, self.kind, self.since, self.until, self.source))
+
+    def to_where(self) -> Optional[Dict[str, Any]]:
+        """Chroma `where` clause, or None when unfiltered."""
+        conditions: List[Dict[str, Any]] = []
+        if self.scenario_type is not None:
+            conditions.append({"scenario_type": self.scenario_type})
+        if self.kind is not None:
+            conditions.append({"type": self.kind})
+        if self.since is not None:
+            conditions.append({"created_at": {"$gte": self.since}})
+        if self.until is not None:
+            conditions.append({"created_at": {"$lte": self.until}})
+        if self.source is not None:
+            conditions.append({"source": self.source})
+        if not conditions:
+            return None
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+    def matches(self, metadata: Dict[str, Any]) -> bool:
+        """Same semantics as `to_where`: a missing field never matches."""
+        if self.scenario_type is not None and metadata.get("scenario_type") != self.scenario_type:
+            return False
+        if self.kind is not None and metadata.get("type") != self.kind:
+            return False
+        created_at = metadata.get("created_at")
+        if self.since is not None and (created_at is None or created_at < self.since):
+            return False
+        if self.until is not None and (created_at is None or created_at > self.until):
+            return False
+        if self.source is not None and metadata.get("source") != self.source:
+            return False
+        return True
+
+
+class BM25Index:
+    """Thread-safe inverted index with Okapi BM25 scoring."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, identifier_boost: float = 2.0):
+        self.k1 = k1
+        self.b = b
+        self.identifier_boost = identifier_boost  # weight of whole-identifier query terms over plain words
+        self._postings: Dict[str, Dict[str, int]] = {}  # term -> {doc id: term frequency}
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, Tuple[str, ...]] = {}  # doc id -> distinct terms, for removal
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._lengths
+
+    def add(self, ids: Sequence[str], documents: Sequence[str], metadatas: Sequence[Dict[str, Any]]):
+        """Index documents, replacing any previous version with the same id."""
+        with self._lock:
+            for doc_id, text, metadata in zip(ids, documents, metadatas):
+                self._remove(doc_id)
+                counts = Counter(tokenize(text or ""))
+                for term, tf in counts.items():
+                    self._postings.setdefault(term, {})[doc_id] = tf
+                length = sum(counts.values())
+                self._lengths[doc_id] = length
+                self._terms[doc_id] = tuple(counts)
+                self._metadata[doc_id] = dict(metadata or {})
+                self._total_length += length
+
+    def update_metadata(self, ids: Sequence[str], metadatas: Sequence[Dict[str, Any]]):
+        with self._lock:
+            for doc_id, metadata in zip(ids, metadatas):
+                if doc_id in self._metadata:
+                    self._metadata[doc_id] = dict(metadata)
+
+    def remove(self, ids: Iterable[str]):
+        with self._lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+
+    def _remove(self, doc_id: str):
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+        for term in self._terms.pop(doc_id):
+            posting = self._postings[term]
+            del posting[doc_id]
+            if not posting:
+                del self._postings[term]
+        del self._metadata[doc_id]
+        self._total_length -= length
+
+    def scores(self, query: str, where: Optional[SearchFilter] = None) -> Dict[str, float]:
+        """BM25 score of every document matching `where` that shares a term with `query`."""
+        terms = set(tokenize(query))
+        scores: Dict[str, float] = {}
+        with self._lock:
+            count = len(self._lengths)
+            if not count or not terms:
+                return scores
+            average = self._total_length / count
+            allowed: Dict[str, bool] = {}  # filter outcome per doc, evaluated once
+            for term in terms:
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+                if not PART.fullmatch(term):
+                    idf *= self.identifier_boost
+                for doc_id, tf in posting.items():
+                    if where:
+                        ok = allowed.get(doc_id)
+                        if ok is None:
+                            ok = allowed[doc_id] = where.matches(self._metadata[doc_id])
+                        if not ok:
+                            continue
+                    norm = tf + self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+        return scores
+
+    def search(self, query: str, n: int, where: Optional[SearchFilter] = None) -> List[Tuple[str, float]]:
+        """Top `n` (doc id, score) for `query` among documents matching `where`."""
+        return heapq.nlargest(n, self.scores(query, where).items(), key=lambda item: item[1])
+
+
+def relative_score_fusion(
+    similarities: Dict[str, float], keyword_scores: Dict[str, float], vector_weight: float = 0.5,
+) -> List[Tuple[str, float]]:
+    """Merge by score: each signal divided by its best value, then weighted.
+
+    Unlike rank fusion this keeps the size of each signal's lead: a decisive
+    exact-token match is not outvoted by near-equal cosine similarities.
+    Ids missing from `keyword_scores` count as zero keyword score.
+    """
+    best_similarity = max(similarities.values(), default=0.0) or 1.0
+    best_keyword = max(keyword_scores.values(), default=0.0) or 1.0
+    fused = {
+        doc_id: vector_weight * max(similarity, 0.0) / best_similarity
+        + (1 - vector_weight) * keyword_scores.get(doc_id, 0.0) / best_keyword
+        for doc_id, similarity in similarities.items()
+    }
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
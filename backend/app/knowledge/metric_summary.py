@@ -0,0 +1,105 @@
+"""Compact summaries of Prometheus range results.
+
+Raw matrices are far too large for an LLM prompt. Each series is reduced
+to a handful of numbers comparing the incident window with the baseline
+before it: means, peak, p95, trend and the most likely level shift.
+"""
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..config import settings
+
+
+def detect_change_point(values: np.ndarray) -> Optional[int]:
+    """Index where the series' mean shifts most, or None for short series.
+
+    Scores every split by the difference of the means on either side,
+    weighted by sqrt(k * (n - k) / n) so edge splits need a larger shift.
+    """
+    n = len(values)
+    if n < 4:
+        return None
+    k = np.arange(1, n)
+    prefix = np.cumsum(values)[:-1]
+    shift = (values.sum() - prefix) / (n - k) - prefix / k
+    score = np.abs(shift) * np.sqrt(k * (n - k) / n)
+    return int(np.argmax(score)) + 1
+
+
+def summarize_series(values: List, window_start: float) -> Optional[Dict]:
+    """Summarize one Prometheus `values` list ([[ts, "v"], ...]) around `window_start`."""
+    if not values:
+        return None
+    points = np.array(values, dtype=np.float64)
+    points = points[np.isfinite(points[:, 1])]
+    times, series = points[:, 0], points[:, 1]
+    in_window = times >= window_start
+    window = series[in_window]
+    if not len(window):
+        return None
+
+    baseline = series[~in_window]
+    window_times = times[in_window]
+    slope = np.polyfit(window_times / 60.0, window, 1)[0] if len(window) > 1 and np.ptp(window_times) else 0.0
+    change = detect_change_point(series)
+    summary = {
+        "baseline_mean": float(baseline.mean()) if len(baseline) else None,
+        "window_mean": float(window.mean()),
+        "max": float(window.max()),
+        "p95": float(np.percentile(window, 95)),
+        "slope_per_min": float(slope),
+        "change_at": float(times[change]) if change is not None else None,
+        "shift": float(series[change:].mean() - series[:change].mean()) if change is not None else 0.0,
+    }
+    # How unusual the window is relative to baseline noise; used to rank series
+    if len(baseline):
+        noise = baseline.std() + 0.05 * abs(summary["baseline_mean"]) + 1e-9
+        summary["anomaly"] = abs(summary["window_mean"] - summary["baseline_mean"]) / noise
+    else:
+        summary["anomaly"] = 0.0
+    return summary
+
+
+def _num(value: float) -> str:
+    return f"{value:.3g}"
+
+
+def format_summary(metric: str, label: str, summary: Dict) -> str:
+    """One prompt line for a summarized series."""
+    baseline = summary["baseline_mean"]
+    level = f"{_num(baseline)} -> {_num(summary['window_mean'])}" if baseline is not None else _num(summary["window_mean"])
+    line = (
+        f"- {metric} {label}: {level} "
+        f"(max {_num(summary['max'])}, p95 {_num(summary['p95'])}), "
+        f"slope {summary['slope_per_min']:+.3g}/min"
+    )
+    if summary["change_at"] is not None and summary["shift"]:
+        at = datetime.fromtimestamp(summary["change_at"], tz=timezone.utc).strftime("%H:%M:%SZ")
+        line += f", shift {summary['shift']:+.3g} at {at}"
+    return line
+
+
+def format_metrics_block(metrics: Dict, token_budget: int) -> str:
+    """Most anomalous series first, truncated to roughly `token_budget` tokens."""
+    rows = [
+        (series["anomaly"], format_summary(name, series["label"], series))
+        for name, results in metrics.items() if name != "warnings"
+        for series in results
+    ]
+    if not rows:
+        lines = ["No metric data for the incident window."]
+    else:
+        rows.sort(key=lambda row: -row[0])
+        lines, used = [], 0
+        for i, (_, line) in enumerate(rows):
+            cost = len(line) // settings.CHARS_PER_TOKEN + 1
+            if used + cost > token_budget:
+                lines.append(f"- ... {len(rows) - i} less anomalous series omitted")
+                break
+            lines.append(line)
+            used += cost
+    if metrics.get("warnings"):
+        lines.append(f"Unavailable: {', '.join(metrics['warnings'])}")
+    return "\n".join(lines)
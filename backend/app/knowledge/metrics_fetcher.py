@@ -1,48 +1,169 @@
 """Service to fetch Prometheus metrics for AI analysis."""
-import httpx
+import asyncio
 import logging
+import math
+import re
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+import httpx
+
 from ..config import settings
+from ..http_clients import http_clients
+from ..resilience import breakers, hedged, retry
+from .metric_summary import summarize_series
+from .promql_cache import PromQLCache, align, promql_cache
 
 logger = logging.getLogger(__name__)
 
+# Service label values safe to splice into a regex matcher
+SERVICE_NAME = re.compile(r"^[A-Za-z0-9_:-]+$")
+
+
+def _selector(*matchers: str) -> str:
+    return "{" + ",".join(m for m in matchers if m) + "}"
+
+
+def incident_queries(services: Optional[List[str]] = None) -> Dict[str, str]:
+    """PromQL for the incident metrics, scoped to `services` where series carry a service label.
+
+    Node-level CPU and memory have no service label and stay per instance.
+    """
+    names = [s for s in services or () if SERVICE_NAME.match(s)]
+    service = f'service=~"{"|".join(names)}"' if names else ""
+    server_error = 'status=~"5.."'
+    return {
+        "cpu_usage": 'sum(rate(node_cpu_seconds_total{mode!="idle"}[1m])) by (instance)',
+        "memory_usage": 'node_memory_Active_bytes / node_memory_MemTotal_bytes',
+        "request_rate": f'sum(rate(http_requests_total{_selector(service)}[1m])) by (service)',
+        "error_rate": f'sum(rate(http_requests_total{_selector(server_error, service)}[1m])) by (service)',
+        "latency_p95": (
+            f'histogram_quantile(0.95, sum(rate(http_request_duration_seconds_bucket{_selector(service)}[1m])) '
+            'by (le, service))'
+        ),
+    }
+
+
+# Prometheus rejects range queries returning more points per series than this
+MAX_RANGE_POINTS = 11_000
+
+
 class MetricsFetcher:
-    """Fetches relevant infrastructure metrics for a given time window."""
-    
-    async def get_incident_metrics(self, timestamp: datetime, window_minutes: int = 5) -> Dict[str, Any]:
-        """Fetch a snapshot of metrics around a specific timestamp."""
+    """Fetches relevant infrastructure metrics for a given time window.
+
+    Queries run concurrently over the shared Prometheus client, each bounded by its own
+    timeout, so a fetch takes about as long as the slowest query. Queries
+    that fail are reported in `warnings` rather than failing the fetch.
+    Results are shared through the `PromQLCache`.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        query_timeout: Optional[float] = None,
+        cache: Optional[PromQLCache] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.base_url = base_url or settings.PROMETHEUS_URL
+        self.query_timeout = query_timeout or settings.PROMETHEUS_QUERY_TIMEOUT_SECONDS
+        self.cache = cache or promql_cache
+        self._client = client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or http_clients.get("prometheus")
+
+    async def _get(self, path: str, params: Dict[str, Any]) -> List[Dict]:
+        """Query through the Prometheus circuit breaker, hedging slow and retrying refused requests.
+
+        The breaker wraps the whole retried, hedged query, so one logical
+        query counts as one breaker call however many copies it sent.
+        """
+        return await breakers["prometheus"].call(lambda: retry(
+            lambda: hedged(lambda: self._request(path, params), settings.PROMETHEUS_HEDGE_DELAY_SECONDS),
+            attempts=settings.PROMETHEUS_RETRIES,
+            retry_on=(httpx.TransportError,),
+        ))
+
+    async def _request(self, path: str, params: Dict[str, Any]) -> List[Dict]:
+        request = self.client.get(f"{self.base_url}{path}", params=params)
+        response = await asyncio.wait_for(request, self.query_timeout)
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("status") != "success":
+            raise ValueError(payload.get("error", "query failed"))
+        return payload.get("data", {}).get("result", [])
+
+    async def query(self, promql: str, time: Optional[int] = None) -> List[Dict]:
+        """Instant query; returns the result vector.
+
+        Without `time` the query is evaluated at the current cache bucket, so
+        concurrent "latest value" callers share one upstream query.
+        """
+        if time is None:
+            time = self.cache.evaluation_time()
+        params = {"query": promql, "time": time}
+        return await self.cache.get(("query", promql, time), lambda: self._get("/api/v1/query", params))
+
+    async def query_range(self, promql: str, start: int, end: int, step: Optional[int] = None) -> List[Dict]:
+        """Range query; returns a matrix of series with `values`."""
+        step = step or settings.PROMETHEUS_RANGE_STEP_SECONDS
+        step = max(step, math.ceil((end - start) / MAX_RANGE_POINTS))
+        # Step-aligned bounds give identical windows (and cache keys) to nearby callers
+        start, end = align(start, step), align(end, step)
+        params = {"query": promql, "start": start, "end": end, "step": step}
+        return await self.cache.get(
+            ("query_range", promql, start, end, step), lambda: self._get("/api/v1/query_range", params),
+        )
+
+    async def get_incident_metrics(
+        self,
+        timestamp: datetime,
+        services: Optional[List[str]] = None,
+        window_minutes: int = 5,
+        step: Optional[int] = None,
+        baseline_minutes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Summarize metrics for `services` over the window around a specific timestamp.
+
+        The range also covers `baseline_minutes` before the window so each
+        series can be compared with its normal level. Returns, per metric, a
+        list of `summarize_series` dicts with the series `label`.
+        """
+        baseline_minutes = baseline_minutes if baseline_minutes is not None else settings.METRICS_BASELINE_MINUTES
         start = timestamp - timedelta(minutes=window_minutes)
         end = timestamp + timedelta(minutes=1)
-        
+
         # Convert to Prometheus timestamp format (seconds)
         start_ts = int(start.timestamp())
         end_ts = int(end.timestamp())
-        
-        queries = {
-            "cpu_usage": 'sum(rate(node_cpu_seconds_total{mode!="idle"}[1m])) by (instance)',
-            "memory_usage": 'node_memory_Active_bytes / node_memory_MemTotal_bytes',
-            "request_rate": 'sum(rate(http_requests_total[1m])) by (service)',
-            "error_rate": 'sum(rate(http_requests_total{status=~"5.."}[1m])) by (service)',
-            "latency_p95": 'histogram_quantile(0.95, sum(rate(http_request_duration_seconds_bucket[1m])) by (le, service))'
-        }
-        
-        results = {}
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            for name, query in queries.items():
-                try:
-                    response = await client.get(
-                        f"{settings.PROMETHEUS_URL}/api/v1/query",
-                        params={"query": query, "time": end_ts}
-                    )
-                    if response.status_code == 200:
-                        data = response.json()
-                        results[name] = data.get("data", {}).get("result", [])
-                except Exception as e:
-                    logger.error(f"Error fetching metric {name}: {e}")
-                    results[name] = []
-        
+
+        queries = incident_queries(services)
+        names = list(queries)
+        outcomes = await asyncio.gather(
+            *(self.query_range(queries[name], start_ts - baseline_minutes * 60, end_ts, step) for name in names),
+            return_exceptions=True,
+        )
+
+        results: Dict[str, Any] = {}
+        warnings = []
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Error fetching metric {name}: {outcome!r}")
+                warnings.append(f"{name}: {outcome.__class__.__name__}")
+                results[name] = []
+                continue
+            results[name] = []
+            for series in outcome:
+                summary = summarize_series(series.get("values", []), start_ts)
+                if summary is not None:
+                    labels = series.get("metric", {})
+                    summary["label"] = labels.get("service") or labels.get("instance") or ",".join(labels.values())
+                    results[name].append(summary)
+        if warnings:
+            results["warnings"] = warnings
+
         return results
 
+
 metrics_fetcher = MetricsFetcher()
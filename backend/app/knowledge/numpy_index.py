@@ -0,0 +1,481 @@
+"""Built-in vector backend: memory-mapped embeddings with exact or IVF-PQ search.
+
+Embeddings are stored L2-normalized as rows of a float32 matrix in a
+memory-mapped file (`ann_vectors.f32`), so cosine similarity is a dot
+product and the matrix is paged in by the OS rather than held in RAM.
+Records (id, document, metadata) live in SQLite next to it, one row per
+matrix slot; only metadata is kept in memory, for filtering.
+
+While a query's candidate set (after metadata filtering) has at most
+`ANN_EXACT_MAX_VECTORS` rows, search is exact: one matrix-vector product
+and a partial sort. Larger stores get an IVF-PQ index (`ann_ivfpq.npz`):
+vectors are assigned to the nearest of ~sqrt(n) k-means centroids, and
+each residual is compressed to one byte per subvector by product
+quantization. A query scans the `ANN_PROBE_LISTS` nearest lists using
+lookup tables, then re-scores the best `ANN_RERANK_CANDIDATES` exactly
+from the matrix. Vectors written after the last build are scored exactly
+until more than `ANN_REBUILD_FRACTION` of the store is unindexed, which
+triggers a rebuild.
+
+Writes are serialized; searches read immutable index objects without the
+write lock, taking it only briefly to copy out the records they return
+(skipping slots deleted or rewritten mid-search). Index builds run in a
+background thread.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import settings
+from .hybrid_search import SearchFilter
+from .vector_backends import VectorBackend, VectorRecord, normalize
+
+logger = logging.getLogger(__name__)
+
+PQ_CENTROIDS = 256  # one uint8 code per subvector
+TRAINING_SAMPLE = 20_000  # vectors used to train the coarse quantizer
+PQ_TRAINING_SAMPLE = PQ_CENTROIDS * 40
+KMEANS_ITERATIONS = 10
+SQLITE_MAX_PARAMS = 900
+
+
+def _top(scores: np.ndarray, n: int) -> np.ndarray:
+    """Indices of the `n` largest scores, largest first."""
+    if n < len(scores):
+        part = np.argpartition(-scores, n - 1)[:n]
+    else:
+        part = np.arange(len(scores))
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+def nearest(data: np.ndarray, centroids: np.ndarray, spherical: bool = False) -> np.ndarray:
+    """Index of the closest centroid per row (by cosine if `spherical`, else Euclidean)."""
+    scores = data @ centroids.T
+    if not spherical:  # argmin |x - c|^2 == argmax x.c - |c|^2 / 2
+        scores -= 0.5 * (centroids ** 2).sum(1)
+    return np.argmax(scores, axis=1)
+
+
+def kmeans(data: np.ndarray, k: int, rng: np.random.Generator, spherical: bool = False) -> np.ndarray:
+    """Lloyd's k-means; `spherical` clusters unit vectors by cosine similarity."""
+    k = min(k, len(data))
+    centroids = data[rng.choice(len(data), k, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assign = nearest(data, centroids, spherical)
+        counts = np.bincount(assign, minlength=k)
+        sums = np.stack([np.bincount(assign, weights=column, minlength=k) for column in data.T], axis=1)
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        if empty.any():  # reseed empty clusters from random points
+            centroids[empty] = data[rng.choice(len(data), int(empty.sum()))]
+        if spherical:
+            centroids = normalize(centroids)
+    return centroids
+
+
+class IVFPQIndex:
+    """Inverted lists over k-means centroids with product-quantized residuals."""
+
+    def __init__(self, centroids, codebooks, list_of, codes, generation: int):
+        self.centroids = centroids  # (lists, dim)
+        self.codebooks = codebooks  # (subvectors, 256, dim / subvectors)
+        self.list_of = list_of      # (slots,) list per slot, -1 when not indexed
+        self.codes = codes          # (slots, subvectors) uint8
+        self.generation = generation
+        indexed = np.flatnonzero(list_of >= 0)
+        self.order = indexed[np.argsort(list_of[indexed], kind="stable")]
+        self.offsets = np.searchsorted(list_of[self.order], np.arange(len(centroids) + 1))
+
+    @property
+    def subvectors(self) -> int:
+        return self.codebooks.shape[0]
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, slots: np.ndarray, subvectors: int, generation: int, seed: int = 0) -> "IVFPQIndex":
+        rng = np.random.default_rng(seed)
+        dim = vectors.shape[1]
+        lists = int(np.clip(np.sqrt(len(slots)), 16, 4096))
+        sample = np.asarray(vectors[np.sort(rng.choice(slots, min(len(slots), TRAINING_SAMPLE), replace=False))])
+        centroids = kmeans(sample, lists, rng, spherical=True)
+
+        pq_sample = sample[rng.choice(len(sample), min(len(sample), PQ_TRAINING_SAMPLE), replace=False)]
+        residuals = pq_sample - centroids[nearest(pq_sample, centroids, True)]
+        sub = dim // subvectors
+        codebooks = np.stack([
+            kmeans(np.ascontiguousarray(residuals[:, j * sub:(j + 1) * sub]), PQ_CENTROIDS, rng)
+            for j in range(subvectors)
+        ])
+
+        list_of = np.full(len(vectors), -1, dtype=np.int32)
+        codes = np.zeros((len(vectors), subvectors), dtype=np.uint8)
+        for start in range(0, len(slots), 8192):  # encode in chunks to bound memory
+            chunk = slots[start:start + 8192]
+            block = np.asarray(vectors[chunk])
+            assign = nearest(block, centroids, True)
+            list_of[chunk] = assign
+            residual = block - centroids[assign]
+            for j in range(subvectors):
+                codes[chunk, j] = nearest(residual[:, j * sub:(j + 1) * sub], codebooks[j])
+        return cls(centroids.astype(np.float32), codebooks.astype(np.float32), list_of, codes, generation)
+
+    def search(self, query: np.ndarray, allowed: np.ndarray, probe: int, limit: int) -> np.ndarray:
+        """Up to `limit` allowed slots with the best approximate scores."""
+        coarse = self.centroids @ query
+        lists = _top(coarse, min(probe, len(coarse)))
+        candidates = np.concatenate([self.order[self.offsets[i]:self.offsets[i + 1]] for i in lists])
+        candidates = candidates[allowed[candidates]]
+        if not len(candidates):
+            return candidates
+        # Inner product of the query with every codeword, per subvector
+        table = np.einsum("jd,jkd->jk", query.reshape(self.subvectors, -1), self.codebooks)
+        approx = coarse[self.list_of[candidates]] + table[np.arange(self.subvectors), self.codes[candidates]].sum(1)
+        return candidates[_top(approx, limit)]
+
+    def save(self, path: str):
+        tmp = f"{path}.tmp.npz"
+        np.savez(tmp, centroids=self.centroids, codebooks=self.codebooks, list_of=self.list_of,
+                 codes=self.codes, generation=self.generation)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["IVFPQIndex"]:
+        try:
+            with np.load(path) as data:
+                return cls(data["centroids"], data["codebooks"], data["list_of"], data["codes"], int(data["generation"]))
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+class NumpyBackend(VectorBackend):
+    """Vector backend over a memory-mapped matrix, with SQLite for records."""
+
+    name = "numpy"
+
+    def __init__(self, directory: str, embedding_function):
+        super().__init__(directory, embedding_function)
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()  # writers
+        self._db_lock = threading.Lock()  # the SQLite connection
+        self._db = sqlite3.connect(self._path("ann_records.db"), check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS records ("
+            " slot INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, document TEXT,"
+            " metadata TEXT NOT NULL, generation INTEGER NOT NULL DEFAULT 0);"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+        )
+        self.dim: Optional[int] = None
+        self._vectors: Optional[np.memmap] = None
+        self._capacity = 0
+        self._size = 0  # slots in use or freed; the matrix rows that matter
+        self._slot_of: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._ids = np.empty(0, dtype=object)
+        self._metadata = np.empty(0, dtype=object)
+        self._scenario = np.empty(0, dtype=object)
+        self._type = np.empty(0, dtype=object)
+        self._source = np.empty(0, dtype=object)
+        self._created = np.empty(0, dtype=np.float64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._in_index = np.zeros(0, dtype=bool)
+        self._written = np.zeros(0, dtype=np.int64)  # write sequence number per slot
+        self._write_seq = 0
+        self._ivf: Optional[IVFPQIndex] = None
+        self._building = False
+        self._build_lock = threading.Lock()
+        self.last_build: Dict[str, float] = {}
+        self._load()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    # Storage
+
+    def _load(self):
+        meta = dict(self._db.execute("SELECT key, value FROM meta"))
+        if "dim" not in meta:
+            return
+        self.dim = int(meta["dim"])
+        rows = self._db.execute("SELECT slot, id, metadata, generation FROM records ORDER BY slot").fetchall()
+        path = self._path("ann_vectors.f32")
+        file_rows = os.path.getsize(path) // (self.dim * 4) if os.path.exists(path) else 0
+        self._grow(max(file_rows, rows[-1][0] + 1 if rows else 0))
+        self._ivf = IVFPQIndex.load(self._path("ann_ivfpq.npz"))
+        generation = self._ivf.generation if self._ivf else -1
+        for slot, doc_id, metadata, row_generation in rows:
+            self._set(slot, doc_id, json.loads(metadata))
+            self._in_index[slot] = row_generation == generation
+        self._size = rows[-1][0] + 1 if rows else 0
+        used = set(self._slot_of.values())
+        self._free = [slot for slot in range(self._size) if slot not in used]
+        logger.info(f"Opened numpy vector store: {len(self._slot_of)} records, dim {self.dim}")
+
+    def _grow(self, capacity: int):
+        """Resize the matrix file and per-slot arrays to at least `capacity` rows."""
+        if capacity <= self._capacity:
+            return
+        capacity = max(capacity, 2 * self._capacity, 1024)
+        path = self._path("ann_vectors.f32")
+        if self._vectors is not None:
+            self._vectors.flush()
+        with open(path, "ab") as f:
+            f.truncate(capacity * self.dim * 4)
+        self._vectors = np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+        def pad(array, fill):
+            grown = np.full(capacity, fill, dtype=array.dtype)
+            grown[:len(array)] = array
+            return grown
+
+        self._ids, self._metadata = pad(self._ids, None), pad(self._metadata, None)
+        self._scenario, self._type, self._source = pad(self._scenario, None), pad(self._type, None), pad(self._source, None)
+        self._created = pad(self._created, np.nan)
+        self._alive, self._in_index = pad(self._alive, False), pad(self._in_index, False)
+        self._written = pad(self._written, 0)
+        self._capacity = capacity
+
+    def _set(self, slot: int, doc_id: Optional[str], metadata: Optional[Dict]):
+        alive = doc_id is not None
+        metadata = metadata or {}
+        self._ids[slot] = doc_id
+        self._metadata[slot] = metadata if alive else None
+        self._scenario[slot] = metadata.get("scenario_type")
+        self._type[slot] = metadata.get("type")
+        self._source[slot] = metadata.get("source")
+        created = metadata.get("created_at")
+        self._created[slot] = np.nan if created is None else float(created)
+        self._alive[slot] = alive
+        if alive:
+            self._slot_of[doc_id] = slot
+
+    def count(self) -> int:
+        return len(self._slot_of)
+
+    def upsert(self, ids, documents, metadatas):
+        if not ids:
+            return
+        vectors = normalize(self.embedding_function(list(documents)))
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                with self._db_lock:
+                    self._db.execute("INSERT OR REPLACE INTO meta VALUES ('dim', ?)", (str(self.dim),))
+            # Readers index per-slot arrays by these slots, so they are published
+            # (via _set and _size) only after the arrays have grown
+            assigned: Dict[str, int] = {}  # repeated ids in one batch share a slot
+            size = self._size
+            for doc_id in ids:
+                if doc_id not in assigned:
+                    slot = self._slot_of.get(doc_id)
+                    if slot is None:
+                        slot = self._free.pop() if self._free else size
+                        size = max(size, slot + 1)
+                    assigned[doc_id] = slot
+            slots = [assigned[doc_id] for doc_id in ids]
+            with self._db_lock:
+                self._grow(size)
+                self._vectors[slots] = vectors
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO records (slot, id, document, metadata, generation) VALUES (?, ?, ?, ?, 0)",
+                    [(slot, doc_id, text, json.dumps(meta)) for slot, doc_id, text, meta in zip(slots, ids, documents, metadatas)],
+                )
+                self._db.commit()
+            self._write_seq += 1
+            for slot, doc_id, meta in zip(slots, ids, metadatas):
+                self._set(slot, doc_id, meta)
+                self._in_index[slot] = False
+                self._written[slot] = self._write_seq
+            self._size = size
+            self._maybe_rebuild()
+
+    def update_metadata(self, ids, metadatas):
+        with self._lock:
+            known = [(self._slot_of[i], i, m) for i, m in zip(ids, metadatas) if i in self._slot_of]
+            with self._db_lock:
+                self._db.executemany("UPDATE records SET metadata = ? WHERE slot = ?",
+                                     [(json.dumps(m), slot) for slot, _, m in known])
+                self._db.commit()
+            for slot, doc_id, meta in known:
+                self._set(slot, doc_id, meta)
+
+    def delete(self, ids):
+        with self._lock:
+            slots = [self._slot_of.pop(i) for i in ids if i in self._slot_of]
+            with self._db_lock:
+                self._db.executemany("DELETE FROM records WHERE slot = ?", [(slot,) for slot in slots])
+                self._db.commit()
+            self._write_seq += 1
+            for slot in slots:
+                self._set(slot, None, None)
+                self._in_index[slot] = False
+                self._written[slot] = self._write_seq
+            self._free.extend(slots)
+
+    def flush(self):
+        with self._db_lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+            self._db.commit()
+
+    def _documents(self, ids: Sequence[str]) -> Dict[str, str]:
+        found = {}
+        with self._db_lock:
+            for start in range(0, len(ids), SQLITE_MAX_PARAMS):
+                chunk = list(ids[start:start + SQLITE_MAX_PARAMS])
+                marks = ",".join("?" * len(chunk))
+                found.update(self._db.execute(f"SELECT id, document FROM records WHERE id IN ({marks})", chunk))
+        return found
+
+    def _records(self, slots: Sequence[int], documents: bool = True, seq: Optional[int] = None) -> List[Tuple[int, VectorRecord]]:
+        """(position in `slots`, record) for each slot still holding what was read.
+
+        Searches run without the lock, so a slot may have been deleted, or
+        freed and reused, since it was selected; such slots are skipped.
+        With `seq`, slots rewritten after that write sequence are skipped too.
+        """
+        with self._lock:
+            live = [
+                (position, self._ids[slot], dict(self._metadata[slot]))
+                for position, slot in enumerate(slots)
+                if self._alive[slot] and (seq is None or self._written[slot] <= seq)
+            ]
+        texts = self._documents([doc_id for _, doc_id, _ in live]) if documents else {}
+        return [(position, VectorRecord(doc_id, texts.get(doc_id), meta)) for position, doc_id, meta in live]
+
+    def get(self, ids=None, where=None, limit=None, offset=0, documents=True):
+        if ids is not None:
+            slot_of = self._slot_of
+            slots = [slot_of[i] for i in ids if i in slot_of]
+        else:
+            slots = np.flatnonzero(self._mask(where))[offset:None if limit is None else offset + limit]
+        return [record for _, record in self._records(slots, documents)]
+
+    # Search
+
+    def _mask(self, where: Optional[SearchFilter]) -> np.ndarray:
+        """Slots (up to the high-water mark) that are alive and match `where`."""
+        size = self._size
+        mask = self._alive[:size].copy()
+        if not where:
+            return mask
+        if where.scenario_type is not None:
+            mask &= self._scenario[:size] == where.scenario_type
+        if where.kind is not None:
+            mask &= self._type[:size] == where.kind
+        if where.source is not None:
+            mask &= self._source[:size] == where.source
+        with np.errstate(invalid="ignore"):  # missing created_at is NaN and never matches
+            if where.since is not None:
+                mask &= self._created[:size] >= where.since
+            if where.until is not None:
+                mask &= self._created[:size] <= where.until
+        return mask
+
+    def _search(self, query: np.ndarray, n: int, where: Optional[SearchFilter]) -> Tuple[np.ndarray, np.ndarray]:
+        mask = self._mask(where)
+        candidates = int(mask.sum())
+        if not candidates:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        ivf = self._ivf
+        if ivf is None or candidates <= settings.ANN_EXACT_MAX_VECTORS:
+            if candidates > len(mask) // 2:
+                scores = np.asarray(self._vectors[:len(mask)] @ query)
+                scores[~mask] = -np.inf
+                rows = _top(scores, min(n, candidates))
+                return rows, scores[rows]
+            rows = np.flatnonzero(mask)
+        else:
+            # Unindexed writes since the last build are scored exactly alongside the index
+            in_index = self._in_index[:len(mask)]
+            approx = ivf.search(query, mask & in_index, settings.ANN_PROBE_LISTS,
+                                max(n, settings.ANN_RERANK_CANDIDATES))
+            rows = np.sort(np.concatenate([approx, np.flatnonzero(mask & ~in_index)]))
+        scores = np.asarray(self._vectors[rows] @ query)
+        best = _top(scores, min(n, len(rows)))
+        return rows[best], scores[best]
+
+    def query(self, text, n, where=None):
+        if self._vectors is None:
+            return []
+        query = normalize(self.embedding_function([text]))[0]
+        seq = self._write_seq
+        slots, scores = self._search(query, n, where)
+        return [(record, 1.0 - float(scores[position])) for position, record in self._records(slots, seq=seq)]
+
+    def distances(self, text, ids):
+        slot_of = self._slot_of
+        pairs = [(i, slot_of.get(i)) for i in ids]
+        pairs = [(i, slot) for i, slot in pairs if slot is not None]
+        if not pairs:
+            return {}
+        query = normalize(self.embedding_function([text]))[0]
+        similarities = np.asarray(self._vectors[[slot for _, slot in pairs]] @ query)
+        return {i: 1.0 - float(s) for (i, _), s in zip(pairs, similarities)}
+
+    # IVF-PQ maintenance
+
+    def _maybe_rebuild(self):
+        """Start a background build when the index is missing or too stale (writers hold the lock)."""
+        alive = len(self._slot_of)
+        if self._building or alive <= settings.ANN_EXACT_MAX_VECTORS:
+            return
+        unindexed = alive - int((self._alive & self._in_index).sum())
+        if self._ivf is None or unindexed > settings.ANN_REBUILD_FRACTION * alive:
+            self._building = True
+            threading.Thread(target=self._build_in_background, name="ivfpq-build", daemon=True).start()
+
+    def _build_in_background(self):
+        try:
+            self.build_index()
+        except Exception as e:
+            logger.warning(f"IVF-PQ build failed: {e}")
+        finally:
+            with self._lock:
+                self._building = False
+                self._maybe_rebuild()  # writes during the build may already call for another
+
+    def build_index(self):
+        """(Re)train the IVF-PQ index over all stored vectors.
+
+        Training runs without the write lock. Slots written while it runs
+        are left out of the new index and searched exactly until the next
+        build.
+        """
+        with self._build_lock:
+            with self._lock:
+                start = time.perf_counter()
+                seq, size = self._write_seq, self._size
+                slots = np.flatnonzero(self._alive[:size])
+                vectors = self._vectors
+            if not len(slots):
+                return
+            subvectors = max(d for d in range(1, settings.ANN_PQ_SUBVECTORS + 1) if self.dim % d == 0)
+            generation = (self._ivf.generation if self._ivf else 0) + 1
+            index = IVFPQIndex.train(vectors[:size], slots, subvectors, generation)
+            index.save(self._path("ann_ivfpq.npz"))
+            with self._lock:
+                valid = slots[self._alive[slots] & (self._written[slots] <= seq)]
+                with self._db_lock:
+                    self._db.executemany("UPDATE records SET generation = ? WHERE slot = ?",
+                                         [(generation, int(slot)) for slot in valid])
+                    self._db.commit()
+                in_index = np.zeros(self._capacity, dtype=bool)
+                in_index[valid] = True
+                self._ivf, self._in_index = index, in_index
+            self.last_build = {"vectors": len(valid), "lists": len(index.centroids),
+                               "subvectors": subvectors, "seconds": round(time.perf_counter() - start, 2)}
+            logger.info(f"Built IVF-PQ index: {self.last_build}")
+
+    def stats(self):
+        return {
+            **super().stats(),
+            "dim": self.dim,
+            "capacity": self._capacity,
+            "ivfpq": self.last_build or (self._ivf is not None),
+            "unindexed": int((self._alive & ~self._in_index).sum()) if self._ivf else None,
+        }
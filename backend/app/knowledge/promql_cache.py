@@ -0,0 +1,110 @@
+"""Shared cache for Prometheus query results.
+
+Dashboards poll the same summary queries every few seconds and incident
+analyses repeat the same range queries, so results are cached per
+(query, aligned evaluation time, step). Evaluation times are floored to a
+bucket, which makes every caller within the same bucket ask for, and share,
+the identical result. Concurrent misses on one key are coalesced so only
+the first caller queries Prometheus (singleflight); the rest await its
+result.
+
+Hit/miss/coalesced and upstream query counts are exported on `/metrics`.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+from ..config import settings
+
+CACHE_REQUESTS = Counter(
+    "devsick_promql_cache_requests_total", "PromQL cache lookups", ["result"],
+)
+UPSTREAM_QUERIES = Counter(
+    "devsick_promql_upstream_queries_total", "Queries sent to Prometheus", ["outcome"],
+)
+CACHE_ENTRIES = Gauge("devsick_promql_cache_entries", "Cached PromQL results")
+
+
+def align(timestamp: float, bucket: float) -> int:
+    """Floor a Unix timestamp to the start of its bucket."""
+    return int(timestamp // bucket * bucket) if bucket > 0 else int(timestamp)
+
+
+class PromQLCache:
+    """Async TTL + LRU cache with request coalescing."""
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl = ttl if ttl is not None else settings.PROMQL_CACHE_TTL_SECONDS
+        self.max_entries = max_entries or settings.PROMQL_CACHE_MAX_ENTRIES
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()  # key -> (expires, value)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "upstream_queries": 0, "upstream_errors": 0}
+
+    def evaluation_time(self, now: Optional[float] = None) -> int:
+        """Shared evaluation time for "latest value" queries issued now."""
+        return align(time.time() if now is None else now, self.ttl)
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached result for `key`, calling `load` at most once per key concurrently."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._count("hits", "hit")
+                return entry[1]
+            del self._entries[key]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._count("coalesced", "coalesced")
+            # Shielded so one cancelled waiter doesn't cancel the shared query
+            return await asyncio.shield(pending)
+
+        self._count("misses", "miss")
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await load()
+        except BaseException as exc:
+            self.stats["upstream_errors"] += 1
+            UPSTREAM_QUERIES.labels("error").inc()
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                future.exception()  # waiters re-raise it; don't warn when there are none
+            raise
+        else:
+            UPSTREAM_QUERIES.labels("success").inc()
+            future.set_result(value)
+            self._store(key, value)
+            return value
+        finally:
+            self.stats["upstream_queries"] += 1
+            del self._inflight[key]
+
+    def _store(self, key: Hashable, value: Any):
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        CACHE_ENTRIES.set(len(self._entries))
+
+    def _count(self, stat: str, label: str):
+        self.stats[stat] += 1
+        CACHE_REQUESTS.labels(label).inc()
+
+    def clear(self):
+        self._entries.clear()
+        CACHE_ENTRIES.set(0)
+
+    def snapshot_stats(self) -> Dict:
+        return {**self.stats, "entries": len(self._entries), "inflight": len(self._inflight), "ttl_seconds": self.ttl}
+
+
+# Global singleton shared by every Prometheus reader
+promql_cache = PromQLCache()
@@ -0,0 +1,156 @@
+"""Storage and nearest-neighbour search engines behind `IncidentMemory`.
+
+A `VectorBackend` stores (id, document, metadata) records with an
+embedding per document and answers cosine top-k queries restricted by a
+`SearchFilter`. `IncidentMemory` owns caching, keyword search and fusion;
+backends only store and search vectors.
+
+Two engines are available, selected with `VECTOR_BACKEND`:
+
+  chroma  Chroma persistent client (SQLite + HNSW); the default
+  numpy   built-in engine over a memory-mapped float32 matrix, see numpy_index.py
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import settings
+from .hybrid_search import SearchFilter
+
+
+class VectorRecord(NamedTuple):
+    id: str
+    document: Optional[str]
+    metadata: Dict[str, Any]
+
+
+def normalize(vectors) -> np.ndarray:
+    """Rows scaled to unit length, as float32 (zero rows stay zero)."""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class VectorBackend(ABC):
+    """Record store with cosine top-k search."""
+
+    name = ""
+
+    def __init__(self, directory: str, embedding_function):
+        self.directory = directory
+        self.embedding_function = embedding_function
+
+    @abstractmethod
+    def count(self) -> int:
+        ...
+
+    @abstractmethod
+    def upsert(self, ids: Sequence[str], documents: Sequence[str], metadatas: Sequence[Dict[str, Any]]):
+        """Embed and store documents, replacing records with the same id."""
+
+    @abstractmethod
+    def update_metadata(self, ids: Sequence[str], metadatas: Sequence[Dict[str, Any]]):
+        """Replace metadata without re-embedding."""
+
+    @abstractmethod
+    def delete(self, ids: Sequence[str]):
+        ...
+
+    @abstractmethod
+    def get(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        where: Optional[SearchFilter] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        documents: bool = True,
+    ) -> List[VectorRecord]:
+        """Records by id, or all records matching `where` in a stable order."""
+
+    @abstractmethod
+    def query(self, text: str, n: int, where: Optional[SearchFilter] = None) -> List[Tuple[VectorRecord, float]]:
+        """The `n` nearest records to `text` as (record, cosine distance), nearest first."""
+
+    @abstractmethod
+    def distances(self, text: str, ids: Sequence[str]) -> Dict[str, float]:
+        """Cosine distance from `text` to each stored id."""
+
+    def flush(self):
+        """Persist buffered writes."""
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "records": self.count()}
+
+
+class ChromaBackend(VectorBackend):
+    """Chroma persistent collection; chromadb is imported on construction."""
+
+    name = "chroma"
+
+    def __init__(self, directory: str, embedding_function):
+        super().__init__(directory, embedding_function)
+        import chromadb
+
+        self.client = chromadb.PersistentClient(path=directory)
+        self.collection = self.client.get_or_create_collection(
+            name="incidents",
+            # HNSW parameters only take effect when the collection is created
+            metadata={
+                "hnsw:space": "cosine",
+                "hnsw:construction_ef": settings.CHROMA_HNSW_CONSTRUCTION_EF,
+                "hnsw:search_ef": settings.CHROMA_HNSW_SEARCH_EF,
+            },
+            embedding_function=embedding_function,
+        )
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def upsert(self, ids, documents, metadatas):
+        self.collection.upsert(ids=list(ids), documents=list(documents), metadatas=list(metadatas))
+
+    def update_metadata(self, ids, metadatas):
+        self.collection.update(ids=list(ids), metadatas=list(metadatas))
+
+    def delete(self, ids):
+        self.collection.delete(ids=list(ids))
+
+    def get(self, ids=None, where=None, limit=None, offset=0, documents=True):
+        result = self.collection.get(
+            ids=list(ids) if ids is not None else None,
+            where=where.to_where() if where else None,
+            limit=limit,
+            offset=offset or None,
+            include=["metadatas", "documents"] if documents else ["metadatas"],
+        )
+        texts = result["documents"] or [None] * len(result["ids"])
+        return [VectorRecord(i, text, meta or {}) for i, text, meta in zip(result["ids"], texts, result["metadatas"])]
+
+    def query(self, text, n, where=None):
+        result = self.collection.query(query_texts=[text], n_results=n, where=where.to_where() if where else None)
+        return [
+            (VectorRecord(i, document, meta or {}), distance)
+            for i, document, meta, distance in zip(
+                result["ids"][0], result["documents"][0], result["metadatas"][0], result["distances"][0],
+            )
+        ]
+
+    def distances(self, text, ids):
+        result = self.collection.get(ids=list(ids), include=["embeddings"])
+        if not result["ids"]:
+            return {}
+        query = normalize(self.embedding_function([text]))[0]
+        similarities = normalize(result["embeddings"]) @ query
+        return {i: 1.0 - float(s) for i, s in zip(result["ids"], similarities)}
+
+
+def create_backend(name: str, directory: str, embedding_function) -> VectorBackend:
+    """Backend by `VECTOR_BACKEND` name."""
+    if name == ChromaBackend.name:
+        return ChromaBackend(directory, embedding_function)
+    if name == "numpy":
+        from .numpy_index import NumpyBackend
+
+        return NumpyBackend(directory, embedding_function)
+    raise ValueError(f"Unknown vector backend {name!r}; expected 'chroma' or 'numpy'")
@@ -1,73 +1,302 @@
+import asyncio
+import functools
+import heapq
 import os
-import chromadb
-from chromadb.config import Settings
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from typing import List, Dict, Any, Optional
-import uuid
+
+from ..config import settings
+from .doc_chunker import DocChunk, chunk_markdown, file_hash
+from .embedding_cache import CachedEmbeddingFunction, EmbeddingCache
+from .hybrid_search import DOCUMENTATION, INCIDENT, BM25Index, SearchFilter, relative_score_fusion, to_epoch
+from .vector_backends import VectorBackend, create_backend
 
 logger = logging.getLogger(__name__)
 
 class IncidentMemory:
-    """Vector database for storing and retrieving past incidents and resolutions."""
+    """Vector database for storing and retrieving past incidents and resolutions.
+
+    Records are kept by a `VectorBackend` chosen with `VECTOR_BACKEND`
+    (Chroma, or the built-in NumPy engine). Backend calls are blocking
+    (embedding plus search), so async code should use the `*_async`
+    methods, which run them in a bounded thread pool. Search results are
+    cached for `VECTOR_QUERY_CACHE_TTL_SECONDS` by normalized query text and
+    invalidated by every write.
+
+    Search is hybrid: vector and BM25 keyword candidates, both restricted by
+    the same metadata filter, scored by both signals and fused. The keyword
+    index lives in memory and is rebuilt from the store on open.
 
-    def __init__(self, persist_directory: str = "./data/chroma"):
+    Opening the backend (and loading the embedding model) is the slowest
+    part of startup, so it happens on first use (or in `warm_up`), not here.
+    """
+
+    def __init__(self, persist_directory: str = "./data/chroma", embedding_function=None, backend: Optional[str] = None):
         self.persist_directory = persist_directory
-        self.client = chromadb.PersistentClient(path=persist_directory)
-        self.collection = self.client.get_or_create_collection(
-            name="incidents",
-            metadata={"hnsw:space": "cosine"}
-        )
+        self.embedding_function = embedding_function
+        self.backend_name = backend or settings.VECTOR_BACKEND
+        self._backend: Optional[VectorBackend] = None
+        self._open_lock = threading.Lock()
+        self.keyword_index = BM25Index()
+        self._executor = ThreadPoolExecutor(max_workers=settings.VECTOR_STORE_WORKERS, thread_name_prefix="vector-store")
+        self._query_cache: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (expires, results)
+        self._generation = 0  # bumped by every write; stale searches are not cached
+        self._cache_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._backend is not None
+
+    @property
+    def backend(self) -> VectorBackend:
+        if self._backend is None:
+            self._open()
+        return self._backend
+
+    def _open(self):
+        """Load the embedding model and open the backend, once."""
+        with self._open_lock:
+            if self._backend is not None:
+                return
+            if self.embedding_function is None:
+                from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+                model = DefaultEmbeddingFunction()
+                cache = EmbeddingCache(
+                    os.path.join(self.persist_directory, "embedding_cache"),
+                    settings.EMBEDDING_CACHE_SIZE,
+                    namespace=type(model).__name__,
+                )
+                self.embedding_function = CachedEmbeddingFunction(model, cache)
+            backend = create_backend(self.backend_name, self.persist_directory, self.embedding_function)
+            self._load_keyword_index(backend)
+            self._backend = backend
+
+    def _load_keyword_index(self, backend: VectorBackend, page: int = 1000):
+        """Index every stored document for BM25, a page at a time.
+
+        Records written before incidents carried a `type` are labelled as
+        incidents here, so kind filters apply to them too.
+        """
+        offset = 0
+        while True:
+            batch = backend.get(limit=page, offset=offset)
+            if not batch:
+                break
+            untyped = [record for record in batch if "type" not in record.metadata]
+            for record in untyped:
+                record.metadata["type"] = INCIDENT
+            if untyped:
+                backend.update_metadata([r.id for r in untyped], [r.metadata for r in untyped])
+            self.keyword_index.add([r.id for r in batch], [r.document for r in batch], [r.metadata for r in batch])
+            offset += len(batch)
+        logger.info(f"Keyword index built over {len(self.keyword_index)} documents")
+
+    def warm_up(self) -> Dict[str, Any]:
+        """Open the store and build the keyword index; returns backend stats."""
+        return self.backend.stats()
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def find_similar_incidents_async(self, query_text: str, n_results: int = 3, **filters) -> List[Dict[str, Any]]:
+        return await self._run(functools.partial(self.find_similar_incidents, query_text, n_results, **filters))
+
+    async def store_incidents_async(self, incidents: List[Dict[str, Any]]):
+        return await self._run(self.store_incidents, incidents)
+
+    async def ingest_documentation_async(self, filepath: str) -> Dict[str, int]:
+        return await self._run(self.ingest_documentation, filepath)
+
+    async def warm_up_async(self) -> int:
+        return await self._run(self.warm_up)
+
+    def _invalidate(self):
+        with self._cache_lock:
+            self._generation += 1
+            self._query_cache.clear()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.flush()
+
+    def flush(self):
+        """Write buffered vectors and cached embeddings to disk."""
+        if self._backend is not None:
+            self._backend.flush()
+        cache = getattr(self.embedding_function, "cache", None)
+        if cache is not None:
+            cache.flush()
 
     def store_incident(self, incident_id: str, summary: str, root_cause: str, resolution: List[str], scenario_type: str):
         """Store an incident and its resolution in the vector store."""
-        # Combine fields into a rich document for embedding
-        document = f"Scenario: {scenario_type}\nSummary: {summary}\nRoot Cause: {root_cause}\nResolution Actions: {', '.join(resolution)}"
-        
-        self.collection.add(
-            ids=[incident_id],
-            documents=[document],
-            metadatas=[{
-                "incident_id": incident_id,
-                "scenario_type": scenario_type,
-                "root_cause": root_cause,
+        self.store_incidents([{
+            "incident_id": incident_id,
+            "summary": summary,
+            "root_cause": root_cause,
+            "resolution": resolution,
+            "scenario_type": scenario_type,
+        }])
+
+    def store_incidents(self, incidents: List[Dict[str, Any]]):
+        """Store several incidents with one embedding batch.
+
+        Each item has the `store_incident` arguments as keys, plus an
+        optional `created_at` (datetime or epoch seconds; default now).
+        """
+        if not incidents:
+            return
+        ids, documents, metadatas = [], [], []
+        for item in incidents:
+            resolution = item["resolution"]
+            # Combine fields into a rich document for embedding
+            documents.append(
+                f"Scenario: {item['scenario_type']}\nSummary: {item['summary']}\n"
+                f"Root Cause: {item['root_cause']}\nResolution Actions: {', '.join(resolution)}"
+            )
+            ids.append(item["incident_id"])
+            metadatas.append({
+                "type": INCIDENT,
+                "created_at": to_epoch(item.get("created_at")) or time.time(),
+                "incident_id": item["incident_id"],
+                "scenario_type": item["scenario_type"],
+                "root_cause": item["root_cause"],
                 "resolution": json.dumps(resolution) if isinstance(resolution, list) else resolution
-            }]
-        )
-        logger.info(f"Stored incident {incident_id} in memory.")
-
-    def find_similar_incidents(self, query_text: str, n_results: int = 3) -> List[Dict[str, Any]]:
-        """Search for similar past incidents."""
-        results = self.collection.query(
-            query_texts=[query_text],
-            n_results=n_results
-        )
-        
-        formatted_results = []
-        if results['ids']:
-            for i in range(len(results['ids'][0])):
-                formatted_results.append({
-                    "id": results['ids'][0][i],
-                    "document": results['documents'][0][i],
-                    "metadata": results['metadatas'][0][i],
-                    "distance": results['distances'][0][i]
-                })
+            })
+
+        self.backend.upsert(ids, documents, metadatas)
+        self.keyword_index.add(ids, documents, metadatas)
+        self._invalidate()
+        logger.info(f"Stored {len(ids)} incident(s) in memory.")
+
+    def find_similar_incidents(
+        self,
+        query_text: str,
+        n_results: int = 3,
+        scenario_type: Optional[str] = None,
+        kind: Optional[str] = None,
+        since=None,
+        until=None,
+    ) -> List[Dict[str, Any]]:
+        """Search past incidents and documentation, vector and keyword.
+
+        `scenario_type`, `kind` ("incident" or "documentation") and the
+        `since`/`until` bounds on an incident's creation time (datetime or
+        epoch seconds) filter candidates before ranking. Each result has the
+        cosine `distance`, its BM25 `keyword_score` (None without a keyword
+        match) and the fused `score` it was ranked by.
+        """
+        where = SearchFilter.build(scenario_type, kind, since, until)
+        key = (re.sub(r"\s+", " ", query_text).strip().lower(), n_results, where)
+        with self._cache_lock:
+            cached = self._query_cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._query_cache.move_to_end(key)
+                return cached[1]
+            generation = self._generation
+
+        candidates = max(n_results, settings.HYBRID_CANDIDATES)
+        hits = {
+            record.id: {"id": record.id, "document": record.document, "metadata": record.metadata, "distance": distance}
+            for record, distance in self.backend.query(query_text, candidates, where)
+        }
+        keyword = self.keyword_index.scores(query_text, where)
+
+        # Keyword candidates the vector query missed: fetch them and score their distance too
+        missing = [doc_id for doc_id in heapq.nlargest(candidates, keyword, key=keyword.get) if doc_id not in hits]
+        if missing:
+            distances = self.backend.distances(query_text, missing)
+            for record in self.backend.get(ids=missing):
+                if record.id in distances:
+                    hits[record.id] = {
+                        "id": record.id, "document": record.document,
+                        "metadata": record.metadata, "distance": distances[record.id],
+                    }
+
+        # Both signals score the same candidate pool, so a candidate one retriever
+        # missed is still scored by it rather than treated as absent
+        fused = relative_score_fusion(
+            {doc_id: 1.0 - hit["distance"] for doc_id, hit in hits.items()},
+            {doc_id: keyword[doc_id] for doc_id in hits if doc_id in keyword},
+            settings.HYBRID_VECTOR_WEIGHT,
+        )[:n_results]
+        formatted_results = [{**hits[doc_id], "keyword_score": keyword.get(doc_id), "score": score} for doc_id, score in fused]
+
+        with self._cache_lock:
+            # A write during the search may have made this result stale
+            if generation == self._generation:
+                self._query_cache[key] = (time.monotonic() + settings.VECTOR_QUERY_CACHE_TTL_SECONDS, formatted_results)
+                while len(self._query_cache) > settings.VECTOR_QUERY_CACHE_SIZE:
+                    self._query_cache.popitem(last=False)
         return formatted_results
 
-    def ingest_documentation(self, filepath: str):
-        """Read and store documentation for architectural context."""
+    def ingest_documentation(self, filepath: str, max_tokens: Optional[int] = None) -> Dict[str, int]:
+        """Chunk a Markdown document and sync its chunks into the store.
+
+        Chunk IDs are content hashes, so only new or edited chunks are
+        embedded (upserted in batches) and chunks that disappeared are
+        deleted. When the file hash matches what is stored, nothing is
+        chunked or embedded at all.
+        """
+        stats = {"added": 0, "deleted": 0, "unchanged": 0}
         if not os.path.exists(filepath):
-            return
-            
+            return stats
+
         with open(filepath, "r") as f:
             content = f.read()
-            
-        doc_id = f"doc_{os.path.basename(filepath)}"
-        self.collection.add(
-            ids=[doc_id],
-            documents=[content],
-            metadatas=[{"type": "documentation", "source": filepath}]
-        )
-        logger.info(f"Ingested documentation: {filepath}")
+
+        digest = file_hash(content)
+        # Metadata-only read; no embedding cost
+        stored = {record.id: record.metadata for record in self.backend.get(where=SearchFilter(source=filepath), documents=False)}
+        if stored and all(meta.get("file_hash") == digest for meta in stored.values()):
+            stats["unchanged"] = len(stored)
+            return stats
+
+        chunks = {
+            f"doc:{os.path.basename(filepath)}:{chunk.content_hash[:16]}": chunk
+            for chunk in chunk_markdown(content, max_tokens or settings.DOC_CHUNK_TOKENS)
+        }
+        stale = [doc_id for doc_id in stored if doc_id not in chunks]
+        if stale:
+            self.backend.delete(stale)
+            self.keyword_index.remove(stale)
+        stats["deleted"] = len(stale)
+
+        # Unchanged chunks only get their metadata refreshed (no re-embedding)
+        kept = [doc_id for doc_id in chunks if doc_id in stored]
+        if kept:
+            kept_metadata = [self._doc_metadata(filepath, digest, chunks[i]) for i in kept]
+            self.backend.update_metadata(kept, kept_metadata)
+            self.keyword_index.update_metadata(kept, kept_metadata)
+        stats["unchanged"] = len(kept)
+
+        new = [doc_id for doc_id in chunks if doc_id not in stored]
+        batch = settings.DOC_EMBED_BATCH_SIZE
+        for i in range(0, len(new), batch):
+            ids = new[i:i + batch]
+            documents = [chunks[doc_id].document for doc_id in ids]
+            metadatas = [self._doc_metadata(filepath, digest, chunks[doc_id]) for doc_id in ids]
+            self.backend.upsert(ids, documents, metadatas)
+            self.keyword_index.add(ids, documents, metadatas)
+        stats["added"] = len(new)
+        self._invalidate()
+        logger.info(f"Ingested documentation: {filepath} ({stats})")
+        return stats
+
+    @staticmethod
+    def _doc_metadata(filepath: str, digest: str, chunk: DocChunk) -> Dict[str, Any]:
+        return {
+            "type": DOCUMENTATION,
+            "source": filepath,
+            "file_hash": digest,
+            "chunk": chunk.index,
+            "heading": chunk.heading,
+        }
 
 # Global singleton
 import json
@@ -1,17 +1,26 @@
 import asyncio
-from fastapi import FastAPI
+import logging
+from fastapi import FastAPI, Response
+from sqlmodel import Session
 from fastapi.middleware.cors import CORSMiddleware
 from .config import settings
-from .routes import ingest, incidents, actions, graph, simulate, alerts, observability
+from .routes import ingest, incidents, actions, graph, simulate, alerts, observability, stream, otlp
+from .database import engine
 from .ingestion.loki_poller import loki_poller
+from .ingestion.otlp import span_aggregator
+from .knowledge.graph_store import graph_store
+from .http_clients import http_clients
+from .realtime.broker import change_broker
+from .resilience import breaker_states, state_listeners
+from .warmup import readiness, warm
 from prometheus_fastapi_instrumentator import Instrumentator
 from opentelemetry import trace
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.requests import RequestsInstrumentor
+from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -34,14 +43,12 @@ app.add_middleware(
 resource = Resource.create({"service.name": settings.APP_NAME})
 provider = TracerProvider(resource=resource)
 trace.set_tracer_provider(provider)
-
-# OTLP exporter — send to the collector (container name: otel-collector)
-otlp_exporter = OTLPSpanExporter(endpoint="http://otel-collector:4317", insecure=True)
-provider.add_span_processor(BatchSpanProcessor(otlp_exporter))
+# The OTLP exporter (to the otel-collector) is attached during warm-up, see warmup.py
 
 # Instrument FastAPI and outgoing requests
-FastAPIInstrumentor().instrument_app(app)
-RequestsInstrumentor().instrument()
+# Spans about receiving spans would loop back through the collector
+FastAPIInstrumentor().instrument_app(app, excluded_urls="/v1/traces")
+HTTPXClientInstrumentor().instrument()
 
 Instrumentator().instrument(app).expose(app)
 
@@ -53,35 +60,85 @@ app.include_router(graph.router)
 app.include_router(simulate.router)
 app.include_router(alerts.router)
 app.include_router(observability.router)
+app.include_router(stream.router)
+app.include_router(otlp.router)
 
 @app.on_event("startup")
 async def startup_event():
     """Run on startup."""
+    # Apply runtime-discovered graph elements persisted by any replica
+    try:
+        with Session(engine) as session:
+            graph_store.sync(session)
+    except Exception as e:
+        logger.warning(f"Could not load persisted dependency graph: {e}")
+
     # Use create_task to run in background
     asyncio.create_task(loki_poller.poll())
-    
-    # Ingest docs into memory
+    asyncio.create_task(observability.summary_snapshot.run())
+    asyncio.create_task(span_aggregator.run())
+    asyncio.create_task(warm_up())
+
+
+async def warm_up():
+    """Build the slow subsystems after startup, then sync documentation."""
+    await warm(provider)
+    await ingest_docs()
+
+
+async def ingest_docs():
+    """Sync documentation into memory off the event loop; unchanged docs cost no embeddings."""
     from .knowledge.vector_store import incident_memory
-    incident_memory.ingest_documentation("README.md")
-    incident_memory.ingest_documentation("PRD.md")
+    for path in settings.DOC_PATHS:
+        try:
+            await incident_memory.ingest_documentation_async(path)
+        except Exception as e:
+            logger.warning(f"Could not ingest documentation {path}: {e}")
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Run on shutdown."""
     loki_poller.stop()
+    span_aggregator.stop()
+    observability.summary_snapshot.stop()
+    span_aggregator.flush()
+    from .knowledge.vector_store import incident_memory
+    incident_memory.close()
+    await http_clients.aclose()
 
 
-@app.get("/api/health")
-async def health_check():
-    """Health check endpoint."""
+def health_status():
+    """Health summary, including upstream circuit breaker states."""
+    dependencies = breaker_states()
     return {
-        "status": "healthy",
+        "status": "degraded" if any(d["state"] != "closed" for d in dependencies.values()) else "healthy",
         "service": settings.APP_NAME,
         "version": settings.APP_VERSION,
         "groq_configured": bool(settings.GROQ_API_KEY),
+        "dependencies": dependencies,
     }
 
 
+# Circuit transitions are the only health changes, so clients get them pushed instead of polling
+state_listeners.append(lambda upstream, state: change_broker.publish("health", health_status()))
+
+
+@app.get("/api/health")
+async def health_check():
+    """Health check endpoint, including upstream circuit breaker states."""
+    return health_status()
+
+
+@app.get("/api/ready")
+async def readiness_check(response: Response):
+    """Readiness endpoint: 503 until every subsystem has warmed up."""
+    state = readiness.snapshot()
+    if not state["ready"]:
+        response.status_code = 503
+    return state
+
+
 @app.get("/")
 async def root():
     """Root endpoint — redirect to docs."""
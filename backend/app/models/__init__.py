@@ -1,3 +1,4 @@
 from .events import LogEvent, LogEventCreate, Alert
 from .incidents import Incident, RootCauseAnalysis, IncidentStatus, Severity
 from .actions import RemediationAction, ApprovalStatus
+from .graph import GraphElement
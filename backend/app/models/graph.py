@@ -0,0 +1,33 @@
+"""Persisted service dependency graph models."""
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class GraphElement(SQLModel, table=True):
+    """A node or edge discovered at runtime, stored as an append-only change log.
+
+    `version` is an autoincrementing sequence shared by nodes and edges, so
+    the graph version is simply the highest stored version and a delta is
+    every row above a client's last-seen version (plus a lookback window for
+    rows that committed out of order, see graph_store.py).
+    """
+    __tablename__ = "graph_elements"
+
+    version: Optional[int] = Field(default=None, primary_key=True)
+    # "node:<id>" or "edge:<from>-><to>"; unique so replicas never store duplicates
+    key: str = Field(unique=True, index=True)
+    kind: str  # "node" | "edge"
+
+    # Node fields
+    service_id: Optional[str] = None
+    name: Optional[str] = None
+    service_type: Optional[str] = None
+    tier: Optional[str] = None
+
+    # Edge fields
+    from_service: Optional[str] = None
+    to_service: Optional[str] = None
+    relation: Optional[str] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
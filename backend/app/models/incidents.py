@@ -1,12 +1,19 @@
 """Incident and root cause analysis data models."""
 from sqlmodel import SQLModel, Field, Relationship
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 import uuid
 import json
 
 
+@lru_cache(maxsize=4096)
+def _load_json_list(raw: str) -> Tuple[str, ...]:
+    """Parse a JSON list column once per distinct value."""
+    return tuple(json.loads(raw))
+
+
 class Severity(str, Enum):
     CRITICAL = "critical"
     HIGH = "high"
@@ -70,11 +77,14 @@ class Incident(SQLModel, table=True):
     rca_reasoning_chain_json: str = Field(default="[]")
     rca_impact_description: Optional[str] = None
 
-    timeline: List[TimelineEntry] = Relationship(back_populates="incident")
+    timeline: List[TimelineEntry] = Relationship(
+        back_populates="incident",
+        sa_relationship_kwargs={"order_by": "TimelineEntry.timestamp"},
+    )
 
     @property
     def event_ids(self) -> List[str]:
-        return json.loads(self.event_ids_json)
+        return list(_load_json_list(self.event_ids_json))
 
     @event_ids.setter
     def event_ids(self, value: List[str]):
@@ -82,7 +92,7 @@ class Incident(SQLModel, table=True):
 
     @property
     def affected_services(self) -> List[str]:
-        return json.loads(self.affected_services_json)
+        return list(_load_json_list(self.affected_services_json))
 
     @affected_services.setter
     def affected_services(self, value: List[str]):
@@ -90,7 +100,7 @@ class Incident(SQLModel, table=True):
         
     @property
     def rca_reasoning_chain(self) -> List[str]:
-        return json.loads(self.rca_reasoning_chain_json)
+        return list(_load_json_list(self.rca_reasoning_chain_json))
         
     @rca_reasoning_chain.setter
     def rca_reasoning_chain(self, value: List[str]):
@@ -0,0 +1 @@
+"""In-process pub/sub for pushing changes to connected clients."""
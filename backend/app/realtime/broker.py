@@ -0,0 +1,129 @@
+"""In-process change broker for server push (SSE / WebSocket).
+
+Producers call `change_broker.publish(topic, data)` whenever something
+clients display changes. Each connected client owns a bounded queue; a
+message is serialized once and shared by every subscriber, so the cost of a
+change is one JSON encode plus one enqueue per client. A client whose queue
+fills up is dropped (it receives a final `resync` message) instead of
+letting memory grow or slowing down publishers.
+"""
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Set
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+TOPICS = frozenset({"incident", "action", "graph", "metrics", "health"})
+
+
+class Message:
+    """A published change, serialized once for all subscribers."""
+
+    __slots__ = ("sequence", "topic", "payload")
+
+    def __init__(self, sequence: int, topic: str, payload: str):
+        self.sequence = sequence
+        self.topic = topic
+        self.payload = payload  # JSON text
+
+    def to_sse(self) -> str:
+        return f"id: {self.sequence}\nevent: {self.topic}\ndata: {self.payload}\n\n"
+
+    def to_json(self) -> str:
+        return f'{{"sequence": {self.sequence}, "topic": "{self.topic}", "data": {self.payload}}}'
+
+
+class Subscription:
+    """One client's bounded buffer of pending messages."""
+
+    def __init__(self, topics: FrozenSet[str], max_buffer: int):
+        self.topics = topics
+        self.queue: "asyncio.Queue[Optional[Message]]" = asyncio.Queue(max_buffer)
+        self.dropped = False
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Message]:
+        """Next message; None once the subscription was dropped.
+
+        Raises `asyncio.TimeoutError` when nothing arrives within `timeout`.
+        """
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class ChangeBroker:
+    """Fan-out of change notifications to per-client bounded queues."""
+
+    def __init__(self, max_buffer: Optional[int] = None):
+        self.max_buffer = max_buffer or settings.STREAM_CLIENT_BUFFER
+        self.sequence = 0
+        self.published = 0
+        self.dropped_clients = 0
+        self._subscribers: Set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+
+    def subscribe(self, topics: Optional[Iterable[str]] = None) -> Subscription:
+        """Register a client; must be called from the event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        wanted = frozenset(topics) & TOPICS if topics else TOPICS
+        subscription = Subscription(wanted, self.max_buffer)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def has_subscribers(self, topic: str) -> bool:
+        # tuple() snapshots the set atomically, so this is safe off the loop thread
+        return any(topic in sub.topics for sub in tuple(self._subscribers))
+
+    def publish(self, topic: str, data: Any):
+        """Publish a change; safe to call from any thread."""
+        if topic not in TOPICS:
+            raise ValueError(f"Unknown topic: {topic}")
+        if not self.has_subscribers(topic):
+            return
+
+        payload = json.dumps(data, default=str)
+        if threading.get_ident() == self._loop_thread:
+            self._deliver(topic, payload)
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._deliver, topic, payload)
+
+    def _deliver(self, topic: str, payload: str):
+        self.sequence += 1
+        self.published += 1
+        message = Message(self.sequence, topic, payload)
+        for subscription in list(self._subscribers):
+            if topic not in subscription.topics:
+                continue
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._drop(subscription)
+
+    def _drop(self, subscription: Subscription):
+        """Disconnect a slow consumer; it must resync from the REST API."""
+        self._subscribers.discard(subscription)
+        subscription.dropped = True
+        self.dropped_clients += 1
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+        logger.info("Dropped slow stream subscriber")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped_clients": self.dropped_clients,
+            "sequence": self.sequence,
+        }
+
+
+# Global singleton
+change_broker = ChangeBroker()
@@ -3,19 +3,26 @@
 Performs structured root cause analysis on correlated incidents.
 Falls back to mock responses if the Groq API key is not configured.
 """
+import asyncio
 import json
 import logging
 from typing import Optional
 
 from ..config import settings
 from ..models.incidents import Incident, RootCauseAnalysis
+from ..http_clients import http_clients
 from ..knowledge.dependency_graph import dependency_graph
+from ..knowledge.metric_summary import format_metrics_block
 from ..knowledge.metrics_fetcher import metrics_fetcher
 from ..knowledge.vector_store import incident_memory
+from ..resilience import BudgetExceeded, LatencyBudget, breakers
 from .prompts import SYSTEM_PROMPT, build_incident_prompt, format_events_for_prompt
+from .ranker import RootCauseRanking, build_ranked_rca, rank_root_causes
 
 logger = logging.getLogger(__name__)
 
+_groq = None  # AsyncGroq, created on first analysis
+
 
 # Mock RCA responses for when API key is not available
 MOCK_RESPONSES = {
@@ -91,35 +98,77 @@ async def analyze_incident(incident: Incident) -> RootCauseAnalysis:
     Uses Groq API with Llama3-8B to analyze the incident timeline
     and generate a structured root cause analysis.
     
-    Falls back to mock responses if no API key is configured.
+    A deterministic graph ranking runs first. Its candidates are added to
+    the prompt, and when it is confident enough the LLM call is skipped.
+    Falls back to mock responses if no API key is configured, or to the
+    ranking for scenarios without a mock.
+
+    The LLM path runs within `ANALYSIS_BUDGET_SECONDS`: metrics and
+    similar-incident lookups are skipped when they are slow or their
+    upstream's circuit is open, and the LLM call gets the remaining time.
     """
+    ranking = rank_root_causes(incident.timeline)
+    logger.info(
+        f"Graph ranking for {incident.id}: top={ranking.top} "
+        f"confidence={ranking.confidence:.2f} in {ranking.elapsed_ms:.1f}ms"
+    )
+
     # Try real API first
     if settings.GROQ_API_KEY:
+        if ranking.top and ranking.confidence >= settings.RCA_SKIP_LLM_CONFIDENCE:
+            return build_ranked_rca(ranking, incident.affected_services)
         try:
-            return await _analyze_with_groq(incident)
+            return await _analyze_with_groq(incident, ranking)
         except Exception as e:
             logger.error(f"Groq API analysis failed: {e}. Falling back to mock.")
 
-    # Fallback to mock responses
+    # Fallback to mock responses, then to the graph ranking
+    if incident.scenario_type not in MOCK_RESPONSES and ranking.top:
+        return build_ranked_rca(ranking, incident.affected_services)
     return _build_mock_rca(incident)
 
 
-async def _analyze_with_groq(incident: Incident) -> RootCauseAnalysis:
-    """Call Groq API for real AI analysis."""
-    from groq import AsyncGroq
+def _groq_client():
+    """Groq client over the shared, pooled "llm" HTTP client."""
+    global _groq
+    if _groq is None or _groq.is_closed():
+        from groq import AsyncGroq
+
+        _groq = AsyncGroq(api_key=settings.GROQ_API_KEY, http_client=http_clients.get("llm"))
+    return _groq
 
-    client = AsyncGroq(api_key=settings.GROQ_API_KEY)
+
+async def _analyze_with_groq(
+    incident: Incident,
+    ranking: Optional[RootCauseRanking] = None,
+    budget: Optional[LatencyBudget] = None,
+) -> RootCauseAnalysis:
+    """Call Groq API for real AI analysis."""
+    budget = budget or LatencyBudget(settings.ANALYSIS_BUDGET_SECONDS)
+    client = _groq_client()
 
     events_text = format_events_for_prompt(incident.timeline)
-    service_context = dependency_graph.get_service_context(incident.affected_services)
+    service_context = dependency_graph.snapshot().get_service_context(incident.affected_services)
     
     # Fetch metrics around the incident time
-    metrics_data = await metrics_fetcher.get_incident_metrics(incident.created_at)
-    metrics_text = json.dumps(metrics_data, indent=2)
+    metrics_data = await budget.run(
+        "metrics",
+        metrics_fetcher.get_incident_metrics(incident.created_at, incident.affected_services),
+        limit=settings.ANALYSIS_METRICS_SECONDS,
+    )
+    if metrics_data is None:
+        metrics_text = "DATA_GAP: metrics unavailable within the analysis latency budget."
+    else:
+        metrics_text = format_metrics_block(metrics_data, settings.METRICS_PROMPT_TOKEN_BUDGET)
     
     # RAG: Search for similar past incidents
     query_text = f"Scenario: {incident.scenario_type} Title: {incident.title}"
-    past_incidents = incident_memory.find_similar_incidents(query_text)
+    past_incidents = await budget.run(
+        "rag",
+        incident_memory.find_similar_incidents_async(query_text),
+        limit=settings.ANALYSIS_RAG_SECONDS,
+        default=[],
+    )
     memory_text = "\n".join([f"Similarity: {1-r['distance']:.2f}\nDocument: {r['document']}" for r in past_incidents])
     
     user_prompt = build_incident_prompt(
@@ -127,10 +176,13 @@ async def _analyze_with_groq(incident: Incident) -> RootCauseAnalysis:
         service_context, 
         metrics_text, 
         memory_text,
-        incident.scenario_type
+        incident.scenario_type,
+        ranking.to_prompt() if ranking else "",
     )
 
-    response = await client.chat.completions.create(
+    if budget.remaining() <= 0:
+        raise BudgetExceeded("llm")
+    request = dict(
         model=settings.GROQ_MODEL,
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT},
@@ -140,6 +192,9 @@ async def _analyze_with_groq(incident: Incident) -> RootCauseAnalysis:
         max_tokens=2048,
         response_format={"type": "json_object"},
     )
+    response = await breakers["llm"].call(
+        lambda: asyncio.wait_for(client.chat.completions.create(**request), budget.remaining())
+    )
 
     raw = response.choices[0].message.content
     data = json.loads(raw)
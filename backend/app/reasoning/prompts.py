@@ -50,6 +50,7 @@ def build_incident_prompt(
     metrics_context: str = "",
     memory_context: str = "",
     scenario_type: str = "",
+    ranking_context: str = "",
 ) -> str:
     """Build the user prompt with incident context."""
     prompt = f"""Analyze the following production incident:
@@ -66,13 +67,16 @@ def build_incident_prompt(
 ## Service Architecture (Dependencies)
 {service_context}
 
+## Graph Root-Cause Candidates (personalized PageRank over dependencies)
+{ranking_context if ranking_context else "Not available."}
+
 ## Incident Classification
 Scenario Type: {scenario_type if scenario_type != 'unknown' else 'Unclassified - determine from events'}
 
 ## Instructions
 1. CORRELATE logs with metrics (e.g., does a log error match a CPU spike?)
 2. LEVERAGE memory of past incidents to inform the root cause and remediation.
-3. Identify the ROOT CAUSE — the single initial failure that triggered everything
+3. Identify the ROOT CAUSE — the single initial failure that triggered everything; weigh the graph candidates, but override them when the evidence disagrees
 4. Trace the cascading failure path through the service dependency graph
 5. List immediate actions to restore service
 
@@ -0,0 +1,178 @@
+"""Deterministic root-cause ranking over the dependency graph.
+
+Runs a personalized PageRank (random walk with restart) over the
+dependency direction of the graph: from a failing service the walker moves
+to the services it depends on, preferring dependencies that are themselves
+failing and edges that carry traffic. Restarts are seeded by each service's
+error intensity in the incident, so probability mass collects at the
+failing service that the rest of the incident depends on.
+
+The transition matrix is kept as a COO edge list and each power iteration
+is a single `np.bincount` scatter, so ranking an incident takes
+milliseconds even on large graphs.
+"""
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..knowledge.dependency_graph import DependencyGraph, dependency_graph
+from ..models.incidents import RootCauseAnalysis
+
+# Contribution of one timeline entry to its service's error intensity
+SEVERITY_WEIGHTS = {"critical": 1.0, "high": 0.7, "medium": 0.4, "low": 0.1, "info": 0.0}
+
+DAMPING = 0.85
+# Floor so healthy services still pass some mass along
+EPSILON = 0.01
+# Relative weight of walking back to a dependent (escapes healthy leaves)
+BACKTRACK = 0.1
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6  # L1 change between iterations
+
+
+class RootCauseRanking:
+    """Ranked root-cause candidates for one incident."""
+
+    def __init__(self, candidates: List[Dict], iterations: int, elapsed_ms: float):
+        self.candidates = candidates  # [{"service", "score", "intensity"}], best first
+        self.iterations = iterations
+        self.elapsed_ms = elapsed_ms
+
+    @property
+    def top(self) -> Optional[str]:
+        return self.candidates[0]["service"] if self.candidates else None
+
+    @property
+    def confidence(self) -> float:
+        """Share of the top candidate against the runner-up (0.5 = tie, 1.0 = unique)."""
+        if not self.candidates:
+            return 0.0
+        first = self.candidates[0]["score"]
+        second = self.candidates[1]["score"] if len(self.candidates) > 1 else 0.0
+        return first / (first + second) if first + second > 0 else 0.0
+
+    def to_prompt(self, limit: int = 5) -> str:
+        """Candidate list for the LLM prompt."""
+        if not self.candidates:
+            return "No graph-based candidates (no failing services in the dependency graph)."
+        lines = [
+            f"{i}. {c['service']} — score {c['score']:.3f}, error intensity {c['intensity']:.2f}"
+            for i, c in enumerate(self.candidates[:limit], 1)
+        ]
+        lines.append(f"Ranking confidence: {self.confidence:.2f}")
+        return "\n".join(lines)
+
+
+def error_intensity(entries: Iterable) -> Dict[str, float]:
+    """Per-service error intensity from timeline entries or events.
+
+    Severity weights are summed per service and boosted for services that
+    fail early, since cascades surface their origin first.
+    """
+    totals: Dict[str, float] = {}
+    for entry in entries:
+        severity = entry.severity.value if hasattr(entry.severity, "value") else str(entry.severity)
+        weight = SEVERITY_WEIGHTS.get(severity.lower(), 0.0)
+        if weight:
+            totals[entry.source_service] = totals.get(entry.source_service, 0.0) + weight
+    # dict order is first appearance among failing entries
+    return {service: total / (1.0 + 0.5 * rank) for rank, (service, total) in enumerate(totals.items())}
+
+
+def rank_root_causes(
+    entries: Iterable,
+    graph: Optional[DependencyGraph] = None,
+    now: Optional[float] = None,
+    limit: int = 10,
+) -> RootCauseRanking:
+    """Rank likely root causes for the services failing in `entries` (best `limit` kept)."""
+    start = time.perf_counter()
+    graph = (graph or dependency_graph).snapshot()
+    intensity = error_intensity(entries)
+    if not intensity:
+        return RootCauseRanking([], 0, (time.perf_counter() - start) * 1000)
+
+    # Local node space: failing services plus everything they depend on
+    services = list(intensity)
+    for service in list(intensity):
+        services.extend(graph.get_transitive_upstream(service))
+    services = list(dict.fromkeys(services))
+    n = len(services)
+    known = [i for i, s in enumerate(services) if s in graph.nodes]
+    local = np.full(len(graph.nodes), -1, dtype=np.int64)  # graph id -> local id
+    local[graph.service_ids([services[i] for i in known])] = known
+
+    seed = np.array([intensity.get(s, 0.0) for s in services], dtype=np.float64)
+    seed /= seed.sum()
+
+    # Edges with both ends in the local space; src depends on dst
+    src_all, dst_all = graph.edge_arrays()
+    traffic = graph.traffic_weights(now)
+    src, dst = local[src_all], local[dst_all]
+    keep = (src >= 0) & (dst >= 0)
+    src, dst, traffic = src[keep], dst[keep], traffic[keep]
+
+    health = seed + EPSILON
+    hot = 1.0 + np.log1p(traffic)  # busier edges are likelier propagation paths
+    rows = np.concatenate([src, dst, np.arange(n)])
+    cols = np.concatenate([dst, src, np.arange(n)])
+    weights = np.concatenate([hot * health[dst], BACKTRACK * hot * health[src], health])
+    # Row-normalize into transition probabilities
+    weights /= np.bincount(rows, weights=weights, minlength=n)[rows]
+
+    scores = seed.copy()
+    iterations = 0
+    for iterations in range(1, MAX_ITERATIONS + 1):
+        walked = np.bincount(cols, weights=weights * scores[rows], minlength=n)
+        updated = DAMPING * walked + (1 - DAMPING) * seed
+        delta = np.abs(updated - scores).sum()
+        scores = updated
+        if delta < TOLERANCE:
+            break
+
+    top = np.argpartition(-scores, limit - 1)[:limit] if n > limit else np.arange(n)
+    order = top[np.argsort(-scores[top], kind="stable")]
+    candidates = [
+        {"service": services[i], "score": float(scores[i]), "intensity": float(intensity.get(services[i], 0.0))}
+        for i in order.tolist()
+    ]
+    return RootCauseRanking(candidates, iterations, (time.perf_counter() - start) * 1000)
+
+
+def build_ranked_rca(ranking: RootCauseRanking, affected_services: List[str], graph: Optional[DependencyGraph] = None):
+    """Build a `RootCauseAnalysis` from the graph ranking alone."""
+    graph = (graph or dependency_graph).snapshot()
+    top = ranking.top
+    node = graph.nodes.get(top)
+    label = f"{node.name} ({top})" if node else top
+    runners_up = ", ".join(f"{c['service']} ({c['score']:.2f})" for c in ranking.candidates[1:4])
+
+    # Longest visible propagation path: from the last affected service that depends on the top candidate
+    chain: List[str] = []
+    for service in reversed(affected_services):
+        if service != top:
+            chain = graph.get_dependency_chain(service, top)
+            if chain:
+                break
+
+    reasoning = [
+        f"1. Error intensity observed on: {', '.join(c['service'] for c in ranking.candidates if c['intensity'] > 0)}",
+        f"2. Random walk over service dependencies concentrated {ranking.candidates[0]['score']:.0%} of probability on {top}",
+    ]
+    if chain:
+        reasoning.append(f"3. Failure propagation path: {' -> '.join(reversed(chain))}")
+    if runners_up:
+        reasoning.append(f"{len(reasoning) + 1}. Other candidates: {runners_up}")
+
+    return RootCauseAnalysis(
+        summary=(
+            f"Dependency-graph ranking identifies {label} as the most likely origin of this incident; "
+            f"failures in dependent services are consistent with propagation from it."
+        ),
+        reasoning_chain=reasoning,
+        root_cause=f"Failure in {label}",
+        confidence_score=round(ranking.confidence, 2),
+        affected_services=list(dict.fromkeys([top, *affected_services])),
+        impact_description=f"{len(graph.get_impact_path(top)) - 1} services depend on {top} directly or transitively.",
+    )
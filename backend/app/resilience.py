@@ -0,0 +1,211 @@
+"""Circuit breakers, retries and latency budgets for upstream dependencies.
+
+A `CircuitBreaker` per upstream (Prometheus, Loki, the LLM provider) fails
+calls fast once the upstream keeps failing, instead of every caller
+waiting out a full timeout. After `reset_timeout` one probe call is let
+through (half-open); its outcome closes or re-opens the circuit.
+
+`LatencyBudget` bounds a multi-step operation such as incident analysis:
+each optional step runs with whatever time is left and is skipped (its
+fallback used) when the budget or the step's own limit runs out.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+from prometheus_client import Counter, Gauge
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_STATE = Gauge(
+    "devsick_circuit_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ["upstream"],
+)
+CIRCUIT_REJECTIONS = Counter(
+    "devsick_circuit_rejections_total", "Calls rejected by an open circuit", ["upstream"],
+)
+UPSTREAM_FAILURES = Counter("devsick_upstream_failures_total", "Failed upstream calls", ["upstream"])
+
+# Called with (upstream, new state) on every circuit transition, e.g. to push health changes
+state_listeners: List[Callable[[str, str], None]] = []
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"circuit for {name} is open; retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one upstream."""
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.BREAKER_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout or settings.BREAKER_RESET_SECONDS
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.stats = {"calls": 0, "failures": 0, "rejected": 0, "opened": 0}
+        CIRCUIT_STATE.labels(name).set(STATE_CODES[CLOSED])
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            logger.warning(f"Circuit for {self.name}: {self.state} -> {state}")
+            self.state = state
+            CIRCUIT_STATE.labels(self.name).set(STATE_CODES[state])
+            for listener in state_listeners:
+                try:
+                    listener(self.name, state)
+                except Exception as e:
+                    logger.warning(f"Circuit state listener failed: {e}")
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now (claims the half-open probe slot)."""
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._set_state(HALF_OPEN)
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self._probing = False
+        self._set_state(CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        self.stats["failures"] += 1
+        UPSTREAM_FAILURES.labels(self.name).inc()
+        self._probing = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.stats["opened"] += 1
+            self.opened_at = time.monotonic()
+            self._set_state(OPEN)
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `fn()` through the breaker; raises `CircuitOpenError` when open."""
+        if not self.allow():
+            self.stats["rejected"] += 1
+            CIRCUIT_REJECTIONS.labels(self.name).inc()
+            raise CircuitOpenError(self.name, self.reset_timeout - (time.monotonic() - self.opened_at))
+        self.stats["calls"] += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # Abandoned (e.g. a losing hedge); says nothing about the upstream
+            self._probing = False
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def snapshot(self) -> Dict:
+        return {"state": self.state, "consecutive_failures": self.failures, **self.stats}
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+async def retry(
+    fn: Callable[[], Awaitable[Any]],
+    attempts: int = 2,
+    base_delay: float = 0.1,
+    max_delay: float = 2.0,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+) -> Any:
+    """Call `fn` up to `attempts` times, sleeping a jittered backoff between tries.
+
+    An open circuit is never retried.
+    """
+    for attempt in range(attempts):
+        try:
+            return await fn()
+        except CircuitOpenError:
+            raise
+        except retry_on:
+            if attempt == attempts - 1:
+                raise
+            await asyncio.sleep(backoff_delay(attempt, base_delay, max_delay))
+
+
+async def hedged(fn: Callable[[], Awaitable[Any]], delay: float) -> Any:
+    """Start a second `fn()` if the first has not finished after `delay`; first success wins.
+
+    Only for idempotent reads. The loser is cancelled.
+    """
+    first = asyncio.ensure_future(fn())
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+
+    tasks = {first, asyncio.ensure_future(fn())}
+    error: Optional[BaseException] = None
+    try:
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+class BudgetExceeded(Exception):
+    """The operation's latency budget is spent."""
+
+
+class LatencyBudget:
+    """Deadline shared by the steps of one operation."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.deadline = time.monotonic() + seconds
+        self.skipped: Dict[str, str] = {}  # step -> reason
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    async def run(self, step: str, awaitable: Awaitable[Any], limit: Optional[float] = None, default: Any = None) -> Any:
+        """Await a step within the remaining budget (and `limit`); `default` if it fails or runs out."""
+        timeout = self.remaining() if limit is None else min(limit, self.remaining())
+        try:
+            if timeout <= 0:
+                raise BudgetExceeded(step)
+            return await asyncio.wait_for(awaitable, timeout)
+        except Exception as e:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()  # never started when the budget was already spent
+            reason = "timeout" if isinstance(e, (asyncio.TimeoutError, BudgetExceeded)) else e.__class__.__name__
+            self.skipped[step] = reason
+            logger.warning(f"Skipping {step}: {reason} ({self.remaining():.1f}s of {self.seconds:.0f}s budget left)")
+            return default
+
+
+# One breaker per upstream, shared across the process
+breakers: Dict[str, CircuitBreaker] = {name: CircuitBreaker(name) for name in ("prometheus", "loki", "llm")}
+
+
+def breaker_states() -> Dict[str, Dict]:
+    return {name: breaker.snapshot() for name, breaker in breakers.items()}
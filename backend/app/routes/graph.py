@@ -1,22 +1,58 @@
 """Service dependency graph API endpoint."""
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlmodel import Session
+from ..database import get_session
 from ..knowledge.dependency_graph import dependency_graph
+from ..knowledge.graph_store import graph_store
 
 router = APIRouter(prefix="/api", tags=["Graph"])
 
 
 @router.get("/graph")
-async def get_graph():
-    """Get the full service dependency graph."""
-    return dependency_graph.to_dict()
+async def get_graph(
+    request: Request,
+    response: Response,
+    since: Optional[int] = Query(None, ge=0, description="Only return elements stored after this version"),
+    session: Session = Depends(get_session),
+):
+    """Get the service dependency graph, or only the changes since a version.
+
+    Responses carry an ETag; clients sending it back in If-None-Match get
+    304 Not Modified while the graph is unchanged.
+    """
+    snap = dependency_graph.snapshot()
+    if since is None:
+        etag = f'"{graph_store.version}.{snap.version}"'
+    else:
+        etag = f'"{since}-{graph_store.change_tag(session, since)}"'
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    if since is not None:
+        return {**graph_store.delta(session, since), "delta": True}
+    # Splice the snapshot's pre-serialized body instead of re-encoding the graph
+    body = f'{{"version": {graph_store.version}, "delta": false, '.encode() + snap.serialized[1:]
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get("/graph/traffic")
+async def get_traffic(limit: int = Query(100, ge=1, le=1000)):
+    """Hottest dependency edges by decayed call count."""
+    snap = dependency_graph.snapshot()
+    return {"half_life_seconds": snap.half_life, "edges": snap.traffic_snapshot(limit)}
 
 
 @router.get("/graph/impact/{service_id}")
 async def get_impact(service_id: str):
     """Get the impact path for a specific service failure."""
-    path = dependency_graph.get_impact_path(service_id)
+    snap = dependency_graph.snapshot()
+    path = snap.get_impact_path(service_id)
     return {
         "root_service": service_id,
         "impact_path": path,
         "total_affected": len(path),
+        "graph_version": snap.version,
     }
@@ -1,33 +1,80 @@
 """Incident management API endpoints."""
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import List, Dict, Any
-from sqlmodel import Session, select, func
-from ..models.incidents import Incident, IncidentStatus, IncidentRead
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select, func, insert
+from ..models.incidents import Incident, IncidentStatus, IncidentRead, TimelineEntry
 from ..reasoning.ai_engine import analyze_incident
 from ..database import get_session
+from ..realtime.broker import change_broker
 
 router = APIRouter(prefix="/api", tags=["Incidents"])
 
 
 def add_incident(session: Session, incident: Incident):
-    """Add an incident to the database (called by simulation route)."""
+    """Add an incident to the database (called by simulation route).
+
+    Timeline entries are detached from the ORM cascade and written with a
+    single multi-row INSERT instead of one INSERT per entry.
+    """
+    timeline = list(incident.timeline)
+    incident.timeline = []
     session.add(incident)
+    session.flush()
+
+    if timeline:
+        rows = []
+        for entry in timeline:
+            entry.incident_id = incident.id
+            rows.append(entry.model_dump(exclude={"incident"}))
+        session.execute(insert(TimelineEntry), rows)
+
     session.commit()
     session.refresh(incident)
+    publish_incident(incident, "created")
     return incident
 
 
+def publish_incident(incident: Incident, change: str):
+    """Push an incident change (without its timeline) to stream subscribers."""
+    if change_broker.has_subscribers("incident"):
+        read = to_incident_read(incident, include_timeline=False)
+        change_broker.publish("incident", {"change": change, "incident": read.model_dump(mode="json")})
+
+
+def to_incident_read(incident: Incident, include_timeline: bool = True) -> IncidentRead:
+    """Build the API schema without touching the timeline unless requested."""
+    return IncidentRead(
+        id=incident.id,
+        title=incident.title,
+        severity=incident.severity,
+        status=incident.status,
+        created_at=incident.created_at,
+        updated_at=incident.updated_at,
+        scenario_type=incident.scenario_type,
+        event_ids=incident.event_ids,
+        affected_services=incident.affected_services,
+        root_cause_analysis=incident.root_cause_analysis,
+        timeline=incident.timeline if include_timeline else [],
+    )
+
+
 @router.get("/incidents", response_model=List[IncidentRead])
-async def list_incidents(session: Session = Depends(get_session)):
+async def list_incidents(
+    include_timeline: bool = Query(default=False, description="Eager-load each incident's timeline"),
+    session: Session = Depends(get_session),
+):
     """List all incidents, newest first."""
     statement = select(Incident).order_by(Incident.created_at.desc())
-    return session.exec(statement).all()
+    if include_timeline:
+        statement = statement.options(selectinload(Incident.timeline))
+    return [to_incident_read(inc, include_timeline) for inc in session.exec(statement).all()]
 
 
 @router.get("/incidents/{incident_id}", response_model=IncidentRead)
 async def get_incident(incident_id: str, session: Session = Depends(get_session)):
     """Get details of a specific incident."""
-    incident = session.get(Incident, incident_id)
+    incident = session.get(Incident, incident_id, options=[selectinload(Incident.timeline)])
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     return incident
@@ -44,6 +91,7 @@ async def analyze(incident_id: str, session: Session = Depends(get_session)):
     incident.status = IncidentStatus.ANALYZING
     session.add(incident)
     session.commit()
+    publish_incident(incident, "updated")
     
     # Run AI analysis
     # Note: analyze_incident returns an RCA object (part of the model definition)
@@ -63,6 +111,7 @@ async def analyze(incident_id: str, session: Session = Depends(get_session)):
     session.add(incident)
     session.commit()
     session.refresh(incident)
+    publish_incident(incident, "updated")
 
     return incident
 
@@ -1,9 +1,17 @@
 """Observability endpoints backed by Prometheus."""
+import asyncio
+import logging
+import time
 from typing import Optional
-import httpx
 from fastapi import APIRouter
 
 from ..config import settings
+from ..http_clients import http_clients
+from ..knowledge.metrics_fetcher import metrics_fetcher
+from ..knowledge.promql_cache import promql_cache
+from ..realtime.broker import change_broker
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/observability", tags=["Observability"])
 
@@ -19,28 +27,79 @@ def _parse_scalar_value(result: dict) -> Optional[float]:
         return None
 
 
-async def _query_prometheus(client: httpx.AsyncClient, query: str) -> Optional[float]:
-    """Run a single instant query and return the first scalar value."""
-    response = await client.get(
-        f"{settings.PROMETHEUS_URL}/api/v1/query",
-        params={"query": query},
-    )
-    response.raise_for_status()
-    payload = response.json()
-
-    if payload.get("status") != "success":
-        return None
-
-    results = payload.get("data", {}).get("result", [])
+async def _query_prometheus(query: str) -> Optional[float]:
+    """Run a single (cached) instant query and return the first scalar value."""
+    results = await metrics_fetcher.query(query)
     if not results:
         return None
 
     return _parse_scalar_value(results[0])
 
 
+class SummarySnapshot:
+    """Latest observability summary, refreshed in the background.
+
+    One task queries Prometheus on a fixed cadence no matter how many
+    clients poll, and requests are answered from memory, so endpoint
+    latency does not depend on Prometheus.
+    """
+
+    def __init__(self, interval: Optional[float] = None, stale_after: Optional[float] = None):
+        self.interval = interval or settings.OBSERVABILITY_REFRESH_SECONDS
+        self.stale_after = stale_after or settings.OBSERVABILITY_STALE_SECONDS
+        self.data: Optional[dict] = None
+        self.updated_at: Optional[float] = None  # monotonic time of the last refresh
+        self.running = False
+
+    def current(self) -> dict:
+        if self.data is None:
+            return {"source": "pending", "healthy": False, "age_seconds": None, "stale": True}
+        age = time.monotonic() - self.updated_at
+        return {**self.data, "age_seconds": round(age, 3), "stale": age > self.stale_after}
+
+    async def refresh(self) -> dict:
+        self.data = await collect_summary()
+        self.updated_at = time.monotonic()
+        if change_broker.has_subscribers("metrics"):
+            change_broker.publish("metrics", self.current())
+        return self.data
+
+    async def run(self):
+        self.running = True
+        while self.running:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing observability summary: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stop(self):
+        self.running = False
+
+
+summary_snapshot = SummarySnapshot()
+
+
 @router.get("/summary")
 async def get_observability_summary():
-    """Return live backend metrics from Prometheus with graceful fallback."""
+    """Return the latest backend metrics snapshot (see `age_seconds` / `stale`)."""
+    return summary_snapshot.current()
+
+
+@router.get("/http")
+async def get_http_pool_stats():
+    """Connection pool utilization of the shared outbound HTTP clients."""
+    return http_clients.stats()
+
+
+@router.get("/cache")
+async def get_cache_stats():
+    """Shared PromQL cache counters."""
+    return promql_cache.snapshot_stats()
+
+
+async def collect_summary() -> dict:
+    """Query Prometheus for the backend summary metrics."""
     metrics = {
         "backend_up": None,
         "requests_per_second": None,
@@ -60,16 +119,13 @@ async def get_observability_summary():
         ),
     }
 
-    try:
-        timeout = httpx.Timeout(settings.PROMETHEUS_TIMEOUT_SECONDS)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            for key, query in queries.items():
-                try:
-                    metrics[key] = await _query_prometheus(client, query)
-                except Exception as exc:  # noqa: BLE001
-                    errors.append(f"{key}: {exc.__class__.__name__}")
-    except Exception as exc:  # noqa: BLE001
-        errors.append(f"prometheus_connection: {exc.__class__.__name__}")
+    outcomes = await asyncio.gather(*(_query_prometheus(q) for q in queries.values()), return_exceptions=True)
+    for key, outcome in zip(queries, outcomes):
+        if isinstance(outcome, Exception):
+            errors.append(f"{key}: {outcome.__class__.__name__}")
+        else:
+            metrics[key] = outcome
+    if len(errors) == len(queries):
         metrics["source"] = "fallback"
 
     metrics["healthy"] = metrics["backend_up"] is not None and metrics["backend_up"] >= 1
@@ -0,0 +1,98 @@
+"""OTLP/HTTP trace receiver used for dependency discovery.
+
+Accepts the standard `POST /v1/traces` export from an OpenTelemetry
+collector or SDK, in protobuf or JSON encoding, optionally gzip-compressed.
+Bodies larger than `OTLP_MAX_BODY_BYTES`, before or after decompression,
+are rejected with 413. Compressed payloads, and any above
+`OTLP_INLINE_DECODE_BYTES`, are decoded in a worker thread so the event
+loop stays free.
+"""
+import asyncio
+import zlib
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from google.protobuf.message import DecodeError
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceResponse
+
+from ..config import settings
+from ..ingestion.otlp import decode_json, decode_protobuf, span_aggregator
+
+router = APIRouter(tags=["OTLP"])
+
+_EMPTY_PROTOBUF_RESPONSE = ExportTraceServiceResponse().SerializeToString()
+_PROTOBUF_TYPES = ("application/x-protobuf", "application/protobuf")
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(status_code=413, detail=f"OTLP payload exceeds {settings.OTLP_MAX_BODY_BYTES} bytes")
+
+
+async def _read_body(request: Request, limit: int) -> bytes:
+    """The request body, failing with 413 as soon as it passes `limit` bytes."""
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise _too_large()
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise _too_large()
+    return bytes(body)
+
+
+def _gunzip(body: bytes, limit: int) -> bytes:
+    """Decompress (possibly multi-member) gzip, never producing more than `limit` bytes."""
+    out = bytearray()
+    while body:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        out += decompressor.decompress(body, limit + 1 - len(out))
+        if len(out) > limit or decompressor.unconsumed_tail:
+            raise _too_large()
+        if not decompressor.eof:
+            raise HTTPException(status_code=400, detail="Invalid gzip body")
+        body = decompressor.unused_data
+    return bytes(out)
+
+
+def _decode(body: bytes, gzipped: bool, content_type: str) -> List:
+    if gzipped:
+        try:
+            body = _gunzip(body, settings.OTLP_MAX_BODY_BYTES)
+        except zlib.error:
+            raise HTTPException(status_code=400, detail="Invalid gzip body")
+    try:
+        if content_type == "application/json":
+            return decode_json(body)
+        return decode_protobuf(body)
+    except (DecodeError, ValueError, TypeError, AttributeError) as e:
+        raise HTTPException(status_code=400, detail=f"Malformed OTLP payload: {e.__class__.__name__}")
+
+
+@router.post("/v1/traces")
+async def receive_traces(request: Request):
+    """Derive caller -> callee edges from an OTLP trace export."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type != "application/json" and content_type not in _PROTOBUF_TYPES:
+        raise HTTPException(status_code=415, detail="Expected application/x-protobuf or application/json")
+
+    body = await _read_body(request, settings.OTLP_MAX_BODY_BYTES)
+    gzipped = request.headers.get("content-encoding", "").lower() == "gzip"
+    # A small gzip body can still inflate to the full limit
+    if gzipped or len(body) > settings.OTLP_INLINE_DECODE_BYTES:
+        spans = await asyncio.to_thread(_decode, body, gzipped, content_type)
+    else:
+        spans = _decode(body, gzipped, content_type)
+
+    span_aggregator.ingest(spans)
+    span_aggregator.maybe_flush()
+
+    if content_type == "application/json":
+        return Response(content="{}", media_type="application/json")
+    return Response(content=_EMPTY_PROTOBUF_RESPONSE, media_type="application/x-protobuf")
+
+
+@router.get("/api/otlp/stats")
+async def otlp_stats():
+    """Span and edge counters for the OTLP receiver."""
+    return {**span_aggregator.stats, "pending_edges": len(span_aggregator._pending)}
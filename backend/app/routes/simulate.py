@@ -12,10 +12,11 @@ from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import APIRouter, Query, Depends
 from sqlmodel import Session, delete
-from ..models.events import LogEventCreate, SeverityLevel, LogEvent
+from ..models.events import SeverityLevel, LogEvent
 from ..models.incidents import IncidentStatus, Incident
 from ..models.actions import RemediationAction
 from ..ingestion.log_ingestor import event_store
+from ..ingestion.records import EventBuffer
 from ..correlation.engine import correlate_events
 from ..reasoning.ai_engine import analyze_incident
 from ..recommendations.engine import generate_recommendations
@@ -64,19 +65,17 @@ async def simulate_scenario(
     base_time = datetime.utcnow()
 
     for scenario_id, scenario_data in scenarios_to_run.items():
-        # 1. Ingest events
-        events = []
+        # 1. Ingest events into a compact buffer, persisted in one batch
+        events = EventBuffer()
         for evt in scenario_data["events"]:
-            event_create = LogEventCreate(
+            events.append(
                 source_service=evt["source_service"],
                 severity=SeverityLevel(evt["severity"]),
                 message=evt["message"],
                 metadata=evt.get("metadata", {}),
                 timestamp=base_time + timedelta(seconds=evt["timestamp_offset_seconds"]),
             )
-            # Pass session to ingestor
-            stored = event_store.ingest(session, event_create)
-            events.append(stored)
+        event_store.persist(session, events)
 
         # 2. Correlate events into an incident
         incident = correlate_events(events)
@@ -0,0 +1,100 @@
+"""Server push of live changes over Server-Sent Events and WebSocket.
+
+Clients subscribe to any of the topics `incident`, `action`, `graph`,
+`metrics` and `health` (circuit breaker transitions). A client that falls too far behind receives a final `resync`
+message and is disconnected; it should refetch state over REST and
+reconnect.
+"""
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from ..config import settings
+from ..realtime.broker import change_broker
+
+router = APIRouter(prefix="/api", tags=["Stream"])
+
+RESYNC_SSE = "event: resync\ndata: {}\n\n"
+RESYNC_JSON = '{"topic": "resync", "data": {}}'
+
+
+def _parse_topics(topics: Optional[str]):
+    return [t.strip() for t in topics.split(",") if t.strip()] if topics else None
+
+
+@router.get("/stream")
+async def stream_changes(
+    topics: Optional[str] = Query(None, description="Comma-separated topics; all when omitted"),
+):
+    """Stream changes as Server-Sent Events."""
+    subscription = change_broker.subscribe(_parse_topics(topics))
+
+    async def events():
+        try:
+            # Tell the client to (re)load state so nothing between fetch and subscribe is missed
+            yield "retry: 3000\nevent: ready\ndata: {}\n\n"
+            while True:
+                try:
+                    message = await subscription.get(settings.STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if message is None:
+                    yield RESYNC_SSE
+                    return
+                yield message.to_sse()
+        finally:
+            change_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _send_changes(websocket: WebSocket, subscription):
+    await websocket.send_text('{"topic": "ready", "data": {}}')
+    while True:
+        try:
+            message = await subscription.get(settings.STREAM_HEARTBEAT_SECONDS)
+        except asyncio.TimeoutError:
+            await websocket.send_text('{"topic": "keepalive", "data": {}}')
+            continue
+        if message is None:
+            await websocket.send_text(RESYNC_JSON)
+            await websocket.close()
+            return
+        await websocket.send_text(message.to_json())
+
+
+async def _wait_disconnect(websocket: WebSocket):
+    # Clients don't send anything meaningful; reading only detects disconnects
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/ws")
+async def websocket_changes(websocket: WebSocket, topics: Optional[str] = None):
+    """Stream changes as JSON text frames over a WebSocket."""
+    await websocket.accept()
+    subscription = change_broker.subscribe(_parse_topics(topics))
+    tasks = [
+        asyncio.create_task(_send_changes(websocket, subscription)),
+        asyncio.create_task(_wait_disconnect(websocket)),
+    ]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        change_broker.unsubscribe(subscription)
+
+
+@router.get("/stream/stats")
+async def stream_stats():
+    """Subscriber and delivery counters for the change broker."""
+    return change_broker.stats()
@@ -0,0 +1,86 @@
+"""GET /api/incidents must issue a constant number of SQL statements.
+
+Seeds an in-memory database with a growing number of incidents (each with a
+timeline) and counts the statements executed per request, with and without
+`include_timeline`.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine
+
+from .database import get_session
+from .models.incidents import Incident, Severity, TimelineEntry
+from .routes import incidents
+from .routes.incidents import add_incident
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def statements(engine):
+    executed = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    return executed
+
+
+@pytest.fixture
+def client(engine):
+    def session():
+        with Session(engine) as s:
+            yield s
+
+    app = FastAPI()
+    app.include_router(incidents.router)
+    app.dependency_overrides[get_session] = session
+    return TestClient(app)
+
+
+def seed(engine, count: int, start: int = 0):
+    base = datetime(2026, 1, 1)
+    with Session(engine) as session:
+        for i in range(start, start + count):
+            incident = Incident(
+                title=f"incident {i}",
+                severity=Severity.HIGH,
+                timeline=[
+                    TimelineEntry(
+                        timestamp=base + timedelta(seconds=j),
+                        source_service="vault",
+                        event=f"event {j}",
+                        severity="high",
+                    )
+                    for j in range(5)
+                ],
+            )
+            incident.affected_services = ["vault"]
+            add_incident(session, incident)
+
+
+@pytest.mark.parametrize("path", ["/api/incidents", "/api/incidents?include_timeline=true"])
+def test_incident_list_statement_count_is_constant(engine, statements, client, path):
+    counts = {}
+    total = 0
+    for target in (1, 10, 50):
+        seed(engine, target - total, start=total)
+        total = target
+        statements.clear()
+        response = client.get(path)
+        assert response.status_code == 200
+        assert len(response.json()) == target
+        counts[target] = len(statements)
+
+    assert len(set(counts.values())) == 1, f"statement count grows with incident count: {counts}"
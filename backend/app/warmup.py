@@ -0,0 +1,119 @@
+"""Background warm-up of slow-to-initialize subsystems, and readiness.
+
+The vector store, the OTLP trace exporter and the LLM client each cost
+hundreds of milliseconds to import and build, so none of them is created at
+import time. The app starts serving immediately and `warm` builds them in
+the background after startup; anything used before then is created on
+first use instead. A step that fails is retried in the background with
+backoff until it succeeds, so one transient error does not keep
+`/api/ready` at 503. `readiness` records which subsystems are warm and
+backs `/api/ready`.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Set
+
+from prometheus_client import Gauge
+
+from .config import settings
+from .resilience import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+SUBSYSTEM_READY = Gauge("devsick_subsystem_ready", "Whether a subsystem has finished warming up", ["subsystem"])
+
+
+class Readiness:
+    """Warm-up state per subsystem: ready flag, warm-up time and last error."""
+
+    def __init__(self, names: Iterable[str]):
+        self.subsystems: Dict[str, Dict[str, Any]] = {
+            name: {"ready": False, "seconds": None, "detail": None, "error": None, "attempts": 0} for name in names
+        }
+        self._retries: Set[asyncio.Task] = set()
+        for name in self.subsystems:
+            SUBSYSTEM_READY.labels(name).set(0)
+
+    @property
+    def ready(self) -> bool:
+        return all(state["ready"] for state in self.subsystems.values())
+
+    async def warm(self, name: str, step: Callable[[], Awaitable[Any]]) -> bool:
+        """Run one warm-up step; failures are recorded, not raised."""
+        state = self.subsystems[name]
+        state["attempts"] += 1
+        start = time.perf_counter()
+        try:
+            state["detail"] = await step()
+        except Exception as e:
+            state["error"] = str(e)
+            logger.warning(f"Warm-up of {name} failed: {e}")
+        else:
+            state.update(ready=True, error=None)
+            SUBSYSTEM_READY.labels(name).set(1)
+        state["seconds"] = round(time.perf_counter() - start, 3)
+        return state["ready"]
+
+    def retry_in_background(self, name: str, step: Callable[[], Awaitable[Any]]):
+        """Keep retrying a failed step with jittered backoff until it succeeds."""
+        async def keep_warming():
+            attempt = 0
+            while True:
+                await asyncio.sleep(backoff_delay(
+                    attempt, settings.WARMUP_RETRY_BASE_SECONDS, settings.WARMUP_RETRY_MAX_SECONDS,
+                ))
+                if await self.warm(name, step):
+                    logger.info(f"Warm-up of {name} succeeded after {self.subsystems[name]['attempts']} attempts")
+                    return
+                attempt += 1
+
+        task = asyncio.create_task(keep_warming())
+        self._retries.add(task)
+        task.add_done_callback(self._retries.discard)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "subsystems": {name: dict(state) for name, state in self.subsystems.items()}}
+
+
+def start_trace_export(provider) -> str:
+    """Attach the OTLP exporter to `provider`; spans before this are not exported."""
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    exporter = OTLPSpanExporter(endpoint=settings.OTLP_EXPORTER_ENDPOINT, insecure=True)
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    return settings.OTLP_EXPORTER_ENDPOINT
+
+
+def build_llm_client() -> str:
+    """Import groq and create the shared client, if an API key is configured."""
+    if not settings.GROQ_API_KEY:
+        return "not configured"
+    from .reasoning.ai_engine import _groq_client
+
+    _groq_client()
+    return "groq"
+
+
+async def warm(provider):
+    """Warm every subsystem, one at a time so request handling keeps the CPU.
+
+    Steps that fail are handed to background retries; this returns after
+    the first pass.
+    """
+    from .knowledge.vector_store import incident_memory
+
+    steps = {
+        "otlp_exporter": lambda: asyncio.to_thread(start_trace_export, provider),
+        "llm_client": lambda: asyncio.to_thread(build_llm_client),
+        "vector_store": lambda: incident_memory.warm_up_async(),
+    }
+    for name, step in steps.items():
+        if not await readiness.warm(name, step):
+            readiness.retry_in_background(name, step)
+    logger.info(f"Warm-up finished: {readiness.snapshot()}")
+
+
+# Global singleton
+readiness = Readiness(("vector_store", "otlp_exporter", "llm_client"))
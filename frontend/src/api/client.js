@@ -39,9 +39,27 @@ export const getGovernanceStatus = () => request('/api/governance/status');
 export const toggleGovernanceMode = () => request('/api/governance/toggle', { method: 'POST' });
 
 // Graph
-export const getGraph = () => request('/api/graph');
+export const getGraph = (since) => request(since != null ? `/api/graph?since=${since}` : '/api/graph');
 export const getImpact = (serviceId) => request(`/api/graph/impact/${serviceId}`);
 
+// Live changes over Server-Sent Events; returns a function that closes the stream.
+// `handlers` maps topic -> callback, plus an optional `resync` called whenever the
+// stream reconnects (e.g. after this client was dropped for falling behind) and an
+// optional `disconnected` called when the connection is lost.
+export const subscribeChanges = (topics, handlers) => {
+    const source = new EventSource(`${API_BASE}/api/stream?topics=${topics.join(',')}`);
+    let connected = false;
+    source.addEventListener('ready', () => {
+        if (connected) handlers.resync?.();
+        connected = true;
+    });
+    source.addEventListener('error', () => handlers.disconnected?.());
+    topics.forEach(topic => {
+        source.addEventListener(topic, (e) => handlers[topic]?.(JSON.parse(e.data)));
+    });
+    return () => source.close();
+};
+
 // Simulation
 export const simulateScenario = (scenario) => {
     const query = scenario ? `?scenario=${scenario}` : '';
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Link, useLocation } from 'react-router-dom';
-import { getHealth } from '../api/client';
+import { getHealth, subscribeChanges } from '../api/client';
 import { LayoutDashboard, Network, ScrollText, Settings, Activity } from './Icons';
 
 function Sidebar() {
@@ -8,16 +8,17 @@ function Sidebar() {
     const [health, setHealth] = useState(null);
 
     useEffect(() => {
-        getHealth()
+        const refresh = () => getHealth()
             .then(setHealth)
             .catch(() => setHealth(null));
 
-        const interval = setInterval(() => {
-            getHealth()
-                .then(setHealth)
-                .catch(() => setHealth(null));
-        }, 30000);
-        return () => clearInterval(interval);
+        refresh();
+        // Health only changes on circuit breaker transitions, which the server pushes
+        return subscribeChanges(['health'], {
+            health: setHealth,
+            resync: refresh,
+            disconnected: () => setHealth(null),
+        });
     }, []);
 
     return (
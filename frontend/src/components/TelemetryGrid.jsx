@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Activity, Zap, ShieldAlert, Cpu } from './Icons';
+import { subscribeChanges } from '../api/client';
 import './TelemetryGrid.css';
 
 const TelemetryGrid = () => {
@@ -25,8 +26,11 @@ const TelemetryGrid = () => {
 
     useEffect(() => {
         fetchMetrics();
-        const interval = setInterval(fetchMetrics, 2000); // 2s refresh
-        return () => clearInterval(interval);
+        // Snapshots are pushed by the server instead of polled
+        return subscribeChanges(['metrics'], {
+            metrics: (data) => setMetrics(data),
+            resync: fetchMetrics,
+        });
     }, []);
 
     const formatLatency = (l) => {
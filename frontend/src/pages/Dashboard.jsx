@@ -8,7 +8,8 @@ import {
     simulateScenario,
     resetSimulation,
     getGovernanceStatus,
-    toggleGovernanceMode
+    toggleGovernanceMode,
+    subscribeChanges
 } from '../api/client';
 
 import {
@@ -61,6 +62,19 @@ function Dashboard() {
         fetchData();
     }, [fetchData]);
 
+    // Apply pushed incident changes instead of refetching everything
+    useEffect(() => subscribeChanges(['incident'], {
+        incident: ({ incident }) => {
+            setIncidents(prev => (
+                prev.some(inc => inc.id === incident.id)
+                    ? prev.map(inc => (inc.id === incident.id ? incident : inc))
+                    : [incident, ...prev]
+            ));
+            getStats().then(setStats).catch(() => {});
+        },
+        resync: fetchData,
+    }), [fetchData]);
+
     const handleSimulate = async () => {
         setSimulating(true);
         await simulateScenario();
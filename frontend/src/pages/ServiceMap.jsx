@@ -1,5 +1,5 @@
-import React, { useState, useEffect } from 'react';
-import { getGraph, getImpact } from '../api/client';
+import React, { useState, useEffect, useRef } from 'react';
+import { getGraph, getImpact, subscribeChanges } from '../api/client';
 import './ServiceMap.css';
 
 const ServiceMap = () => {
@@ -8,18 +8,52 @@ const ServiceMap = () => {
     const [loading, setLoading] = useState(true);
     const [selectedService, setSelectedService] = useState(null);
     const [impactPath, setImpactPath] = useState([]);
+    const versionRef = useRef(null);
 
     useEffect(() => {
         loadGraph();
     }, []);
 
+    // Graph deltas are pushed as services and edges are discovered
+    useEffect(() => subscribeChanges(['graph'], {
+        graph: (delta) => mergeDelta(delta),
+        resync: resyncGraph,
+    }), []);
+
     const loadGraph = async () => {
         setLoading(true);
         const data = await getGraph();
+        versionRef.current = data.version;
         setGraph(data);
         setLoading(false);
     };
 
+    // After a reconnect only fetch what was stored since the last version seen
+    const resyncGraph = async () => {
+        if (versionRef.current == null) {
+            await loadGraph();
+            return;
+        }
+        mergeDelta(await getGraph(versionRef.current));
+    };
+
+    const mergeDelta = (delta) => {
+        versionRef.current = Math.max(versionRef.current ?? 0, delta.version);
+        setGraph(prev => {
+            const serviceIds = new Set(prev.services.map(s => s.id));
+            const edgeKeys = new Set(prev.dependencies.map(d => `${d.from}->${d.to}`));
+            return {
+                ...prev,
+                version: delta.version,
+                services: [...prev.services, ...delta.services.filter(s => !serviceIds.has(s.id))],
+                dependencies: [
+                    ...prev.dependencies,
+                    ...delta.dependencies.filter(d => !edgeKeys.has(`${d.from}->${d.to}`)),
+                ],
+            };
+        });
+    };
+
     const handleServiceClick = async (serviceId) => {
 
         if (selectedService === serviceId) {
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Benchmark correlating one large synthetic event window into an incident.
+
+Times the whole `correlate_events` path (window build, scenario detection,
+severity roll-up, first-appearance ordering, timeline selection and
+incident construction) against the previous per-object implementation,
+which built one timeline row per event, for plain event objects and for
+an `EventBuffer` from the ingest hot path. "cold" runs clear the message
+template cache first, as for a window of never-seen messages. The current
+path is also broken down by stage.
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+# Ensure backend package is importable
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.config import settings
+from app.correlation.engine import SEVERITY_MAP, build_timeline, correlate_events, detect_scenario
+from app.correlation.window import EventWindow, message_template
+from app.ingestion.records import EventBuffer
+from app.knowledge.dependency_graph import dependency_graph
+from app.models.events import SeverityLevel
+from app.models.incidents import Incident, IncidentStatus, Severity, TimelineEntry
+from app.reasoning.ranker import rank_root_causes
+
+
+def make_events(n: int, seed: int = 7):
+    """Lightweight stand-ins exposing the `LogEvent` attributes used by correlation."""
+    rng = random.Random(seed)
+    services = list(dependency_graph.nodes.keys())
+    severities = list(SeverityLevel)
+    base = datetime(2026, 1, 1)
+    return [
+        SimpleNamespace(
+            id=str(i),
+            source_service=rng.choice(services),
+            severity=rng.choice(severities),
+            message=f"request {rng.randint(0, 500)} failed after {rng.randint(1, 30)} retries",
+            timestamp=base + timedelta(milliseconds=rng.randint(0, 60_000)),
+        )
+        for i in range(n)
+    ]
+
+
+def make_buffer(events) -> EventBuffer:
+    buffer = EventBuffer()
+    for e in events:
+        buffer.append(e.source_service, e.severity, e.message, e.timestamp, event_id=e.id)
+    return buffer
+
+
+def legacy_correlate(events) -> Incident:
+    """The per-object implementation: a sort and a scan per feature."""
+    scenario = detect_scenario(events)
+    severity = Severity.LOW
+    for sev in [Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM, Severity.LOW]:
+        if any(SEVERITY_MAP.get(e.severity.value) == sev for e in events):
+            severity = sev
+            break
+    timeline = [
+        TimelineEntry(timestamp=e.timestamp, source_service=e.source_service, event=e.message, severity=e.severity.value)
+        for e in sorted(events, key=lambda e: e.timestamp)
+    ]
+    seen, services = set(), []
+    for e in sorted(events, key=lambda e: e.timestamp):
+        if e.source_service not in seen:
+            seen.add(e.source_service)
+            services.append(e.source_service)
+
+    incident = Incident(
+        title=scenario["title"], severity=severity, status=IncidentStatus.DETECTED,
+        timeline=timeline, scenario_type=scenario["id"],
+    )
+    incident.event_ids = [e.id for e in events]
+    incident.affected_services = services
+    return incident
+
+
+def timed(fn, *args, repeat: int = 5):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def cold(fn):
+    """`fn` with the message template cache cleared before each call."""
+    def run(*args):
+        message_template.cache_clear()
+        return fn(*args)
+    return run
+
+
+def rows(incident: Incident):
+    return [(t.timestamp, t.source_service, t.event, t.severity) for t in incident.timeline]
+
+
+def same_incident(full: Incident, capped: Incident) -> bool:
+    """Same roll-ups; the capped timeline is a chronological subset of the full one (equal when uncapped)."""
+    kept = rows(capped)
+    if len(full.timeline) <= settings.TIMELINE_MAX_ENTRIES:
+        timeline_ok = kept == rows(full)
+    else:
+        # Timestamps are unique enough in the synthetic data to check subset order by position
+        full_rows = rows(full)
+        position = {row: i for i, row in enumerate(full_rows)}
+        timeline_ok = len(kept) == settings.TIMELINE_MAX_ENTRIES and all(row in position for row in kept) \
+            and [position[row] for row in kept] == sorted(position[row] for row in kept)
+    return (
+        full.severity == capped.severity
+        and full.affected_services == capped.affected_services
+        and full.event_ids == capped.event_ids
+        and timeline_ok
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    buffer = make_buffer(events)
+    cap = settings.TIMELINE_MAX_ENTRIES
+    print(f"Correlation benchmark ({args.events} events, timeline cap {cap}, best of {args.repeat})")
+
+    # Below the cap the timeline must match the legacy one exactly
+    small = events[:cap // 2]
+    assert same_incident(legacy_correlate(small), correlate_events(small)), "uncapped timeline differs"
+
+    legacy_s, legacy = timed(legacy_correlate, events, repeat=args.repeat)
+    objects_s, from_objects = timed(cold(correlate_events), events, repeat=args.repeat)
+    buffer_s, from_buffer = timed(cold(correlate_events), buffer, repeat=args.repeat)
+    warm_s, _ = timed(correlate_events, buffer, repeat=args.repeat)
+    assert same_incident(legacy, from_objects), "object path differs from legacy"
+    assert same_incident(legacy, from_buffer), "buffer path differs from legacy"
+
+    print(f"  legacy, event objects              : {legacy_s * 1000:8.1f} ms")
+    print(f"  correlate_events, objects (cold)   : {objects_s * 1000:8.1f} ms")
+    print(f"  correlate_events, EventBuffer (cold): {buffer_s * 1000:8.1f} ms")
+    print(f"  correlate_events, EventBuffer (warm): {warm_s * 1000:8.1f} ms")
+    full_top, capped_top = rank_root_causes(legacy.timeline).top, rank_root_causes(from_buffer.timeline).top
+    print(f"  top root cause, full / capped timeline: {full_top} / {capped_top}")
+
+    print("  EventBuffer path by stage (cold):")
+    build_s, window = timed(EventWindow.from_events, buffer, repeat=args.repeat)
+    features_s, _ = timed(lambda: (window.severity_rollup(), window.first_appearance()), repeat=args.repeat)
+
+    def intern():
+        message_template.cache_clear()
+        window._template_ids = None
+        return window.template_ids
+
+    templates_s, _ = timed(intern, repeat=args.repeat)
+    scenario_s, _ = timed(detect_scenario, buffer, window, repeat=args.repeat)
+    select_s, indices = timed(window.timeline_indices, cap, dependency_graph, repeat=args.repeat)
+    timeline_s, _ = timed(build_timeline, buffer, window, repeat=args.repeat)
+    print(f"    window build               : {build_s * 1000:8.1f} ms")
+    print(f"    severity + affected        : {features_s * 1000:8.1f} ms")
+    print(f"    template interning         : {templates_s * 1000:8.1f} ms")
+    print(f"    scenario detection         : {scenario_s * 1000:8.1f} ms  (distinct messages)")
+    print(f"    timeline selection         : {select_s * 1000:8.1f} ms  (gaps, distances, templates interned)")
+    print(f"    timeline ({len(indices)} rows)        : {timeline_s * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark the compact EventBuffer against LogEvent instances.
+
+Reports retained memory per event, allocations per ingested event and the
+cost of building a correlation window from each representation.
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ensure backend package is importable
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.correlation.window import EventWindow
+from app.ingestion.records import EventBuffer
+from app.models.events import LogEvent, SeverityLevel
+
+
+def make_payloads(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    services = ["vault", "eso", "database", "auth_service", "api_gateway", "user_service"]
+    severities = list(SeverityLevel)
+    base = datetime(2026, 1, 1)
+    return [
+        dict(
+            source_service=rng.choice(services),
+            severity=rng.choice(severities),
+            message=f"request {rng.randint(0, 500)} failed after {rng.randint(1, 30)} retries",
+            timestamp=base + timedelta(milliseconds=rng.randint(0, 60_000)),
+        )
+        for _ in range(n)
+    ]
+
+
+def build_log_events(payloads):
+    return [LogEvent(**p) for p in payloads]
+
+
+def build_buffer(payloads):
+    buffer = EventBuffer()
+    for p in payloads:
+        buffer.append(**p)
+    return buffer
+
+
+def measure(builder, payloads):
+    """Return (built object, retained bytes, allocated blocks, seconds)."""
+    # Timed run without tracing overhead
+    gc.collect()
+    start = time.perf_counter()
+    builder(payloads)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    before_bytes, _ = tracemalloc.get_traced_memory()
+    before_blocks = sum(s.count for s in tracemalloc.take_snapshot().statistics("filename"))
+    built = builder(payloads)
+    after_bytes, _ = tracemalloc.get_traced_memory()
+    after_blocks = sum(s.count for s in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    return built, after_bytes - before_bytes, after_blocks - before_blocks, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.events)
+    n = args.events
+    print(f"Event representation benchmark ({n} events)")
+
+    for label, builder in (("LogEvent", build_log_events), ("EventBuffer", build_buffer)):
+        built, retained, blocks, elapsed = measure(builder, payloads)
+        start = time.perf_counter()
+        EventWindow.from_events(built)
+        window_s = time.perf_counter() - start
+        print(
+            f"  {label:<12} {retained / n:8.1f} B/event  "
+            f"{blocks / n:6.2f} live allocs/event  "
+            f"ingest {elapsed * 1000:8.1f} ms  window {window_s * 1000:8.1f} ms"
+        )
+        del built
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark DependencyGraph construction and traversals on a large graph.
+
+Generates a layered service graph (10k services / 100k edges by default),
+optionally writes it in service_graph.json format, and times loading,
+duplicate-edge inserts, impact-path BFS and dependency-chain lookups.
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure backend package is importable
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.knowledge.dependency_graph import DependencyGraph
+
+
+def generate_graph(services: int, edges: int, seed: int = 7) -> dict:
+    """Layered graph where services only call services in deeper tiers."""
+    rng = random.Random(seed)
+    tiers = ["application", "platform", "data", "infrastructure"]
+    ids = [f"svc-{i:05d}" for i in range(services)]
+    tier_of = {sid: min(i * len(tiers) // services, len(tiers) - 1) for i, sid in enumerate(ids)}
+
+    dependencies = set()
+    while len(dependencies) < edges:
+        a, b = rng.sample(range(services), 2)
+        src, dst = (ids[a], ids[b]) if a < b else (ids[b], ids[a])
+        dependencies.add((src, dst))
+
+    return {
+        "services": [
+            {"id": sid, "name": sid, "type": "service", "tier": tiers[tier_of[sid]]}
+            for sid in ids
+        ],
+        "dependencies": [
+            {"from": src, "to": dst, "relation": "calls"} for src, dst in sorted(dependencies)
+        ],
+    }
+
+
+def timed(label: str, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    print(f"  {label:<40} {(time.perf_counter() - start) * 1000:10.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=10_000)
+    parser.add_argument("--edges", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1_000)
+    parser.add_argument("--write", type=Path, help="Also write the generated graph to this JSON file")
+    args = parser.parse_args()
+
+    data = generate_graph(args.services, args.edges)
+    if args.write:
+        args.write.write_text(json.dumps(data))
+    print(f"Dependency graph benchmark ({args.services} services, {args.edges} edges)")
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json") as fh:
+        json.dump(data, fh)
+        fh.flush()
+        graph = DependencyGraph()
+        timed("load_from_file", graph.load_from_file, fh.name)
+
+    rng = random.Random(11)
+    existing = [(d["from"], d["to"]) for d in rng.sample(data["dependencies"], args.queries)]
+    ids = [s["id"] for s in data["services"]]
+    pairs = [tuple(rng.sample(ids, 2)) for _ in range(args.queries)]
+
+    timed(f"{args.queries} duplicate add_edge", lambda: [graph.add_edge(a, b) for a, b in existing])
+    timed(f"{args.queries} get_impact_path", lambda: [graph.get_impact_path(a) for a, _ in pairs])
+    timed(f"{args.queries} get_impact_path (memoized)", lambda: [graph.get_impact_path(a) for a, _ in pairs])
+    timed(f"{args.queries} get_dependency_chain", lambda: [graph.get_dependency_chain(a, b) for a, b in pairs])
+    graph.add_edge(*pairs[0])
+    timed(f"{args.queries} get_impact_path (1 new edge)", lambda: [graph.get_impact_path(a) for a, _ in pairs])
+    timed("to_dict", graph.to_dict)
+    assert len(graph.edges) <= args.edges + 1, "duplicate edges were inserted"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Measure backend cold start: `import app.main`, first response and readiness.
+
+Each run is a fresh interpreter in an empty working directory with its own
+SQLite database, so nothing is shared between runs except the OS page
+cache. Reports the median of `--runs` for:
+
+  import   time to `import app.main`
+  serve    import plus startup until /api/health answers
+  ready    import plus startup until /api/ready returns 200 (warm-up done)
+
+With `--compare REF` the same measurements are taken for the backend at a
+git revision (e.g. the commit before lazy initialization), extracted with
+`git archive`, and printed side by side.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PROBE = r"""
+import os, sys, time, json
+start = time.perf_counter()
+import app.main
+result = {"import": time.perf_counter() - start}
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    client.get("/api/health").raise_for_status()
+    result["serve"] = time.perf_counter() - start
+    while time.perf_counter() - start < 120:
+        response = client.get("/api/ready")
+        if response.status_code == 200:
+            result["ready"] = time.perf_counter() - start
+            break
+        if response.status_code == 404:  # tree without a readiness endpoint: ready once serving
+            result["ready"] = result["serve"]
+            break
+        time.sleep(0.02)
+print(json.dumps(result))
+sys.stdout.flush()
+os._exit(0)
+"""
+
+
+def measure(backend: Path, runs: int) -> dict:
+    samples = {"import": [], "serve": [], "ready": []}
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as workdir:
+            env = dict(
+                os.environ,
+                PYTHONPATH=str(backend),
+                DATABASE_URL=f"sqlite:///{workdir}/bench.db",
+                PYTHONDONTWRITEBYTECODE="1",
+            )
+            env.pop("GROQ_API_KEY", None)
+            out = subprocess.run(
+                [sys.executable, "-c", PROBE], cwd=workdir, env=env, capture_output=True, text=True, timeout=300,
+            )
+            if out.returncode != 0:
+                raise SystemExit(f"probe failed for {backend}:\n{out.stderr[-2000:]}")
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            for key, value in result.items():
+                samples[key].append(value)
+    return {key: statistics.median(values) for key, values in samples.items() if values}
+
+
+def extract(ref: str, into: Path) -> Path:
+    archive = subprocess.run(["git", "-C", str(ROOT), "archive", ref, "backend"], capture_output=True, check=True)
+    archive_path = into / "backend.tar"
+    archive_path.write_bytes(archive.stdout)
+    with tarfile.open(archive_path) as tar:
+        tar.extractall(into)
+    return into / "backend"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--compare", metavar="REF", help="git revision to measure against")
+    args = parser.parse_args()
+
+    results = {"working tree": measure(ROOT / "backend", args.runs)}
+    if args.compare:
+        with tempfile.TemporaryDirectory() as tmp:
+            results[args.compare] = measure(extract(args.compare, Path(tmp)), args.runs)
+
+    print(f"median of {args.runs} runs (seconds)")
+    print(f"{'':>14} {'import':>8} {'serve':>8} {'ready':>8}")
+    for name, medians in results.items():
+        print(f"{name[:14]:>14} " + " ".join(f"{medians.get(k, float('nan')):8.3f}" for k in ("import", "serve", "ready")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Compare the metrics section of the incident prompt before and after summarization.
+
+Serves synthetic Prometheus range results for a cluster of services (one
+of which shifts level during the incident window) through a mock
+transport, then measures the old prompt block (raw results for every
+series, JSON-dumped) against the service-scoped summary block.
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+# Ensure backend package is importable
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.config import settings
+from app.knowledge.metric_summary import format_metrics_block
+from app.knowledge.metrics_fetcher import MetricsFetcher, incident_queries
+from app.knowledge.promql_cache import PromQLCache
+
+
+def make_handler(services, instances, faulty, rng):
+    def series(start, end, step, base, shift_at=None):
+        times = np.arange(start, end + 1, step)
+        values = base * (1 + 0.05 * rng.standard_normal(len(times)))
+        if shift_at is not None:
+            values[times >= shift_at] *= 8
+        return [[int(t), f"{v:.6f}"] for t, v in zip(times, values)]
+
+    def handler(request):
+        params = request.url.params
+        start, end, step = int(params["start"]), int(params["end"]), int(params["step"])
+        query = params["query"]
+        scope = re.search(r'service=~"([^"]*)"', query)
+        wanted = scope.group(1).split("|") if scope else services
+        shift_at = end - 240
+        if "node_" in query:
+            result = [{"metric": {"instance": i}, "values": series(start, end, step, 0.4)} for i in instances]
+        else:
+            result = [
+                {"metric": {"service": s}, "values": series(start, end, step, 1.0, shift_at if s == faulty else None)}
+                for s in wanted
+            ]
+        return httpx.Response(200, json={"status": "success", "data": {"resultType": "matrix", "result": result}})
+
+    return handler
+
+
+async def run(args):
+    rng = np.random.default_rng(7)
+    services = [f"svc-{i}" for i in range(args.services)]
+    instances = [f"node-{i}:9100" for i in range(args.instances)]
+    affected = services[:args.affected]
+    transport = httpx.MockTransport(make_handler(services, instances, affected[0], rng))
+    incident_time = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    # Before: unscoped, raw results of the incident window only
+    client = httpx.AsyncClient(transport=transport)
+    fetcher = MetricsFetcher(base_url="http://prometheus", cache=PromQLCache(ttl=0), client=client)
+    start = int(incident_time.timestamp()) - 300
+    end = int(incident_time.timestamp()) + 60
+    raw = {name: await fetcher.query_range(q, start, end) for name, q in incident_queries().items()}
+    before = json.dumps(raw, indent=2)
+
+    # After: scoped to affected services, summarized and budgeted
+    began = time.perf_counter()
+    metrics = await fetcher.get_incident_metrics(incident_time, affected)
+    after = format_metrics_block(metrics, args.budget)
+    elapsed = (time.perf_counter() - began) * 1000
+    await client.aclose()
+
+    print(f"before: {len(before):>9,} chars  ~{len(before) // settings.CHARS_PER_TOKEN:,} tokens")
+    print(f"after:  {len(after):>9,} chars  ~{len(after) // settings.CHARS_PER_TOKEN:,} tokens  ({elapsed:.1f} ms fetch+summarize)")
+    print("\n" + after)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=40)
+    parser.add_argument("--instances", type=int, default=6)
+    parser.add_argument("--affected", type=int, default=4)
+    parser.add_argument("--budget", type=int, default=400, help="Token budget for the summary block")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
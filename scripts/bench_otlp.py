@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark the OTLP trace receiver's decode + edge aggregation path.
+
+Generates synthetic traces that walk random call paths through a layered
+service graph, encodes them as OTLP protobuf and JSON export requests, and
+measures spans/second for decoding, aggregation and the graph flush.
+"""
+import argparse
+import base64
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Ensure backend package is importable
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from google.protobuf.json_format import MessageToDict
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+
+from app.ingestion.otlp import SpanEdgeAggregator, decode_json, decode_protobuf
+from app.knowledge.dependency_graph import DependencyGraph
+
+
+def build_request(traces: int, depth: int, services: int, rng: random.Random) -> ExportTraceServiceRequest:
+    """One export request; spans are grouped by service like an SDK batch."""
+    by_service = {}
+    for _ in range(traces):
+        trace_id = rng.randbytes(16)
+        parent = b""
+        tier = 0
+        start = time.time_ns()
+        for _ in range(depth):
+            tier = rng.randint(tier, min(tier + services // depth, services - 1))
+            span_id = rng.randbytes(8)
+            by_service.setdefault(f"svc-{tier}", []).append((trace_id, span_id, parent, start))
+            parent = span_id
+
+    request = ExportTraceServiceRequest()
+    for service, spans in by_service.items():
+        resource_spans = request.resource_spans.add()
+        attr = resource_spans.resource.attributes.add()
+        attr.key = "service.name"
+        attr.value.string_value = service
+        scope = resource_spans.scope_spans.add()
+        for trace_id, span_id, parent, start in spans:
+            span = scope.spans.add()
+            span.trace_id, span.span_id, span.parent_span_id = trace_id, span_id, parent
+            span.name = "call"
+            span.start_time_unix_nano = start
+            span.end_time_unix_nano = start + rng.randint(1, 50) * 1_000_000
+            span.status.code = 2 if rng.random() < 0.02 else 0
+    return request
+
+
+def to_otlp_json(request: ExportTraceServiceRequest) -> bytes:
+    """OTLP/JSON uses hex span ids, unlike protobuf's default base64 mapping."""
+    data = MessageToDict(request)
+    for resource_spans in data.get("resourceSpans", []):
+        for scope in resource_spans.get("scopeSpans", []):
+            for span in scope.get("spans", []):
+                for key in ("traceId", "spanId", "parentSpanId"):
+                    if key in span:
+                        span[key] = base64.b64decode(span[key]).hex()
+    return json.dumps(data).encode()
+
+
+def run(label: str, decode, payloads, spans_per_payload: int):
+    aggregator = SpanEdgeAggregator(graph=DependencyGraph(), flush_interval=3600)
+    start = time.perf_counter()
+    decode_s = 0.0
+    for payload in payloads:
+        t = time.perf_counter()
+        spans = decode(payload)
+        decode_s += time.perf_counter() - t
+        aggregator.ingest(spans)
+    edges = aggregator.flush()
+    elapsed = time.perf_counter() - start
+    total = spans_per_payload * len(payloads)
+    print(f"  {label:<9} {total / elapsed:12,.0f} spans/s   (decode {decode_s / elapsed:4.0%}, "
+          f"{aggregator.stats['edges_observed']:,} calls -> {edges} edges)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--traces", type=int, default=200, help="Traces per export request")
+    parser.add_argument("--depth", type=int, default=5, help="Spans per trace")
+    parser.add_argument("--services", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    requests = [build_request(args.traces, args.depth, args.services, rng) for _ in range(args.requests)]
+    spans = args.traces * args.depth
+    print(f"OTLP receiver benchmark ({args.requests} requests x {spans} spans)")
+    run("protobuf", decode_protobuf, [r.SerializeToString() for r in requests], spans)
+    run("json", decode_json, [to_otlp_json(r) for r in requests], spans)
+
+
+if __name__ == "__main__":
+    main()
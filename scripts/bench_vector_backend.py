@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Compare the Chroma and NumPy vector backends on synthetic embeddings.
+
+Each configuration runs in fresh interpreters so import cost and memory
+are measured in isolation: one process loads the store and runs queries,
+a second one opens the same directory cold and answers one query.
+
+  chroma       Chroma persistent client (HNSW)
+  numpy-exact  NumPy backend, exact matrix-vector search
+  numpy-ivfpq  NumPy backend, IVF-PQ index (exact search threshold lowered)
+
+Reported per configuration: load time (including index build), median
+and p95 query latency with and without a metadata filter, recall@10
+against brute force, RSS after queries, on-disk size, and cold open time
+(import + open + first query) with the RSS it needs.
+
+Embeddings are clustered random unit vectors, served by a lookup
+"embedding function", so no model is loaded.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ensure backend package is importable
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+CONFIGS = {
+    "chroma": ("chroma", None),
+    "numpy-exact": ("numpy", 10 ** 9),
+    "numpy-ivfpq": ("numpy", 1000),
+}
+K = 10
+SCENARIOS = 8
+
+
+def make_data(count: int, queries: int, dim: int, seed: int):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(count // 100, 1), dim)).astype(np.float32)
+    data = centers[rng.integers(0, len(centers), count)] + 0.8 * rng.standard_normal((count, dim)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    picks = data[rng.integers(0, count, queries)]
+    query = picks + 0.3 * rng.standard_normal(picks.shape).astype(np.float32)
+    query /= np.linalg.norm(query, axis=1, keepdims=True)
+    return data, query
+
+
+class LookupEmbedding:
+    """Embedding function over precomputed vectors: "v12" is data row 12, "q3" query 3."""
+
+    def __init__(self, data, queries):
+        self.tables = {"v": data, "q": queries}
+
+    def __call__(self, input):
+        return [self.tables[text[0]][int(text[1:])].tolist() for text in input]
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def disk_mb(directory: str) -> float:
+    return sum(p.stat().st_size for p in Path(directory).rglob("*") if p.is_file()) / 2 ** 20
+
+
+def open_backend(config: str, directory: str, embed):
+    from app.config import settings
+    from app.knowledge.vector_backends import create_backend
+
+    name, exact_max = CONFIGS[config]
+    if exact_max is not None:
+        settings.ANN_EXACT_MAX_VECTORS = exact_max
+    return create_backend(name, directory, embed)
+
+
+def child_load(args):
+    from app.config import settings
+    from app.knowledge.hybrid_search import SearchFilter
+
+    data, queries = make_data(args.vectors, args.queries, args.dim, args.seed)
+    backend = open_backend(args.config, args.directory, LookupEmbedding(data, queries))
+
+    start = time.perf_counter()
+    for i in range(0, args.vectors, 5000):
+        ids = [f"v{j}" for j in range(i, min(i + 5000, args.vectors))]
+        backend.upsert(ids, ids, [{"type": "incident", "scenario_type": f"s{int(j[1:]) % SCENARIOS}"} for j in ids])
+    if hasattr(backend, "build_index") and backend.count() > settings.ANN_EXACT_MAX_VECTORS:
+        while backend._building:
+            time.sleep(0.05)
+        backend.build_index()  # fold in batches written during background builds
+    backend.flush()
+    load = time.perf_counter() - start
+
+    truth = np.argsort(-(queries @ data.T), axis=1)[:, :K]
+    latencies, filtered, recalls = [], [], []
+    where = SearchFilter(scenario_type="s0")
+    for j in range(args.queries):
+        t0 = time.perf_counter()
+        hits = backend.query(f"q{j}", K)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        found = {int(record.id[1:]) for record, _ in hits}
+        recalls.append(len(found & set(truth[j].tolist())) / K)
+        t0 = time.perf_counter()
+        backend.query(f"q{j}", K, where)
+        filtered.append((time.perf_counter() - t0) * 1000)
+
+    return {
+        "load_s": load,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "filtered_p50_ms": statistics.median(filtered),
+        "recall@10": statistics.mean(recalls),
+        "rss_mb": rss_mb(),
+        "disk_mb": disk_mb(args.directory),
+    }
+
+
+def child_open(args):
+    data, queries = make_data(args.vectors, 1, args.dim, args.seed)
+    embed = LookupEmbedding(data, queries)
+    base = rss_mb()
+    start = time.perf_counter()
+    backend = open_backend(args.config, args.directory, embed)
+    backend.query("q0", K)
+    return {"open_s": time.perf_counter() - start, "open_rss_mb": rss_mb() - base}
+
+
+def run_child(mode: str, config: str, directory: str, args) -> dict:
+    out = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--child", mode, "--config", config, "--directory", directory,
+         "--vectors", str(args.vectors), "--queries", str(args.queries), "--dim", str(args.dim), "--seed", str(args.seed)],
+        capture_output=True, text=True, cwd=directory,
+    )
+    if out.returncode != 0:
+        raise SystemExit(f"{config} {mode} failed:\n{out.stderr[-3000:]}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGS), default=list(CONFIGS))
+    parser.add_argument("--child", choices=["load", "open"], help=argparse.SUPPRESS)
+    parser.add_argument("--config", help=argparse.SUPPRESS)
+    parser.add_argument("--directory", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = child_load(args) if args.child == "load" else child_open(args)
+        print(json.dumps(result))
+        sys.stdout.flush()
+        os._exit(0)  # skip interpreter teardown of background threads
+
+    columns = ["load_s", "p50_ms", "p95_ms", "filtered_p50_ms", "recall@10", "rss_mb", "disk_mb", "open_s", "open_rss_mb"]
+    print(f"{args.vectors} vectors x {args.dim} dims, {args.queries} queries, top {K}")
+    print(f"{'config':>12} " + " ".join(f"{c:>15}" for c in columns))
+    for config in args.configs:
+        with tempfile.TemporaryDirectory() as directory:
+            result = run_child("load", config, directory, args)
+            result.update(run_child("open", config, directory, args))
+        print(f"{config:>12} " + " ".join(f"{result[c]:15.3f}" for c in columns), flush=True)
+
+
+if __name__ == "__main__":
+    main()
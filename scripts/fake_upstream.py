@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Local fake of Prometheus, Loki and the Groq API with fault injection.
+
+Serves just enough of each API for the backend to run against it, so
+circuit breakers, hedging and latency budgets can be exercised without the
+real stack. Point the backend at it with:
+
+    PROMETHEUS_URL=http://localhost:9999 LOKI_URL=http://localhost:9999 \\
+    GROQ_BASE_URL=http://localhost:9999 GROQ_API_KEY=fake uvicorn app.main:app
+
+Faults are set per upstream ("prometheus", "loki" or "llm") at runtime:
+
+    curl -X POST localhost:9999/_faults/prometheus \\
+         -d '{"latency_ms": 3000, "error_rate": 0.5, "status": 503}'
+    curl -X DELETE localhost:9999/_faults/prometheus
+
+`latency_ms` delays responses (with `jitter_ms` spread), `error_rate` is the
+fraction answered with `status`, and `hang` never answers at all.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time as clock
+from typing import Dict
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+app = FastAPI(title="Devsick fake upstream")
+
+faults: Dict[str, Dict] = {}
+counts: Dict[str, int] = {"prometheus": 0, "loki": 0, "llm": 0}
+
+
+def _upstream(path: str) -> str:
+    if path.startswith("/api/v1/"):
+        return "prometheus"
+    if path.startswith("/loki/"):
+        return "loki"
+    if path.startswith("/openai/"):
+        return "llm"
+    return ""
+
+
+@app.middleware("http")
+async def inject_faults(request: Request, call_next):
+    upstream = _upstream(request.url.path)
+    if not upstream:
+        return await call_next(request)
+    counts[upstream] += 1
+    fault = faults.get(upstream, {})
+    if fault.get("hang"):
+        await asyncio.sleep(3600)
+    delay = fault.get("latency_ms", 0) + random.uniform(0, fault.get("jitter_ms", 0))
+    if delay:
+        await asyncio.sleep(delay / 1000)
+    if random.random() < fault.get("error_rate", 0.0):
+        return JSONResponse({"status": "error", "error": "injected fault"}, status_code=fault.get("status", 503))
+    return await call_next(request)
+
+
+@app.post("/_faults/{upstream}")
+async def set_fault(upstream: str, request: Request):
+    faults[upstream] = await request.json()
+    return faults
+
+
+@app.delete("/_faults/{upstream}")
+async def clear_fault(upstream: str):
+    faults.pop(upstream, None)
+    return faults
+
+
+@app.get("/_faults")
+async def get_faults():
+    return {"faults": faults, "requests": counts}
+
+
+def _value(query: str) -> float:
+    return 1.0 if query.startswith("max(up") else round(random.uniform(0.1, 2.0), 4)
+
+
+@app.get("/api/v1/query")
+async def prom_query(query: str, time: float = None):
+    now = time or clock.time()
+    return {"status": "success", "data": {"resultType": "vector", "result": [
+        {"metric": {}, "value": [now, str(_value(query))]},
+    ]}}
+
+
+@app.get("/api/v1/query_range")
+async def prom_query_range(query: str, start: float, end: float, step: float):
+    points = [[t, str(_value(query))] for t in range(int(start), int(end) + 1, max(int(step), 1))]
+    return {"status": "success", "data": {"resultType": "matrix", "result": [
+        {"metric": {"service": "auth_service", "instance": "node-1:9100"}, "values": points},
+    ]}}
+
+
+@app.get("/loki/api/v1/query_range")
+async def loki_query_range(query: str, limit: int = 100, start: int = None):
+    now = clock.time_ns()
+    return {"status": "success", "data": {"resultType": "streams", "result": [
+        {"stream": {"container": "auth_service"}, "values": [[str(now), "ERROR calling vault: connection refused"]]},
+    ]}}
+
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    rca = {
+        "root_cause": "vault",
+        "summary": "Fake upstream analysis",
+        "reasoning_chain": ["Step 1: fake"],
+        "confidence_score": 0.5,
+        "affected_services": ["vault"],
+        "impact_description": "None (fake)",
+    }
+    return {
+        "id": "fake", "object": "chat.completion", "created": int(clock.time()), "model": body.get("model", "fake"),
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": json.dumps(rca)}}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9999)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
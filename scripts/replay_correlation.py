@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Replay archived or synthetic events through the streaming correlator.
+
+Synthetic streams repeat the labeled scenarios from
+backend/app/data/sample_events.json and interleave background noise at a
+configurable rate. Archived streams are JSON lines with `source_service`,
+`severity`, `message`, `timestamp` (ISO-8601 or epoch seconds) and an
+optional `label` naming the incident each event belongs to.
+
+Reports throughput, per-event latency, peak memory and pairwise
+incident-grouping precision/recall. Runs without external services; use
+--workers to shard correlation across local worker processes. With
+--workers, per-event latency covers routing only and peak RSS is the
+parent's.
+
+Examples:
+    python scripts/replay_correlation.py --incidents 200 --noise-rate 5
+    python scripts/replay_correlation.py --archive events.jsonl --speed 10
+"""
+import argparse
+import json
+import random
+import resource
+import sys
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Ensure backend package is importable
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+import numpy as np
+
+from app.config import settings
+from app.correlation.sharding import PARTITION_KEYS, ShardedCorrelator
+from app.correlation.streaming import StreamingCorrelator
+from app.ingestion.records import EventRecord, to_epoch
+from app.knowledge.dependency_graph import dependency_graph
+from app.models.events import SeverityLevel
+
+SAMPLE_EVENTS = ROOT / "backend" / "app" / "data" / "sample_events.json"
+
+NOISE_MESSAGES = [
+    "GET /healthz 200 in {n}ms",
+    "cache miss for key session:{n}",
+    "request {n} completed",
+    "connection pool stats: active={n}",
+    "retrying upstream call after {n}ms timeout",
+]
+
+LabeledRecord = Tuple[EventRecord, Optional[str]]
+
+
+def synthetic_stream(
+    incidents: int,
+    noise_rate: float,
+    noise_error_ratio: float,
+    noise_services: int,
+    window_seconds: int,
+    seed: int,
+) -> List[LabeledRecord]:
+    """Labeled scenario instances spread over time, interleaved with noise."""
+    rng = random.Random(seed)
+    scenarios = json.loads(SAMPLE_EVENTS.read_text())["scenarios"]
+    names = sorted(scenarios)
+    base = datetime(2026, 1, 1).timestamp()
+
+    stream: List[LabeledRecord] = []
+    cursor = base
+    for k in range(incidents):
+        name = names[k % len(names)]
+        label = f"{name}#{k}"
+        events = scenarios[name]["events"]
+        for evt in events:
+            stream.append((
+                EventRecord(
+                    id=str(uuid.uuid4()),
+                    source_service=evt["source_service"],
+                    severity=SeverityLevel(evt["severity"]),
+                    message=evt["message"],
+                    epoch=cursor + evt["timestamp_offset_seconds"],
+                ),
+                label,
+            ))
+        span = max(evt["timestamp_offset_seconds"] for evt in events)
+        # Leave enough quiet time for the window to close between incidents
+        cursor += span + window_seconds * (2 + rng.random())
+
+    duration = cursor - base
+    services = list(dependency_graph.nodes) + [f"noise-svc-{i}" for i in range(noise_services)]
+    noise_count = int(duration * noise_rate)
+    for epoch in np.sort(np.random.default_rng(seed).uniform(base, cursor, noise_count)).tolist():
+        if rng.random() < noise_error_ratio:
+            severity = rng.choice([SeverityLevel.HIGH, SeverityLevel.MEDIUM])
+        else:
+            severity = rng.choice([SeverityLevel.INFO, SeverityLevel.LOW])
+        message = rng.choice(NOISE_MESSAGES).format(n=rng.randint(1, 9999))
+        stream.append((
+            EventRecord(
+                id=str(uuid.uuid4()),
+                source_service=rng.choice(services),
+                severity=severity,
+                message=message,
+                epoch=epoch,
+            ),
+            None,
+        ))
+
+    stream.sort(key=lambda item: item[0].epoch)
+    return stream
+
+
+def archived_stream(path: Path) -> List[LabeledRecord]:
+    """Load labeled events from a JSON-lines archive."""
+    stream: List[LabeledRecord] = []
+    with path.open() as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            ts = data["timestamp"]
+            epoch = float(ts) if isinstance(ts, (int, float)) else to_epoch(datetime.fromisoformat(ts))
+            stream.append((
+                EventRecord(
+                    id=data.get("id") or str(uuid.uuid4()),
+                    source_service=data["source_service"],
+                    severity=SeverityLevel(data.get("severity", "info")),
+                    message=data["message"],
+                    epoch=epoch,
+                ),
+                data.get("label"),
+            ))
+    stream.sort(key=lambda item: item[0].epoch)
+    return stream
+
+
+def replay(stream: Iterable[LabeledRecord], correlator: StreamingCorrelator, speed: float):
+    """Push events through the correlator, pacing at `speed`x real time when > 0."""
+    incidents = []
+    latencies = []
+    wall_start = time.perf_counter()
+    first_epoch = None
+
+    for record, _ in stream:
+        if speed > 0:
+            if first_epoch is None:
+                first_epoch = record.epoch
+            due = wall_start + (record.epoch - first_epoch) / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        start = time.perf_counter()
+        incidents.extend(correlator.push(record))
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    incidents.extend(correlator.flush())
+    flush_s = time.perf_counter() - start
+
+    return incidents, np.asarray(latencies), flush_s, time.perf_counter() - wall_start
+
+
+def _pairs(n: int) -> int:
+    return n * (n - 1) // 2
+
+
+def grouping_quality(stream: List[LabeledRecord], incidents) -> Dict[str, float]:
+    """Pairwise precision/recall of predicted incident groups vs labels."""
+    labels = {record.id: label for record, label in stream}
+    true_pairs = sum(_pairs(c) for label, c in Counter(labels.values()).items() if label is not None)
+
+    predicted_pairs = 0
+    true_positive = 0
+    for incident in incidents:
+        event_ids = incident.event_ids
+        predicted_pairs += _pairs(len(event_ids))
+        counts = Counter(labels.get(eid) for eid in event_ids)
+        true_positive += sum(_pairs(c) for label, c in counts.items() if label is not None)
+
+    precision = true_positive / predicted_pairs if predicted_pairs else 0.0
+    recall = true_positive / true_pairs if true_pairs else 0.0
+    return {"precision": precision, "recall": recall}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archive", type=Path, help="JSON-lines archive to replay instead of synthetic events")
+    parser.add_argument("--incidents", type=int, default=100, help="Synthetic scenario instances")
+    parser.add_argument("--noise-rate", type=float, default=1.0, help="Noise events per second of stream time")
+    parser.add_argument("--noise-error-ratio", type=float, default=0.01, help="Fraction of noise at error severity")
+    parser.add_argument("--noise-services", type=int, default=20, help="Extra services that only emit noise")
+    parser.add_argument("--speed", type=float, default=0.0, help="Replay at N x real time (0 = as fast as possible)")
+    parser.add_argument("--window", type=int, default=settings.CORRELATION_WINDOW_SECONDS)
+    parser.add_argument("--min-events", type=int, default=settings.MIN_EVENTS_FOR_INCIDENT)
+    parser.add_argument("--workers", type=int, default=0, help="Shard across N worker processes (0 = in-process)")
+    parser.add_argument("--partition-by", choices=PARTITION_KEYS, default="component")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--trace-memory", action="store_true", help="Report Python heap peak (slower)")
+    args = parser.parse_args()
+
+    if args.archive:
+        stream = archived_stream(args.archive)
+    else:
+        stream = synthetic_stream(
+            args.incidents, args.noise_rate, args.noise_error_ratio,
+            args.noise_services, args.window, args.seed,
+        )
+
+    if args.workers:
+        correlator = ShardedCorrelator(
+            workers=args.workers, window_seconds=args.window,
+            min_events=args.min_events, partition_by=args.partition_by,
+        ).start()
+    else:
+        correlator = StreamingCorrelator(window_seconds=args.window, min_events=args.min_events)
+    if args.trace_memory:
+        tracemalloc.start()
+    try:
+        incidents, latencies, flush_s, wall_s = replay(stream, correlator, args.speed)
+    finally:
+        if args.workers:
+            correlator.close()
+    heap_peak = tracemalloc.get_traced_memory()[1] if args.trace_memory else None
+    if args.trace_memory:
+        tracemalloc.stop()
+
+    processing_s = float(latencies.sum()) + flush_s
+    quality = grouping_quality(stream, incidents)
+    labeled = len({label for _, label in stream if label is not None})
+
+    print(f"Replayed {len(stream)} events ({labeled} labeled incidents) -> {len(incidents)} incidents")
+    print(f"  wall time          : {wall_s:8.2f} s")
+    print(f"  throughput         : {len(stream) / processing_s:10.0f} events/s (processing)")
+    if len(latencies):
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+        print(f"  per-event latency  : p50 {p50:8.1f} us   p99 {p99:8.1f} us")
+    print(f"  peak RSS           : {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:8.1f} MiB")
+    if heap_peak is not None:
+        print(f"  peak Python heap   : {heap_peak / 2 ** 20:8.1f} MiB")
+    print(f"  grouping precision : {quality['precision']:8.3f}")
+    print(f"  grouping recall    : {quality['recall']:8.3f}")
+
+
+if __name__ == "__main__":
+    main()